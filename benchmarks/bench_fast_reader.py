@@ -0,0 +1,60 @@
+"""
+Benchmark: fast XML engine vs. openpyxl for read_excel.
+
+Usage:
+    python benchmarks/bench_fast_reader.py --rows 100000 --cols 10
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from excel_toolkit_for_py.reader import read_excel
+
+
+def make_frame(rows: int, cols: int, seed: int = 42) -> pd.DataFrame:
+    """Builds a sheet mixing numeric, string and date columns."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(cols):
+        kind = i % 3
+        if kind == 0:
+            data[f"num_{i}"] = rng.normal(size=rows)
+        elif kind == 1:
+            data[f"str_{i}"] = rng.choice(["alpha", "beta", "gamma", "delta"], rows)
+        else:
+            data[f"date_{i}"] = pd.Timestamp("2020-01-01") + pd.to_timedelta(
+                rng.integers(0, 3650, rows), unit="D"
+            )
+    return pd.DataFrame(data)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--cols", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.xlsx")
+        make_frame(args.rows, args.cols).to_excel(path, index=False)
+
+        for engine in ("openpyxl", "fast"):
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                read_excel(path, sheet_name=0, engine=engine)
+                best = min(best, time.perf_counter() - start)
+            print(
+                f"{engine:>9}: {best:.3f}s "
+                f"({args.rows / best:,.0f} rows/s, {args.rows}x{args.cols})"
+            )
+
+
+if __name__ == "__main__":
+    main()
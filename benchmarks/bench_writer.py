@@ -0,0 +1,43 @@
+"""
+Benchmark: rows/sec of each writer engine for value-only exports.
+
+Usage:
+    python benchmarks/bench_writer.py --rows 100000 --cols 10
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from bench_fast_reader import make_frame
+
+from excel_toolkit_for_py.native_writer import WRITER_ENGINES, write_excel_with_engine
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--cols", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--engines", nargs="+", default=list(WRITER_ENGINES))
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, args.cols)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.xlsx")
+        for engine in args.engines:
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                write_excel_with_engine({"Sheet1": df}, path, engine=engine)
+                best = min(best, time.perf_counter() - start)
+            print(
+                f"{engine:>10}: {best:.3f}s "
+                f"({args.rows / best:,.0f} rows/s, {args.rows}x{args.cols}, "
+                f"{os.path.getsize(path) / 1024**2:.1f} MiB)"
+            )
+
+
+if __name__ == "__main__":
+    main()
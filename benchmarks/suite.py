@@ -0,0 +1,393 @@
+"""
+Benchmark suite for the public API.
+
+Every case runs in a fresh child process against reproducible synthetic
+datasets and reports wall time, peak RSS and throughput (rows/s). Results can
+be saved as a baseline and later compared against it.
+
+Usage:
+    python benchmarks/suite.py --rows 10000 100000 --widths narrow wide
+    python benchmarks/suite.py --filter read_ --profiles numeric string
+    python benchmarks/suite.py --save benchmarks/baselines/baseline.json
+    python benchmarks/suite.py --compare benchmarks/baselines/baseline.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import queue as queue_module
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+from excel_toolkit_for_py import (
+    conversions,
+    data_analysis,
+    duplicates,
+    exporters,
+    reader,
+    schema,
+    validations,
+    writer,
+)
+from excel_toolkit_for_py.advanced_features import validate_empty_cells
+from excel_toolkit_for_py.native_writer import write_xlsx
+
+WIDTHS = {"narrow": 5, "wide": 50}
+DEFAULT_TIMEOUT = 1800.0
+_POLL_SECONDS = 1.0
+PROFILES = ("numeric", "string", "mixed")
+_WORDS = np.array(["alpha", "beta", "gamma", "delta", "epsilon", "zeta", "eta"])
+
+
+# --------------------------------------------------------------------- data
+
+
+def make_dataset(
+    rows: int, width: str = "narrow", profile: str = "mixed", seed: int = 42
+) -> pd.DataFrame:
+    """
+    Builds a reproducible synthetic sheet.
+
+    Every dataset starts with ``id`` (int), ``cat`` (low-cardinality string)
+    and ``value`` (float); the remaining columns follow the profile:
+    numeric-heavy, string-heavy or an even mix including dates.
+    """
+    rng = np.random.default_rng(seed)
+    data = {
+        "id": np.arange(rows),
+        "cat": rng.choice(_WORDS, rows),
+        "value": rng.normal(100, 15, rows).round(4),
+    }
+    for i in range(WIDTHS[width] - len(data)):
+        kind = {"numeric": 0, "string": 1}.get(profile, i % 3)
+        if kind == 0:
+            data[f"num_{i}"] = rng.random(rows).round(6)
+        elif kind == 1:
+            data[f"str_{i}"] = np.char.add(
+                rng.choice(_WORDS, rows), rng.integers(0, 1000, rows).astype(str)
+            )
+        else:
+            data[f"date_{i}"] = pd.Timestamp("2020-01-01") + pd.to_timedelta(
+                rng.integers(0, 3650, rows), unit="D"
+            )
+    return pd.DataFrame(data)
+
+
+@dataclass
+class Dataset:
+    """A generated DataFrame and the input files derived from it."""
+
+    name: str
+    df: pd.DataFrame
+    xlsx: str
+    csv: str
+    workdir: str
+
+    @property
+    def rows(self) -> int:
+        return len(self.df)
+
+    def output(self, suffix: str) -> str:
+        return os.path.join(self.workdir, f"out{suffix}")
+
+
+def build_dataset(rows: int, width: str, profile: str, workdir: str) -> Dataset:
+    df = make_dataset(rows, width, profile)
+    name = f"{rows}x{width}-{profile}"
+    xlsx = os.path.join(workdir, f"{name}.xlsx")
+    csv = os.path.join(workdir, f"{name}.csv")
+    write_xlsx({"Sheet1": df}, xlsx)
+    df.to_csv(csv, index=False)
+    return Dataset(name, df, xlsx, csv, workdir)
+
+
+# -------------------------------------------------------------------- cases
+
+
+CASES: Dict[str, Callable[[Dataset], object]] = {
+    "read_excel[openpyxl]": lambda ds: reader.read_excel(ds.xlsx, sheet_name=0),
+    "read_excel[fast]": lambda ds: reader.read_excel(
+        ds.xlsx, sheet_name=0, engine="fast"
+    ),
+    "probe_excel": lambda ds: reader.probe_excel(ds.xlsx),
+    "read_many[4 files]": lambda ds: reader.read_many(
+        [ds.xlsx, ds.csv] * 2, source_column=True
+    ),
+    "read_loop_concat[4 files]": lambda ds: pd.concat(
+        [
+            (
+                reader.read_csv(path)
+                if path.endswith(".csv")
+                else reader.read_excel(path, sheet_name=0, engine="fast")
+            )
+            for path in [ds.xlsx, ds.csv] * 2
+        ],
+        ignore_index=True,
+    ),
+    "read_csv[c]": lambda ds: reader.read_csv(ds.csv),
+    "read_csv[parallel]": lambda ds: reader.read_csv(ds.csv, engine="parallel"),
+    "write_excel[native]": lambda ds: writer.write_excel(
+        ds.df, ds.output(".xlsx"), engine="native"
+    ),
+    "write_excel[xlsxwriter]": lambda ds: writer.write_excel(
+        ds.df, ds.output(".xlsx"), engine="xlsxwriter"
+    ),
+    "write_excel[openpyxl]": lambda ds: writer.write_excel(
+        ds.df, ds.output(".xlsx"), engine="openpyxl"
+    ),
+    "write_excel[native, optimize]": lambda ds: writer.write_excel(
+        ds.df, ds.output(".xlsx"), engine="native", optimize=True
+    ),
+    "write_csv": lambda ds: writer.write_csv(ds.df, ds.output(".csv")),
+    "append_rows[1k]": lambda ds: writer.append_rows(
+        shutil.copyfile(ds.xlsx, ds.output(".xlsx")), "Sheet1", ds.df.head(1000)
+    ),
+    "excel_to_json": lambda ds: conversions.excel_to_json(
+        ds.xlsx, sheet_name="Sheet1", engine="fast"
+    ),
+    "excel_to_json_file[columns]": lambda ds: conversions.excel_to_json_file(
+        ds.xlsx, ds.output(".json"), sheet_name="Sheet1", engine="fast"
+    ),
+    "iter_excel_to_json[ndjson]": lambda ds: sum(
+        1 for _ in conversions.iter_excel_to_json(ds.xlsx, ndjson=True)
+    ),
+    "json_to_excel": lambda ds: conversions.json_to_excel(
+        ds.df.to_dict(orient="records"), ds.output(".xlsx")
+    ),
+    "excel_to_csv": lambda ds: conversions.excel_to_csv(
+        ds.xlsx, ds.output(".csv"), engine="fast"
+    ),
+    "csv_to_excel": lambda ds: conversions.csv_to_excel(ds.csv, ds.output(".xlsx")),
+    "csv_to_excel[sort, spill]": lambda ds: conversions.csv_to_excel(
+        ds.csv, ds.output(".xlsx"), sort_by="id", ascending=False, run_rows=50_000
+    ),
+    "csv_to_excel[group, spill]": lambda ds: conversions.csv_to_excel(
+        ds.csv,
+        ds.output(".xlsx"),
+        group_by="id",
+        agg={"value": "mean"},
+        run_rows=50_000,
+    ),
+    "validate_excel": lambda ds: validations.validate_excel(ds.xlsx, engine="fast"),
+    "validate_excel[probe]": lambda ds: validations.validate_excel(ds.xlsx, probe=True),
+    "validate_csv": lambda ds: validations.validate_csv(ds.csv),
+    "infer_schema": lambda ds: schema.infer_schema(ds.xlsx),
+    "find_duplicates": lambda ds: duplicates.find_duplicates([ds.xlsx, ds.csv]),
+    "find_duplicates[spill]": lambda ds: duplicates.find_duplicates(
+        [ds.xlsx, ds.csv], memory_limit=1 << 20
+    ),
+    "validate_empty_cells": lambda ds: validate_empty_cells(ds.df),
+    "to_json": lambda ds: exporters.to_json(ds.df, ds.output(".json")),
+    "to_xml": lambda ds: exporters.to_xml(ds.df, ds.output(".xml")),
+    "to_html": lambda ds: exporters.to_html(ds.df, ds.output(".html")),
+    "to_pdf": lambda ds: exporters.to_pdf(ds.df, ds.output(".pdf")),
+    "calculate_basic_stats": lambda ds: data_analysis.calculate_basic_stats(ds.df),
+    "detect_outliers": lambda ds: data_analysis.detect_outliers(ds.df),
+    "calculate_correlations": lambda ds: data_analysis.calculate_correlations(ds.df),
+    "create_pivot_table": lambda ds: data_analysis.create_pivot_table(
+        ds.df, index="cat", values="value", aggfunc="sum"
+    ),
+}
+
+
+# -------------------------------------------------------------- measurement
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return peak / (1024**2 if sys.platform == "darwin" else 1024)
+
+
+def _child(case: str, ds: Dataset, repeat: int, queue: multiprocessing.Queue):
+    try:
+        before = _peak_rss_mb()
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            CASES[case](ds)
+            best = min(best, time.perf_counter() - start)
+        peak = _peak_rss_mb()
+        queue.put({"seconds": best, "peak_rss_mb": peak, "rss_before_mb": before})
+    except Exception as e:  # reported as a skipped case
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def _wait_result(
+    process: multiprocessing.Process,
+    queue: multiprocessing.Queue,
+    timeout: Optional[float],
+) -> Dict[str, object]:
+    """Waits for the child's result; errors out if it dies or times out."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        try:
+            return queue.get(timeout=_POLL_SECONDS)
+        except queue_module.Empty:
+            pass
+        if not process.is_alive():
+            # The result may have been queued right before the child exited.
+            try:
+                return queue.get(timeout=_POLL_SECONDS)
+            except queue_module.Empty:
+                return {"error": f"worker exited with code {process.exitcode}"}
+        if deadline is not None and time.monotonic() > deadline:
+            return {"error": f"timed out after {timeout:.0f}s"}
+
+
+def run_case(
+    case: str, ds: Dataset, repeat: int, timeout: Optional[float] = DEFAULT_TIMEOUT
+) -> Dict[str, object]:
+    """Runs one case in a child process and returns its measurements."""
+    context = multiprocessing.get_context(
+        "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    )
+    queue = context.Queue()
+    process = context.Process(target=_child, args=(case, ds, repeat, queue))
+    process.start()
+    try:
+        result = _wait_result(process, queue, timeout)
+    finally:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+
+    result.update({"case": case, "dataset": ds.name, "rows": ds.rows})
+    if "seconds" in result:
+        result["rows_per_sec"] = ds.rows / result["seconds"]
+    return result
+
+
+# -------------------------------------------------------------- reporting
+
+
+def _key(result: Dict[str, object]) -> str:
+    return f"{result['case']}[{result['dataset']}]"
+
+
+def print_results(
+    results: List[Dict[str, object]], baseline: Optional[Dict[str, dict]] = None
+) -> None:
+    header = (
+        f"{'case':<34}{'dataset':<22}{'seconds':>10}{'rows/s':>14}"
+        f"{'peak MiB':>10}{'+MiB':>8}"
+    )
+    if baseline is not None:
+        header += f"{'vs base':>10}"
+    print(header)
+    for result in results:
+        line = f"{result['case']:<34}{result['dataset']:<22}"
+        if "error" in result:
+            print(f"{line}  skipped: {result['error']}")
+            continue
+        peak, before = result["peak_rss_mb"], result["rss_before_mb"]
+        growth = peak - before if peak is not None else float("nan")
+        line += (
+            f"{result['seconds']:>10.3f}{result['rows_per_sec']:>14,.0f}"
+            f"{peak if peak is not None else float('nan'):>10.1f}{growth:>8.1f}"
+        )
+        base = (baseline or {}).get(_key(result))
+        if base is not None:
+            line += f"{result['seconds'] / base['seconds']:>9.2f}x"
+        print(line)
+
+
+def compare(
+    results: List[Dict[str, object]], baseline: Dict[str, dict], tolerance: float
+) -> List[str]:
+    """Returns the cases that are slower than the baseline beyond tolerance."""
+    regressions = []
+    for result in results:
+        base = baseline.get(_key(result))
+        if base is None or "seconds" not in result:
+            continue
+        ratio = result["seconds"] / base["seconds"]
+        if ratio > 1 + tolerance:
+            regressions.append(f"{_key(result)}: {ratio:.2f}x slower")
+    return regressions
+
+
+def save_baseline(path: str, results: List[Dict[str, object]]) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    payload = {
+        "meta": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": {_key(r): r for r in results if "seconds" in r},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000])
+    parser.add_argument("--widths", nargs="+", default=["narrow"], choices=WIDTHS)
+    parser.add_argument("--profiles", nargs="+", default=["mixed"], choices=PROFILES)
+    parser.add_argument("--filter", default="", help="Only cases containing this")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", metavar="PATH", help="Store results as baseline")
+    parser.add_argument("--compare", metavar="PATH", help="Compare with baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument(
+        "--timeout", type=float, default=DEFAULT_TIMEOUT, help="Seconds per case"
+    )
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        if os.path.exists(args.compare):
+            with open(args.compare, encoding="utf-8") as f:
+                baseline = json.load(f)["results"]
+        else:
+            # Baselines are machine-specific, so none is committed.
+            print(
+                f"No baseline at {args.compare}; running without comparison "
+                "(record one with --save or make bench-baseline)."
+            )
+
+    cases = [case for case in CASES if args.filter in case]
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.rows:
+            for width in args.widths:
+                for profile in args.profiles:
+                    ds = build_dataset(rows, width, profile, workdir)
+                    for case in cases:
+                        results.append(run_case(case, ds, args.repeat, args.timeout))
+
+    print_results(results, baseline)
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"Baseline saved to {args.save}")
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
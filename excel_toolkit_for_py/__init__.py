@@ -6,10 +6,16 @@ from .advanced_features import (
     add_chart,
     apply_conditional_formatting,
     extract_formulas,
+    iter_protected_excel_chunks,
     protect_excel,
+    protect_excel_batch,
     read_protected_excel,
+    read_protected_excel_batch,
     validate_empty_cells,
+    validate_empty_cells_chunked,
 )
+from .cache import ExcelCache
+from .constraints import Column, compile_schema
 from .conversions import csv_to_excel, excel_to_csv
 from .data_analysis import (
     calculate_basic_stats,
@@ -17,10 +23,22 @@ from .data_analysis import (
     create_pivot_table,
     detect_outliers,
 )
+from .diff import diff_excel, iter_diff
+from .duplicates import find_duplicates
 from .exporters import to_html, to_json, to_pdf, to_xml
-from .reader import read_csv, read_excel
-from .validations import validate_csv, validate_excel
-from .writer import write_csv, write_excel
+from .external import external_groupby, external_sort
+from .instrumentation import add_span_callback, profile, remove_span_callback
+from .optimizer import optimize_xlsx
+from .reader import probe_excel, read_csv, read_excel, read_many
+from .schema import Schema, infer_schema
+from .validations import validate_csv, validate_duplicates, validate_excel
+from .writer import (
+    append_rows,
+    write_csv,
+    write_excel,
+    write_excel_sheets,
+    write_excel_with_charts,
+)
 
 __version__ = "1.4.0"
 __author__ = "Roberto Lima"
@@ -29,18 +47,39 @@ __email__ = "robertolima.izphera@gmail.com"
 __all__ = [
     "read_excel",
     "read_csv",
+    "probe_excel",
+    "read_many",
+    "ExcelCache",
     "write_excel",
     "write_csv",
+    "write_excel_sheets",
+    "write_excel_with_charts",
+    "append_rows",
     "excel_to_csv",
     "csv_to_excel",
     "validate_excel",
     "validate_csv",
+    "validate_duplicates",
+    "find_duplicates",
+    "diff_excel",
+    "iter_diff",
+    "external_sort",
+    "external_groupby",
+    "optimize_xlsx",
+    "infer_schema",
+    "Schema",
+    "Column",
+    "compile_schema",
     "validate_empty_cells",
+    "validate_empty_cells_chunked",
     "apply_conditional_formatting",
     "extract_formulas",
     "add_chart",
     "protect_excel",
+    "protect_excel_batch",
     "read_protected_excel",
+    "read_protected_excel_batch",
+    "iter_protected_excel_chunks",
     "to_json",
     "to_xml",
     "to_html",
@@ -49,4 +88,7 @@ __all__ = [
     "detect_outliers",
     "calculate_correlations",
     "create_pivot_table",
+    "profile",
+    "add_span_callback",
+    "remove_span_callback",
 ]
@@ -1,26 +1,152 @@
 """
 Advanced features module for Excel file manipulation.
-Includes password support, empty cell validation, conditional formatting,
-formula manipulation and chart support.
+Includes password support (with batch decryption), empty cell validation,
+conditional formatting, formula manipulation and chart support.
 """
 
+import contextlib
+import hashlib
 import io
-from typing import Any, Dict, List, Optional
+import operator
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import openpyxl
 import pandas as pd
 from msoffcrypto import OfficeFile
-from openpyxl.chart import BarChart, Reference
+from msoffcrypto.exceptions import InvalidKeyError
+from msoffcrypto.format.ooxml import OOXMLFile
+from msoffcrypto.method.ecma376_agile import (
+    ECMA376Agile,
+    _decrypt_aes_cbc,
+    _get_hash_func,
+)
+from openpyxl.chart import BarChart, LineChart, PieChart, Reference, ScatterChart
 from openpyxl.styles import Font, PatternFill
 
-
-def read_protected_excel(file_path: str, password: str) -> pd.DataFrame:
+from .fast_reader import DEFAULT_CHUNKSIZE, iter_excel_chunks, read_excel_with_engine
+from .instrumentation import instrumented, span
+from .utils import ReadSource, binary_source
+
+# Block keys of the agile key derivation (MS-OFFCRYPTO 2.3.4.13).
+_VERIFIER_INPUT_BLOCK = b"\xfe\xa7\xd2\x76\x3b\x4b\x9e\x79"
+_VERIFIER_VALUE_BLOCK = b"\xd7\xaa\x0f\x6d\x30\x61\x34\x4e"
+_KEY_VALUE_BLOCK = b"\x14\x6e\x0b\xe7\xab\xac\xd0\xd6"
+# The expensive part of key derivation (100k hash iterations for agile
+# encryption) only depends on the password, salt, spin count and hash
+# algorithm, so it is cached per process; the per-file key is then unwrapped
+# and verified with a few cheap hashes and AES blocks.
+_MAX_DERIVED_KEYS = 256
+_derived_keys: "OrderedDict[Tuple[Any, ...], bytes]" = OrderedDict()
+_derived_keys_lock = threading.Lock()
+
+
+def _remember(params: Tuple[Any, ...], derive: Callable[[], bytes]) -> bytes:
+    """Returns the cached derivation for ``params``, computing it on a miss."""
+    with _derived_keys_lock:
+        value = _derived_keys.get(params)
+        if value is not None:
+            _derived_keys.move_to_end(params)
+            return value
+    value = derive()
+    with _derived_keys_lock:
+        _derived_keys[params] = value
+        while len(_derived_keys) > _MAX_DERIVED_KEYS:
+            _derived_keys.popitem(last=False)
+    return value
+
+
+def _agile_key(info: Dict[str, Any], password: str, secret: bytes) -> bytes:
+    """Derives and verifies the secret key of an agile-encrypted file."""
+    salt, algorithm = info["passwordSalt"], info["passwordHashAlgorithm"]
+    spin, bits = info["spinValue"], info["passwordKeyBits"]
+    digest = _remember(
+        ("agile", secret, salt, algorithm, spin),
+        lambda: ECMA376Agile._derive_iterated_hash_from_password(
+            password, salt, algorithm, spin
+        ).digest(),
+    )
+
+    def unwrap(block: bytes, data: bytes) -> bytes:
+        key = ECMA376Agile._derive_encryption_key(digest, block, algorithm, bits)
+        return bytes(_decrypt_aes_cbc(data, key, salt))
+
+    verifier = unwrap(_VERIFIER_INPUT_BLOCK, info["encryptedVerifierHashInput"])
+    expected = unwrap(_VERIFIER_VALUE_BLOCK, info["encryptedVerifierHashValue"])
+    actual = _get_hash_func(algorithm)(verifier).digest()
+    if expected[: len(actual)] != actual:
+        raise InvalidKeyError("Key verification failed")
+    return unwrap(_KEY_VALUE_BLOCK, info["encryptedKeyValue"])
+
+
+def _load_key(office_file: Any, password: str) -> None:
+    """Loads the decryption key, reusing password hashes derived earlier."""
+    info = getattr(office_file, "info", None)
+    kind = getattr(office_file, "type", None)
+    secret = hashlib.sha256(password.encode("utf-8")).digest()
+    if info is None:
+        office_file.load_key(password=password)
+    elif kind == "agile":
+        office_file.load_key(secret_key=_agile_key(info, password, secret))
+    elif kind == "standard":
+        # The standard key depends only on the password and the header.
+        header, verifier = info["header"], info["verifier"]
+
+        def derive() -> bytes:
+            office_file.load_key(password=password, verify_password=True)
+            return bytes(office_file.secret_key)
+
+        params = (
+            kind,
+            secret,
+            header["algId"],
+            header["algIdHash"],
+            header["providerType"],
+            header["keySize"],
+            verifier["salt"],
+        )
+        office_file.load_key(secret_key=_remember(params, derive))
+    else:
+        office_file.load_key(password=password)
+
+
+def _decrypt(file_path: ReadSource, password: str) -> io.BytesIO:
+    """Decrypts a protected workbook into an in-memory buffer."""
+    with contextlib.ExitStack() as stack:
+        if isinstance(file_path, (str, os.PathLike)):
+            file_path = stack.enter_context(open(file_path, "rb"))
+        source = stack.enter_context(binary_source(file_path))
+        office_file = OfficeFile(source)
+        _load_key(office_file, password)
+
+        decrypted = io.BytesIO()
+        office_file.decrypt(decrypted)
+
+    decrypted.seek(0)
+    return decrypted
+
+
+@instrumented
+def read_protected_excel(
+    file_path: ReadSource,
+    password: str,
+    sheet_name: Union[str, int] = 0,
+    engine: Optional[str] = None,
+) -> pd.DataFrame:
     """
     Reads a password-protected Excel file.
 
     Args:
-        file_path (str): Path to the Excel file
+        file_path (str, file-like or buffer): Path to the Excel file, binary
+            stream, or bytes/memoryview/mmap with the encrypted file contents
         password (str): File password
+        sheet_name (str or int): Sheet to read
+        engine (str, optional): Reader engine ("fast" for the XML engine)
 
     Returns:
         pd.DataFrame: DataFrame with file data
@@ -30,18 +156,135 @@ def read_protected_excel(file_path: str, password: str) -> pd.DataFrame:
         FileNotFoundError: If file doesn't exist
     """
     try:
-        with open(file_path, "rb") as file:
-            office_file = OfficeFile(file)
-            office_file.load_key(password=password)
+        # The decrypted package is parsed straight from the buffer.
+        with span("decrypt", source=file_path):
+            decrypted = _decrypt(file_path, password)
+        with span("parse", bytes=decrypted.getbuffer().nbytes) as phase:
+            df = read_excel_with_engine(decrypted, sheet_name=sheet_name, engine=engine)
+            phase.record(rows=len(df))
+        return df
+    except Exception as e:
+        raise ValueError(f"Error reading protected file: {str(e)}")
+
 
-            decrypted = io.BytesIO()
-            office_file.decrypt(decrypted)
+def iter_protected_excel_chunks(
+    file_path: ReadSource,
+    password: str,
+    sheet_name: Union[str, int] = 0,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    **options: Any,
+) -> Iterator[pd.DataFrame]:
+    """
+    Reads a password-protected Excel file in chunks.
 
-            return pd.read_excel(decrypted)
+    The decrypted package is kept in memory and streamed into the fast XML
+    engine, so only one chunk of rows is materialized at a time.
+
+    Args:
+        file_path (str, file-like or buffer): Encrypted Excel file
+        password (str): File password
+        sheet_name (str or int): Sheet to read
+        chunksize (int): Number of rows per DataFrame
+        **options: ``usecols``, ``nrows``, ``skiprows``, ``dtype`` and
+            ``parse_dates``
+
+    Yields:
+        pd.DataFrame: Consecutive blocks of the sheet
+    """
+    try:
+        decrypted = _decrypt(file_path, password)
     except Exception as e:
         raise ValueError(f"Error reading protected file: {str(e)}")
+    return iter_excel_chunks(
+        decrypted, sheet_name=sheet_name, chunksize=chunksize, **options
+    )
+
+
+def _list_files(files: Union[str, Iterable[str]], pattern: str) -> List[str]:
+    """Expands a directory into its matching files, or lists the given paths."""
+    if isinstance(files, (str, os.PathLike)) and os.path.isdir(files):
+        return sorted(str(path) for path in Path(files).glob(pattern))
+    return [os.fspath(path) for path in files]
+
+
+def _map_in_pool(
+    fn: Callable[[Any], Any], tasks: List[Any], workers: Optional[int]
+) -> List[Any]:
+    """Runs ``fn`` over ``tasks`` in a process pool, keeping the input order."""
+    if len(tasks) <= 1 or workers == 1:
+        return [fn(task) for task in tasks]
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        return list(executor.map(fn, tasks, chunksize=chunksize))
+
+
+def _read_protected_task(
+    task: Tuple[str, str, Union[str, int], Optional[str]],
+) -> pd.DataFrame:
+    """Process pool entry point for read_protected_excel_batch."""
+    file_path, password, sheet_name, engine = task
+    return read_protected_excel(file_path, password, sheet_name, engine)
+
+
+@instrumented
+def read_protected_excel_batch(
+    files: Union[str, Iterable[str]],
+    password: str,
+    sheet_name: Union[str, int] = 0,
+    engine: Optional[str] = None,
+    workers: Optional[int] = None,
+    pattern: str = "*.xlsx",
+) -> Dict[str, pd.DataFrame]:
+    """
+    Decrypts and reads many password-protected Excel files in parallel.
+
+    Files are distributed over a process pool. Each worker keeps the password
+    hashes it has derived, so files that share a salt are only hashed once
+    per worker; the key of each file is then unwrapped from that hash.
+
+    Args:
+        files (str or Iterable[str]): Directory with the workbooks or an
+            iterable of file paths
+        password (str): Password shared by the files
+        sheet_name (str or int): Sheet to read from each file
+        engine (str, optional): Reader engine ("fast" for the XML engine)
+        workers (int, optional): Number of worker processes. Defaults to the
+            number of CPUs.
+        pattern (str): Glob pattern used when ``files`` is a directory
+
+    Returns:
+        Dict[str, pd.DataFrame]: DataFrames keyed by file path, in input order
+
+    Raises:
+        ValueError: If any file cannot be decrypted or read
+    """
+    paths = _list_files(files, pattern)
+    tasks = [(path, password, sheet_name, engine) for path in paths]
+    return dict(zip(paths, _map_in_pool(_read_protected_task, tasks, workers)))
 
 
+def _empty_cells_summary(
+    counts: pd.Series, rows: int, threshold: float
+) -> Dict[str, Any]:
+    """Builds the validate_empty_cells result from per-column null counts."""
+    results: Dict[str, Any] = {
+        "total_cells": rows * len(counts),
+        "empty_cells": {},
+        "columns_above_threshold": [],
+    }
+    percents = counts / rows if rows else counts * 0.0
+    for col, empty_count, empty_percent in zip(counts.index, counts, percents):
+        results["empty_cells"][col] = {
+            "count": int(empty_count),
+            "percent": float(empty_percent),
+        }
+        if empty_percent > threshold:
+            results["columns_above_threshold"].append(col)
+    return results
+
+
+@instrumented
 def validate_empty_cells(
     df: pd.DataFrame, columns: Optional[List[str]] = None, threshold: float = 0.1
 ) -> Dict[str, Any]:
@@ -59,23 +302,71 @@ def validate_empty_cells(
     if columns is None:
         columns = df.columns.tolist()
 
-    results = {
-        "total_cells": len(df) * len(columns),
-        "empty_cells": {},
-        "columns_above_threshold": [],
-    }
+    counts = df[columns].isna().sum()
+    return _empty_cells_summary(counts, len(df), threshold)
 
-    for col in columns:
-        empty_count = df[col].isna().sum()
-        empty_percent = empty_count / len(df)
-        results["empty_cells"][col] = {"count": empty_count, "percent": empty_percent}
 
-        if empty_percent > threshold:
-            results["columns_above_threshold"].append(col)
+@instrumented
+def validate_empty_cells_chunked(
+    chunks: Iterable[pd.DataFrame],
+    columns: Optional[List[str]] = None,
+    threshold: float = 0.1,
+) -> Dict[str, Any]:
+    """
+    Validates empty cells over an iterator of DataFrame chunks.
+
+    Only one chunk is held in memory at a time, so it can be fed from
+    ``read_csv(..., iterator=True)`` or ``iter_excel_chunks`` to check
+    files that do not fit in memory.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): Consecutive blocks of the data
+        columns (List[str], optional): Columns to validate. If None, uses
+            the columns of the first chunk.
+        threshold (float): Maximum percentage of empty cells allowed (0-1)
 
+    Returns:
+        Dict[str, Any]: Same structure as ``validate_empty_cells`` plus
+        ``blocks``, with the starting row, row count and null density
+        (empty cells / cells) of each chunk
+    """
+    counts: Optional[pd.Series] = None
+    rows = 0
+    blocks = []
+    for chunk in chunks:
+        if columns is None:
+            columns = chunk.columns.tolist()
+        chunk_counts = chunk[columns].isna().sum()
+        counts = chunk_counts if counts is None else counts + chunk_counts
+        cells = len(chunk) * len(columns)
+        blocks.append(
+            {
+                "start_row": rows,
+                "rows": len(chunk),
+                "density": float(chunk_counts.sum() / cells) if cells else 0.0,
+            }
+        )
+        rows += len(chunk)
+
+    if counts is None:
+        counts = pd.Series(0, index=columns or [], dtype="int64")
+    results = _empty_cells_summary(counts, rows, threshold)
+    results["blocks"] = blocks
     return results
 
 
+# Comparison operators accepted by ``apply_conditional_formatting``.
+_OPERATORS: Dict[str, Callable[[float, float], bool]] = {
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+@instrumented
 def apply_conditional_formatting(file_path: str, rules: List[Dict[str, Any]]) -> None:
     """
     Applies conditional formatting to an Excel file.
@@ -94,45 +385,43 @@ def apply_conditional_formatting(file_path: str, rules: List[Dict[str, Any]]) ->
     ws = wb.active
 
     for rule in rules:
-        cell_range = rule["range"]
+        if rule["type"] != "cellIs":
+            continue
+        compare = _OPERATORS[rule["operator"]]
+        try:
+            formula_value = float(rule["formula"])
+        except (ValueError, TypeError):
+            continue
+        # One style object per rule, shared by every matched cell.
         fmt = rule["format"]
-
-        for row in ws[cell_range]:
+        fill = font = None
+        if "fill" in fmt:
+            # Add 'FF' at the beginning for full opacity
+            fill_color = f"FF{fmt['fill']}"
+            fill = PatternFill(
+                start_color=fill_color, end_color=fill_color, fill_type="solid"
+            )
+        if "font" in fmt:
+            font = Font(**fmt["font"])
+
+        for row in ws[rule["range"]]:
             for cell in row:
-                if rule["type"] == "cellIs":
-                    try:
-                        # Convert cell value to number if possible
-                        cell_value = float(cell.value) if cell.value is not None else 0
-                        formula_value = float(rule["formula"])
-
-                        # Map operators to comparison functions
-                        operators = {
-                            ">": lambda x, y: x > y,
-                            "<": lambda x, y: x < y,
-                            ">=": lambda x, y: x >= y,
-                            "<=": lambda x, y: x <= y,
-                            "==": lambda x, y: x == y,
-                            "!=": lambda x, y: x != y,
-                        }
-
-                        if operators[rule["operator"]](cell_value, formula_value):
-                            if "fill" in fmt:
-                                # Add 'FF' at the beginning for full opacity
-                                fill_color = f"FF{fmt['fill']}"
-                                cell.fill = PatternFill(
-                                    start_color=fill_color,
-                                    end_color=fill_color,
-                                    fill_type="solid",
-                                )
-                            if "font" in fmt:
-                                cell.font = Font(**fmt["font"])
-                    except (ValueError, TypeError):
-                        # Ignore cells that cannot be converted to number
-                        continue
+                try:
+                    # Convert cell value to number if possible
+                    cell_value = float(cell.value) if cell.value is not None else 0
+                except (ValueError, TypeError):
+                    # Ignore cells that cannot be converted to number
+                    continue
+                if compare(cell_value, formula_value):
+                    if fill is not None:
+                        cell.fill = fill
+                    if font is not None:
+                        cell.font = font
 
     wb.save(file_path)
 
 
+@instrumented
 def extract_formulas(file_path: str) -> Dict[str, List[Dict[str, str]]]:
     """
     Extracts formulas from an Excel file.
@@ -162,6 +451,36 @@ def extract_formulas(file_path: str) -> Dict[str, List[Dict[str, str]]]:
     return formulas
 
 
+CHART_TYPES = {
+    "bar": BarChart,
+    "line": LineChart,
+    "pie": PieChart,
+    "scatter": ScatterChart,
+}
+
+
+def make_chart(chart_type: str) -> Any:
+    """
+    Creates an empty openpyxl chart of the given type.
+
+    Args:
+        chart_type (str): One of 'bar', 'line', 'pie' or 'scatter'
+
+    Returns:
+        openpyxl chart object
+
+    Raises:
+        ValueError: If the chart type is not supported
+    """
+    if chart_type not in CHART_TYPES:
+        raise ValueError(
+            f"Unsupported chart type: {chart_type!r}. "
+            f"Use one of {sorted(CHART_TYPES)}"
+        )
+    return CHART_TYPES[chart_type]()
+
+
+@instrumented
 def add_chart(
     file_path: str,
     chart_type: str,
@@ -174,19 +493,20 @@ def add_chart(
 
     Args:
         file_path (str): Path to the Excel file
-        chart_type (str): Chart type ('bar', 'line', 'pie')
+        chart_type (str): Chart type ('bar', 'line', 'pie', 'scatter')
         data_range (str): Data range (e.g., 'A1:B10')
         title (str): Chart title
         output_file (str, optional): Path to save the modified file
+
+    Raises:
+        ValueError: If the chart type is not supported
     """
+    # Create chart based on type
+    chart = make_chart(chart_type)
+
     wb = openpyxl.load_workbook(file_path)
     ws = wb.active
 
-    # Create chart based on type
-    if chart_type == "bar":
-        chart = BarChart()
-    # Add other chart types here
-
     # Define data including sheet name
     data_range_with_sheet = f"{ws.title}!{data_range}"
     data = Reference(ws, range_string=data_range_with_sheet)
@@ -204,8 +524,12 @@ def add_chart(
     wb.save(output_path)
 
 
+@instrumented
 def protect_excel(
-    file_path: str, password: str, output_file: Optional[str] = None
+    file_path: str,
+    password: str,
+    output_file: Optional[str] = None,
+    mode: str = "sheet",
 ) -> None:
     """
     Protects an Excel file with a password.
@@ -214,7 +538,25 @@ def protect_excel(
         file_path (str): Path to the Excel file
         password (str): Password to protect the file
         output_file (str, optional): Path to save the protected file
+        mode (str): "sheet" sets worksheet protection through openpyxl;
+            "encrypt" encrypts the whole package (ECMA-376 agile encryption),
+            copying the workbook bytes as they are without loading it
+
+    Raises:
+        ValueError: If the mode is unknown or the file cannot be encrypted
     """
+    output_path = output_file or file_path
+
+    if mode == "encrypt":
+        try:
+            with span("encrypt", source=file_path):
+                _encrypt_file(file_path, password, output_path)
+        except Exception as e:
+            raise ValueError(f"Error encrypting file: {str(e)}")
+        return
+    if mode != "sheet":
+        raise ValueError(f"Unknown protection mode: {mode!r}")
+
     wb = openpyxl.load_workbook(file_path)
 
     # Protect all worksheets
@@ -222,5 +564,65 @@ def protect_excel(
         ws.protection.set_password(password)
 
     # Save file
-    output_path = output_file or file_path
     wb.save(output_path)
+
+
+def _encrypt_file(file_path: str, password: str, output_path: str) -> None:
+    """Encrypts an .xlsx package, writing through a temporary file."""
+    directory = os.path.dirname(os.path.abspath(output_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with open(file_path, "rb") as source, os.fdopen(fd, "wb") as target:
+            OOXMLFile(source).encrypt(password, target)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _protect_task(task: Tuple[str, str, str, str]) -> str:
+    """Process pool entry point for protect_excel_batch."""
+    file_path, password, output_path, mode = task
+    protect_excel(file_path, password, output_path, mode=mode)
+    return output_path
+
+
+@instrumented
+def protect_excel_batch(
+    files: Union[str, Iterable[str]],
+    password: str,
+    output_dir: Optional[str] = None,
+    mode: str = "encrypt",
+    workers: Optional[int] = None,
+    pattern: str = "*.xlsx",
+) -> List[str]:
+    """
+    Protects many Excel files in parallel.
+
+    Args:
+        files (str or Iterable[str]): Directory with the workbooks or an
+            iterable of file paths
+        password (str): Password applied to every file
+        output_dir (str, optional): Directory for the protected files. If
+            None, the files are protected in place.
+        mode (str): "encrypt" (default) or "sheet", as in ``protect_excel``
+        workers (int, optional): Number of worker processes. Defaults to the
+            number of CPUs.
+        pattern (str): Glob pattern used when ``files`` is a directory
+
+    Returns:
+        List[str]: Paths of the protected files, in input order
+    """
+    paths = _list_files(files, pattern)
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+    tasks = [
+        (
+            path,
+            password,
+            os.path.join(output_dir, os.path.basename(path)) if output_dir else path,
+            mode,
+        )
+        for path in paths
+    ]
+    return _map_in_pool(_protect_task, tasks, workers)
@@ -0,0 +1,350 @@
+"""
+Asyncio API.
+
+Async counterparts of the reading, conversion, validation and export
+functions, for use from an event loop:
+
+* parsing of files on disk runs in a shared process pool;
+* calls on in-memory data, buffers or streams run in a thread pool;
+* chunked readers are exposed as async iterators, one chunk per step;
+* every call (and every chunk step) waits for a slot of a concurrency limit.
+
+Cancelling a call releases its slot right away and drops the work item if it
+has not started. A parse already running in a worker process finishes in the
+background and its result is discarded; a cancelled chunk iterator is closed
+as soon as its current step completes.
+
+Example:
+    >>> from excel_toolkit_for_py import aio
+    >>> df = await aio.read_excel("upload.xlsx", engine="fast")
+    >>> async for chunk in aio.iter_excel_chunks("big.xlsx", chunksize=50_000):
+    ...     await store(chunk)
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import weakref
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Set
+
+import pandas as pd
+
+from . import conversions, exporters, reader, validations, writer
+from .advanced_features import iter_protected_excel_chunks as _iter_protected_chunks
+from .advanced_features import read_protected_excel as _read_protected_excel
+from .fast_reader import DEFAULT_CHUNKSIZE
+from .fast_reader import iter_excel_chunks as _iter_excel_chunks
+from .utils import ReadSource, is_path
+
+_lock = threading.Lock()
+_process_pool: Optional[Executor] = None
+_owns_process_pool = True
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_workers: Optional[int] = None
+_max_concurrency = os.cpu_count() or 1
+_semaphores: "weakref.WeakKeyDictionary[Any, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+# Work items submitted to each pool that have not finished yet.
+_pending: "Dict[Executor, Set[Future[Any]]]" = {}
+_DONE = object()
+
+
+def configure(
+    workers: Optional[int] = None,
+    max_concurrency: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> None:
+    """
+    Sets up the process pool and the concurrency limit.
+
+    Args:
+        workers (int, optional): Processes of the pool created on first use.
+            Defaults to the number of CPUs.
+        max_concurrency (int, optional): Calls allowed to run at once per
+            event loop; further calls wait for a slot. Defaults to the number
+            of CPUs.
+        executor (Executor, optional): Executor used instead of the internal
+            process pool, e.g. one shared with the application. It is not
+            shut down by ``shutdown()``.
+    """
+    global _workers, _max_concurrency, _process_pool, _owns_process_pool
+    if max_concurrency is not None and max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    shutdown(wait=False)
+    with _lock:
+        _workers = workers
+        if executor is not None:
+            _process_pool, _owns_process_pool = executor, False
+        if max_concurrency is not None:
+            _max_concurrency = max_concurrency
+            _semaphores.clear()
+
+
+def shutdown(wait: bool = True) -> None:
+    """Shuts down the pools created by this module."""
+    global _process_pool, _thread_pool, _owns_process_pool
+    with _lock:
+        if _process_pool is not None:
+            pending = _pending.pop(_process_pool, set())
+            if _owns_process_pool:
+                _shutdown_pool(_process_pool, pending, wait)
+        if _thread_pool is not None:
+            _shutdown_pool(_thread_pool, _pending.pop(_thread_pool, set()), wait)
+        _process_pool, _thread_pool, _owns_process_pool = None, None, True
+
+
+def _shutdown_pool(pool: Executor, pending: "Set[Future[Any]]", wait: bool) -> None:
+    # Executor.shutdown(cancel_futures=True) needs Python 3.9.
+    for future in list(pending):
+        future.cancel()
+    pool.shutdown(wait=wait)
+
+
+def _submit(pool: Executor, fn: Callable[..., Any], *args: Any) -> "Future[Any]":
+    """Submits ``fn`` to ``pool`` and tracks it until it is done."""
+    future = pool.submit(fn, *args)
+    with _lock:
+        pending = _pending.setdefault(pool, set())
+    pending.add(future)
+    future.add_done_callback(pending.discard)
+    return future
+
+
+def _get_process_pool() -> Executor:
+    global _process_pool
+    with _lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=_workers)
+        return _process_pool
+
+
+def _get_thread_pool() -> ThreadPoolExecutor:
+    global _thread_pool
+    with _lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(thread_name_prefix="excel-toolkit-aio")
+        return _thread_pool
+
+
+def _limit() -> asyncio.Semaphore:
+    """Returns the concurrency semaphore of the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(_max_concurrency)
+    return semaphore
+
+
+def _submit_to_thread(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    # The context is copied so that instrumentation spans reach profile().
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, fn, *args, **kwargs)
+    return _submit(_get_thread_pool(), call)
+
+
+async def run_in_thread(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Runs ``fn`` in the thread pool once a concurrency slot is free."""
+    async with _limit():
+        return await asyncio.wrap_future(_submit_to_thread(fn, *args, **kwargs))
+
+
+async def run_in_process(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Runs ``fn`` in the process pool once a concurrency slot is free.
+
+    ``fn``, its arguments and its result must be picklable.
+    """
+    async with _limit():
+        call = functools.partial(fn, *args, **kwargs)
+        return await asyncio.wrap_future(_submit(_get_process_pool(), call))
+
+
+async def _parse(fn: Callable[..., Any], source: Any, *args: Any, **kwargs: Any) -> Any:
+    """Parses files on disk in a process and buffers or streams in a thread."""
+    if is_path(source) and kwargs.get("cache") is None:
+        return await run_in_process(fn, source, *args, **kwargs)
+    return await run_in_thread(fn, source, *args, **kwargs)
+
+
+async def _iterate(make: Callable[[], Iterator[Any]]) -> AsyncIterator[Any]:
+    """Drives a blocking iterator from the thread pool, one item per step."""
+    iterator = await run_in_thread(lambda: iter(make()))
+    step = None
+    try:
+        while True:
+            async with _limit():
+                step = _submit_to_thread(next, iterator, _DONE)
+                item = await asyncio.wrap_future(step)
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            if step is not None and not step.done():
+                # A generator cannot be closed while a step is running.
+                step.add_done_callback(lambda _: close())
+            else:
+                close()
+
+
+# ------------------------------------------------------------------ reading
+
+
+async def read_excel(file_path: ReadSource, **kwargs: Any) -> pd.DataFrame:
+    """Async ``reader.read_excel``; paths are parsed in the process pool."""
+    return await _parse(reader.read_excel, file_path, **kwargs)
+
+
+async def read_csv(file_path: ReadSource, **kwargs: Any) -> pd.DataFrame:
+    """Async ``reader.read_csv``; use ``iter_csv_chunks`` to read in chunks."""
+    if kwargs.get("iterator"):
+        raise ValueError("Use aio.iter_csv_chunks to read a CSV file in chunks")
+    return await _parse(reader.read_csv, file_path, **kwargs)
+
+
+async def get_sheet_names(file_path: ReadSource) -> List[str]:
+    """Async ``reader.get_sheet_names``."""
+    names: List[str] = await run_in_thread(reader.get_sheet_names, file_path)
+    return names
+
+
+async def read_protected_excel(
+    file_path: ReadSource, password: str, **kwargs: Any
+) -> pd.DataFrame:
+    """Async ``read_protected_excel``; paths are decrypted in the process pool."""
+    return await _parse(_read_protected_excel, file_path, password, **kwargs)
+
+
+def iter_excel_chunks(
+    source: ReadSource,
+    sheet_name: Any = 0,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    **options: Any,
+) -> AsyncIterator[pd.DataFrame]:
+    """Async iterator over the DataFrame chunks of an ``.xlsx`` sheet."""
+    return _iterate(
+        lambda: _iter_excel_chunks(
+            source, sheet_name=sheet_name, chunksize=chunksize, **options
+        )
+    )
+
+
+def iter_csv_chunks(
+    file_path: ReadSource, chunksize: Optional[int] = None, **kwargs: Any
+) -> AsyncIterator[pd.DataFrame]:
+    """Async iterator over the DataFrame chunks of a CSV file."""
+    return _iterate(
+        lambda: reader.read_csv(file_path, iterator=True, chunksize=chunksize, **kwargs)
+    )
+
+
+def iter_protected_excel_chunks(
+    file_path: ReadSource, password: str, **kwargs: Any
+) -> AsyncIterator[pd.DataFrame]:
+    """Async iterator over the chunks of a password-protected sheet."""
+    return _iterate(lambda: _iter_protected_chunks(file_path, password, **kwargs))
+
+
+def iter_excel_to_json(file_path: str, **kwargs: Any) -> AsyncIterator[Any]:
+    """Async iterator over the record batches (or NDJSON lines) of a sheet."""
+    return _iterate(lambda: conversions.iter_excel_to_json(file_path, **kwargs))
+
+
+# ---------------------------------------------------------------- conversion
+
+
+async def excel_to_json(file_path: str, **kwargs: Any) -> Any:
+    """Async ``conversions.excel_to_json``."""
+    return await _parse(conversions.excel_to_json, file_path, **kwargs)
+
+
+async def excel_to_json_file(file_path: str, output_path: str, **kwargs: Any) -> None:
+    """Async ``conversions.excel_to_json_file``."""
+    await _parse(conversions.excel_to_json_file, file_path, output_path, **kwargs)
+
+
+async def excel_to_csv(excel_path: str, csv_path: str, **kwargs: Any) -> None:
+    """Async ``conversions.excel_to_csv``."""
+    await _parse(conversions.excel_to_csv, excel_path, csv_path, **kwargs)
+
+
+async def csv_to_excel(csv_path: str, excel_path: str, **kwargs: Any) -> None:
+    """Async ``conversions.csv_to_excel``."""
+    await _parse(conversions.csv_to_excel, csv_path, excel_path, **kwargs)
+
+
+async def json_to_excel(json_data: Any, file_path: str, **kwargs: Any) -> None:
+    """Async ``conversions.json_to_excel``."""
+    await run_in_thread(conversions.json_to_excel, json_data, file_path, **kwargs)
+
+
+# ---------------------------------------------------------------- validation
+
+
+async def validate_excel(file_path: ReadSource, **kwargs: Any) -> Dict[str, Any]:
+    """Async ``validations.validate_excel``."""
+    result: Dict[str, Any] = await _parse(
+        validations.validate_excel, file_path, **kwargs
+    )
+    return result
+
+
+async def validate_csv(file_path: ReadSource, **kwargs: Any) -> Dict[str, Any]:
+    """Async ``validations.validate_csv``."""
+    result: Dict[str, Any] = await _parse(validations.validate_csv, file_path, **kwargs)
+    return result
+
+
+async def validate_excel_schema(
+    file_path: ReadSource, schema: Dict[str, type], **kwargs: Any
+) -> Dict[str, Any]:
+    """Async ``validations.validate_excel_schema``."""
+    result: Dict[str, Any] = await _parse(
+        validations.validate_excel_schema, file_path, schema, **kwargs
+    )
+    return result
+
+
+# ------------------------------------------------------------ writing/export
+
+
+async def write_excel(dataframe: pd.DataFrame, file_path: str, **kwargs: Any) -> None:
+    """Async ``writer.write_excel``."""
+    await run_in_thread(writer.write_excel, dataframe, file_path, **kwargs)
+
+
+async def write_excel_sheets(
+    sheets: Dict[str, pd.DataFrame], file_path: str, **kwargs: Any
+) -> None:
+    """Async ``writer.write_excel_sheets``."""
+    await run_in_thread(writer.write_excel_sheets, sheets, file_path, **kwargs)
+
+
+async def write_csv(dataframe: pd.DataFrame, file_path: str) -> None:
+    """Async ``writer.write_csv``."""
+    await run_in_thread(writer.write_csv, dataframe, file_path)
+
+
+async def to_json(data: Any, output_path: str, **kwargs: Any) -> None:
+    """Async ``exporters.to_json``."""
+    await run_in_thread(exporters.to_json, data, output_path, **kwargs)
+
+
+async def to_xml(data: Any, output_path: str, **kwargs: Any) -> None:
+    """Async ``exporters.to_xml``."""
+    await run_in_thread(exporters.to_xml, data, output_path, **kwargs)
+
+
+async def to_html(data: Any, output_path: str, **kwargs: Any) -> None:
+    """Async ``exporters.to_html``."""
+    await run_in_thread(exporters.to_html, data, output_path, **kwargs)
+
+
+async def to_pdf(data: Any, output_path: str, **kwargs: Any) -> None:
+    """Async ``exporters.to_pdf``; the layout runs in the process pool."""
+    await run_in_process(exporters.to_pdf, data, output_path, **kwargs)
@@ -0,0 +1,259 @@
+"""
+On-disk columnar cache for Excel files that are read repeatedly.
+
+Each parsed sheet is stored as an Arrow/Feather file (when ``pyarrow`` is
+installed) or as one NumPy ``.npy`` file per column. Entries are keyed by the
+source path, size, modification time and content hash, so any change to the
+workbook invalidates them automatically.
+"""
+
+import errno
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .fast_reader import read_excel_with_engine
+
+try:
+    from pyarrow import feather
+
+    HAS_PYARROW = True
+except ImportError:  # pragma: no cover - depends on the environment
+    HAS_PYARROW = False
+
+DEFAULT_MAX_BYTES = 1024**3
+_HASH_BLOCK_SIZE = 1024 * 1024
+_NATIVE_KINDS = "biufcmM"
+
+# (absolute path, size, mtime_ns) -> content digest, so unchanged files are
+# hashed only once per process.
+_digest_memo: Dict[Tuple[str, int, int], str] = {}
+_digest_lock = threading.Lock()
+
+
+def _content_digest(path: str, size: int, mtime_ns: int) -> str:
+    """Returns the content hash of a file, memoized by its stat signature."""
+    memo_key = (path, size, mtime_ns)
+    with _digest_lock:
+        if memo_key in _digest_memo:
+            return _digest_memo[memo_key]
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+
+    with _digest_lock:
+        _digest_memo[memo_key] = digest.hexdigest()
+    return _digest_memo[memo_key]
+
+
+def _options_key(sheet_name: Any, options: Dict[str, Any]) -> str:
+    """Builds a stable key for a sheet read with the given pandas options."""
+    payload = repr((sheet_name, sorted(options.items(), key=lambda kv: kv[0])))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=12).hexdigest()
+
+
+class ExcelCache:
+    """
+    Transparent on-disk cache of parsed Excel sheets.
+
+    Args:
+        cache_dir (str): Directory where cached sheets are stored.
+        max_bytes (int): Maximum total size of the cache. The least recently
+            used workbooks are evicted when this limit is exceeded.
+
+    Example:
+        >>> cache = ExcelCache("/tmp/excel-cache", max_bytes=512 * 1024**2)
+        >>> df = read_excel("reference.xlsx", sheet_name="Sheet1", cache=cache)
+    """
+
+    def __init__(
+        self, cache_dir: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------------ keys
+
+    def _entry_dir(self, file_path: Union[str, "os.PathLike[str]"]) -> Path:
+        """Returns the entry directory for the current version of a file."""
+        path = os.path.abspath(os.fspath(file_path))
+        st = os.stat(path)
+        digest = _content_digest(path, st.st_size, st.st_mtime_ns)
+        key = f"{path}|{st.st_size}|{st.st_mtime_ns}|{digest}"
+        return (
+            self.cache_dir
+            / hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        )
+
+    # --------------------------------------------------------------- storage
+
+    @staticmethod
+    def _store_sheet(df: pd.DataFrame, target: Path) -> None:
+        """Writes a DataFrame to ``target`` in columnar form."""
+        tmp = Path(tempfile.mkdtemp(dir=target.parent, prefix=".tmp-"))
+        try:
+            meta: Dict[str, Any] = {"dtypes": [str(dtype) for dtype in df.dtypes]}
+            # Pickled, so headers such as dates or numbers keep their type.
+            pd.to_pickle(df.columns, tmp / "columns.pkl")
+            frame = df.reset_index(drop=True)
+            frame.columns = [f"c{i}" for i in range(len(df.columns))]
+
+            if HAS_PYARROW:
+                meta["format"] = "feather"
+                frame.to_feather(tmp / "data.feather")
+            else:
+                meta["format"] = "npy"
+                meta["native"] = []
+                for i, name in enumerate(frame.columns):
+                    values = frame[name].to_numpy()
+                    native = values.dtype.kind in _NATIVE_KINDS
+                    meta["native"].append(native)
+                    np.save(tmp / f"{i}.npy", values, allow_pickle=not native)
+
+            with open(tmp / "meta.json", "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            try:
+                os.replace(tmp, target)
+            except OSError as e:
+                if e.errno not in (errno.EEXIST, errno.ENOTEMPTY):
+                    raise
+                # Another process stored the same sheet first.
+                shutil.rmtree(tmp, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    @staticmethod
+    def _load_sheet(target: Path) -> pd.DataFrame:
+        """Loads a DataFrame stored by ``_store_sheet``, memory-mapped."""
+        with open(target / "meta.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        columns = pd.read_pickle(target / "columns.pkl")
+
+        if meta["format"] == "feather":
+            table = feather.read_table(target / "data.feather", memory_map=True)
+            df = table.to_pandas()
+            df.columns = columns
+            return df
+
+        data = {}
+        for i, native in enumerate(meta["native"]):
+            if native:
+                values = np.load(target / f"{i}.npy", mmap_mode="c")
+                data[i] = values.view(np.ndarray)
+            else:
+                values = np.load(target / f"{i}.npy", allow_pickle=True)
+                data[i] = pd.Series(values).astype(meta["dtypes"][i])
+        # copy=False keeps the memory-mapped columns as separate blocks
+        # instead of consolidating (and copying) them.
+        df = pd.DataFrame(data, copy=False)
+        df.columns = columns
+        return df
+
+    # ------------------------------------------------------------ public API
+
+    def read_excel(
+        self,
+        file_path: Union[str, "os.PathLike[str]"],
+        sheet_name: Any = 0,
+        **kwargs: Any,
+    ) -> Union[pd.DataFrame, Dict[Any, pd.DataFrame]]:
+        """
+        Reads an Excel file through the cache.
+
+        Args:
+            file_path (str): Path to the Excel file.
+            sheet_name (str, int, list or None): Same semantics as
+                ``pd.read_excel``. None reads all sheets.
+            **kwargs: Additional read options, such as ``engine``. They are
+                part of the cache key.
+
+        Returns:
+            pd.DataFrame or dict: Sheet data, or a dict of DataFrames when
+            several sheets are requested.
+        """
+        entry = self._entry_dir(file_path)
+        entry.mkdir(parents=True, exist_ok=True)
+        os.utime(entry)
+
+        single = isinstance(sheet_name, (str, int))
+        if sheet_name is None:
+            requested: List[Any] = self._sheet_names(file_path, entry)
+        else:
+            requested = [sheet_name] if single else list(sheet_name)
+
+        result: Dict[Any, pd.DataFrame] = {}
+        missing = []
+        for name in requested:
+            target = entry / _options_key(name, kwargs)
+            if (target / "meta.json").exists():
+                result[name] = self._load_sheet(target)
+            else:
+                missing.append(name)
+
+        if missing:
+            parsed = read_excel_with_engine(file_path, sheet_name=missing, **kwargs)
+            for name in missing:
+                result[name] = parsed[name]
+                self._store_sheet(parsed[name], entry / _options_key(name, kwargs))
+            self.evict()
+
+        if single:
+            return result[sheet_name]
+        return {name: result[name] for name in requested}
+
+    def _sheet_names(
+        self, file_path: Union[str, "os.PathLike[str]"], entry: Path
+    ) -> List[str]:
+        """Returns the workbook sheet names, cached in the entry directory."""
+        names_file = entry / "sheet_names.json"
+        if names_file.exists():
+            with open(names_file, "r", encoding="utf-8") as f:
+                cached: List[str] = json.load(f)
+            return cached
+
+        with pd.ExcelFile(file_path, engine="openpyxl") as xls:
+            names = list(xls.sheet_names)
+        with open(names_file, "w", encoding="utf-8") as f:
+            json.dump(names, f)
+        return names
+
+    def size(self) -> int:
+        """Returns the total size in bytes of the cached data."""
+        return sum(size for _, size, _ in self._entries())
+
+    def _entries(self) -> List[Tuple[Path, int, float]]:
+        """Lists cache entries as (directory, size, last access time)."""
+        entries = []
+        for entry in self.cache_dir.iterdir():
+            if not entry.is_dir() or entry.name.startswith(".tmp-"):
+                continue
+            size = sum(f.stat().st_size for f in entry.rglob("*") if f.is_file())
+            entries.append((entry, size, entry.stat().st_mtime))
+        return entries
+
+    def evict(self) -> None:
+        """Removes least recently used entries until the cache fits max_bytes."""
+        entries = sorted(self._entries(), key=lambda item: item[2])
+        total = sum(size for _, size, _ in entries)
+        for entry, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self) -> None:
+        """Removes every cached entry."""
+        for entry, _, _ in self._entries():
+            shutil.rmtree(entry, ignore_errors=True)
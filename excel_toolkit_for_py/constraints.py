@@ -0,0 +1,387 @@
+"""
+Declarative column constraints compiled into vectorized checks.
+
+A schema maps column names to a Python type, a ``Column`` or a dict of
+``Column`` options, and may add cross-column ``checks`` (``DataFrame.eval``
+expressions that must hold on every row). ``compile_schema`` turns it into a
+``CompiledSchema`` once; each rule then evaluates a whole column at a time:
+
+* types and ranges compare converted NumPy arrays;
+* ``pattern`` runs ``Series.str.fullmatch`` over the distinct values;
+* ``isin`` uses ``Series.isin`` (a hash table lookup);
+* ``unique`` hashes the values with ``hash_pandas_object`` and looks for
+  repeated hashes.
+
+A ``CompiledSchema`` holds no per-file state and is picklable, so it can be
+built once and reused (or sent to worker processes) for thousands of files.
+
+Example:
+    >>> validator = compile_schema(
+    ...     {
+    ...         "id": Column(int, nullable=False, unique=True),
+    ...         "email": Column(str, pattern=r"[^@]+@[^@]+"),
+    ...         "status": Column(str, isin={"open", "closed"}),
+    ...         "total": {"type": float, "min": 0},
+    ...     },
+    ...     checks=["paid <= total"],
+    ... )
+    >>> validator.validate(df)["violations"]["total:min"]
+    {'column': 'total', 'rule': 'min', 'count': 2, 'rows': [14, 87]}
+"""
+
+import abc
+import datetime
+import re
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Collection,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import pandas as pd
+
+from .schema import Schema
+
+DEFAULT_SAMPLE_SIZE = 5
+# Names (plain or backtick-quoted) a check expression may refer to.
+_CHECK_NAME = re.compile(r"`([^`]+)`|([A-Za-z_]\w*)")
+_STRING_LITERAL = re.compile(r"'[^']*'|\"[^\"]*\"")
+
+
+@dataclass(frozen=True)
+class Column:
+    """
+    Constraints on one column. Missing values are only checked by
+    ``nullable``; every other rule ignores them.
+
+    Attributes:
+        type (type, optional): Expected Python type (``int`` also accepts
+            whole-number floats, ``float`` any number).
+        nullable (bool): If False, missing values are violations.
+        min, max (optional): Inclusive bounds for numbers, dates or strings.
+        pattern (str, optional): Regular expression every value must match
+            in full.
+        isin (collection, optional): Allowed values.
+        unique (bool): If True, repeated values are violations.
+    """
+
+    type: Optional[type] = None
+    nullable: bool = True
+    min: Any = None
+    max: Any = None
+    pattern: Optional[str] = None
+    isin: Optional[Collection[Any]] = None
+    unique: bool = False
+
+
+ColumnSpec = Union[type, Column, Dict[str, Any]]
+
+
+class Rule(abc.ABC):
+    """
+    A compiled rule. ``violations(df)`` returns a boolean NumPy mask with
+    True for every row that breaks the rule.
+
+    Attributes:
+        name (str): Unique name, ``"<column>:<kind>"`` or the expression.
+        column (str, optional): Column checked; None for row checks.
+        kind (str): ``type``, ``not_null``, ``min``, ``max``, ``pattern``,
+            ``isin``, ``unique`` or ``check``.
+        param: The rule parameter (type, bound, pattern, values, expression).
+    """
+
+    kind = ""
+
+    def __init__(self, column: Optional[str], param: Any = None) -> None:
+        self.column = column
+        self.param = param
+        self.name = f"{column}:{self.kind}"
+
+    @abc.abstractmethod
+    def violations(self, df: pd.DataFrame) -> np.ndarray:
+        """Violation mask over the rows of ``df``."""
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r}, {self.param!r})"
+
+
+class _ValueRule(Rule):
+    """Rule checked on the non-missing values of its column only."""
+
+    def violations(self, df: pd.DataFrame) -> np.ndarray:
+        series = df[self.column]
+        mask = np.zeros(len(series), dtype=bool)
+        present = series.notna().to_numpy()
+        if present.any():
+            mask[present] = self._check(series[present])
+        return mask
+
+    @abc.abstractmethod
+    def _check(self, values: pd.Series) -> np.ndarray:
+        """Violation mask over the non-missing values of the column."""
+
+
+def _numbers(values: pd.Series) -> pd.Series:
+    if values.dtype.kind in "iufb":
+        return values.astype(np.float64)
+    return pd.to_numeric(values, errors="coerce")
+
+
+def _isinstance_mask(
+    values: pd.Series, expected: Union[type, Tuple[type, ...]]
+) -> np.ndarray:
+    # Per-value fallback, only reached for object columns.
+    return ~np.fromiter(
+        (isinstance(value, expected) for value in values), bool, len(values)
+    )
+
+
+class _TypeRule(_ValueRule):
+    kind = "type"
+
+    def _check(self, values: pd.Series) -> np.ndarray:
+        expected = self.param
+        if expected is int:
+            numbers = _numbers(values).to_numpy()
+            fractional: np.ndarray = ~(
+                np.isfinite(numbers) & (numbers == np.floor(numbers))
+            )
+            return fractional
+        if expected is float:
+            if values.dtype.kind in "iufb":
+                return np.zeros(len(values), dtype=bool)
+            return _isinstance_mask(values, (float, int))
+        if expected is str and pd.api.types.infer_dtype(values) == "string":
+            return np.zeros(len(values), dtype=bool)
+        if values.dtype.kind == "M" and issubclass(pd.Timestamp, expected):
+            return np.zeros(len(values), dtype=bool)
+        return _isinstance_mask(values, expected)
+
+
+class _NotNullRule(Rule):
+    kind = "not_null"
+
+    def violations(self, df: pd.DataFrame) -> np.ndarray:
+        missing: np.ndarray = df[self.column].isna().to_numpy()
+        return missing
+
+
+class _BoundRule(_ValueRule):
+    def _values(self, values: pd.Series) -> pd.Series:
+        bound = self.param
+        if isinstance(bound, (int, float, np.number)) and not isinstance(bound, bool):
+            return _numbers(values)
+        if isinstance(bound, (datetime.date, np.datetime64)):
+            if values.dtype.kind != "M":
+                values = pd.to_datetime(values, errors="coerce")
+            return values
+        return values
+
+    def _check(self, values: pd.Series) -> np.ndarray:
+        values = self._values(values)
+        broken = values < self.param if self.kind == "min" else values > self.param
+        # Values that could not be converted are left to the type rule.
+        mask: np.ndarray = broken.fillna(False).to_numpy(dtype=bool)
+        return mask
+
+
+class _MinRule(_BoundRule):
+    kind = "min"
+
+
+class _MaxRule(_BoundRule):
+    kind = "max"
+
+
+class _PatternRule(_ValueRule):
+    kind = "pattern"
+
+    def __init__(self, column: str, param: str) -> None:
+        super().__init__(column, param)
+        # Compiled once; invalid patterns fail at compile time.
+        self.regex = re.compile(param)
+
+    def _check(self, values: pd.Series) -> np.ndarray:
+        # Each distinct value is matched once; codes map results back to rows.
+        codes, uniques = pd.factorize(values)
+        matched = pd.Series(uniques).astype(str).str.fullmatch(self.regex)
+        mismatched: np.ndarray = ~matched.to_numpy(dtype=bool)[codes]
+        return mismatched
+
+
+class _IsInRule(_ValueRule):
+    kind = "isin"
+
+    def __init__(self, column: str, param: Collection[Any]) -> None:
+        super().__init__(column, list(param))
+
+    def _check(self, values: pd.Series) -> np.ndarray:
+        outside: np.ndarray = ~values.isin(self.param).to_numpy()
+        return outside
+
+
+class _UniqueRule(_ValueRule):
+    kind = "unique"
+
+    def _check(self, values: pd.Series) -> np.ndarray:
+        hashes = pd.util.hash_pandas_object(values, index=False)
+        repeated: np.ndarray = hashes.duplicated(keep=False).to_numpy()
+        return repeated
+
+
+class _CheckRule(Rule):
+    """
+    Row check: a ``DataFrame.eval`` expression that must be True.
+
+    Rows where an operand is missing are skipped (they are left to the
+    ``nullable`` rules), and a check naming a column that is not in the data
+    fails on every row.
+    """
+
+    kind = "check"
+
+    def __init__(self, expression: str) -> None:
+        super().__init__(None, expression)
+        self.name = expression
+        self.names = {
+            quoted or name
+            for quoted, name in _CHECK_NAME.findall(_STRING_LITERAL.sub("", expression))
+        }
+
+    def violations(self, df: pd.DataFrame) -> np.ndarray:
+        try:
+            result = df.eval(self.param)
+        except pd.errors.UndefinedVariableError:
+            return np.ones(len(df), dtype=bool)
+        mask = ~np.asarray(result, dtype=bool)
+        operands = [column for column in df.columns if column in self.names]
+        if operands:
+            mask &= df[operands].notna().all(axis=1).to_numpy()
+        return mask
+
+
+def _column_rules(name: str, spec: Column) -> List[Rule]:
+    rules: List[Rule] = []
+    if spec.type is not None and spec.type is not object:
+        rules.append(_TypeRule(name, spec.type))
+    if not spec.nullable:
+        rules.append(_NotNullRule(name))
+    if spec.min is not None:
+        rules.append(_MinRule(name, spec.min))
+    if spec.max is not None:
+        rules.append(_MaxRule(name, spec.max))
+    if spec.pattern is not None:
+        rules.append(_PatternRule(name, spec.pattern))
+    if spec.isin is not None:
+        rules.append(_IsInRule(name, spec.isin))
+    if spec.unique:
+        rules.append(_UniqueRule(name))
+    return rules
+
+
+def _as_column(spec: ColumnSpec) -> Column:
+    if isinstance(spec, Column):
+        return spec
+    if isinstance(spec, Mapping):
+        return Column(**spec)
+    return Column(type=spec)
+
+
+class CompiledSchema:
+    """
+    A schema compiled into vectorized rules; build it with ``compile_schema``.
+
+    Attributes:
+        columns (List[str]): Columns required by the schema.
+        rules (List[Rule]): Compiled rules, in evaluation order.
+    """
+
+    def __init__(self, columns: List[str], rules: List[Rule]) -> None:
+        self.columns = columns
+        self.rules = rules
+
+    def __repr__(self) -> str:
+        return f"CompiledSchema({len(self.columns)} columns, {len(self.rules)} rules)"
+
+    def validate(
+        self, df: pd.DataFrame, sample_size: int = DEFAULT_SAMPLE_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Evaluates every rule against a DataFrame.
+
+        Args:
+            df (pd.DataFrame): Data to check.
+            sample_size (int): Row positions reported per broken rule.
+
+        Returns:
+            dict: ``valid`` (bool), ``rows`` (int), ``missing_columns`` (list)
+            and ``violations``: per rule name, the ``column``, ``rule`` kind,
+            ``count`` of rows breaking it and the first ``rows`` positions.
+            Column rules on missing columns are skipped; checks naming them
+            fail on every row.
+        """
+        missing = [column for column in self.columns if column not in df.columns]
+        violations = {}
+        for rule in self.rules:
+            if rule.column in missing:
+                continue
+            mask = rule.violations(df)
+            count = int(np.count_nonzero(mask))
+            violations[rule.name] = {
+                "column": rule.column,
+                "rule": rule.kind,
+                "count": count,
+                "rows": np.flatnonzero(mask)[:sample_size].tolist() if count else [],
+            }
+        return {
+            "valid": not missing
+            and all(item["count"] == 0 for item in violations.values()),
+            "rows": len(df),
+            "missing_columns": missing,
+            "violations": violations,
+        }
+
+
+def compile_schema(
+    schema: Union[Mapping[str, ColumnSpec], Schema, CompiledSchema],
+    checks: Optional[Sequence[str]] = None,
+) -> CompiledSchema:
+    """
+    Compiles a declarative schema into vectorized rules.
+
+    Args:
+        schema: Mapping of column name to a Python type, a ``Column`` or a
+            dict of ``Column`` options. An inferred ``Schema`` compiles to its
+            types plus ``nullable=False`` for the columns without nulls. A
+            ``CompiledSchema`` is returned as is (with ``checks`` added).
+        checks (list of str, optional): Row expressions that must hold, e.g.
+            ``"end >= start"`` or ``"price * qty == total"``; see
+            ``DataFrame.eval``.
+
+    Returns:
+        CompiledSchema: Reusable, picklable validator.
+    """
+    if isinstance(schema, CompiledSchema):
+        columns, rules = list(schema.columns), list(schema.rules)
+    else:
+        if isinstance(schema, Schema):
+            specs = {
+                name: Column(type=col.python_type, nullable=col.nullable)
+                for name, col in schema.columns.items()
+            }
+        else:
+            specs = {name: _as_column(spec) for name, spec in schema.items()}
+        columns = list(specs)
+        rules = [
+            rule for name, spec in specs.items() for rule in _column_rules(name, spec)
+        ]
+    rules.extend(_CheckRule(expression) for expression in checks or ())
+    return CompiledSchema(columns, rules)
@@ -1,62 +1,340 @@
 # 📦 excel_toolkit_for_py/conversions.py
 
+import base64
+import gzip
+import io
 import json
+import os
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
 
+import numpy as np
 import pandas as pd
 
+from .external import DEFAULT_RUN_ROWS, external_groupby, external_sort
+from .fast_reader import iter_excel_chunks, read_excel_with_engine
+from .instrumentation import count_rows, instrumented, span
+from .native_writer import write_excel_with_engine, write_xlsx_stream
+from .parallel_csv import DEFAULT_CHUNKSIZE
 
-def excel_to_json(file_path, sheet_name=None):
+try:
+    import zstandard
+
+    HAS_ZSTD = True
+except ImportError:  # pragma: no cover - depende do ambiente
+    HAS_ZSTD = False
+
+# Linhas processadas por vez nas conversões em streaming.
+STREAM_BATCH_SIZE = 10_000
+JSON_ORIENTS = ("records", "columns", "split")
+
+
+def _is_numpy_numeric(dtype: Any) -> bool:
+    """Indica se o dtype é numérico e tem um buffer NumPy nativo."""
+    return isinstance(dtype, np.dtype) and dtype.kind in "iufb"
+
+
+def _typed_array(series: pd.Series) -> Dict[str, str]:
+    """Codifica uma coluna numérica como buffer binário em base64."""
+    values = np.ascontiguousarray(series.to_numpy())
+    return {
+        "dtype": values.dtype.str,
+        "data": base64.b64encode(values.tobytes()).decode("ascii"),
+    }
+
+
+def _check_orient(orient: str, typed_arrays: bool) -> None:
+    """Valida a combinação de ``orient`` e ``typed_arrays``."""
+    if orient not in JSON_ORIENTS:
+        raise ValueError(f"orient inválido: {orient!r}. Use um de {JSON_ORIENTS}")
+    if typed_arrays and orient != "columns":
+        raise ValueError("typed_arrays só é suportado com orient='columns'")
+
+
+def _iter_frame_json(
+    df: pd.DataFrame, orient: str, typed_arrays: bool
+) -> Iterator[str]:
+    """
+    Serializa um DataFrame em pedaços de texto JSON.
+
+    Com "columns", cada coluna é serializada pelo encoder em C do pandas
+    diretamente a partir dos buffers NumPy, sem criar um dict por linha; com
+    "split", as linhas são serializadas em lotes de ``STREAM_BATCH_SIZE``.
+    """
+    _check_orient(orient, typed_arrays)
+    if orient == "records":
+        yield df.to_json(orient="records", date_format="iso", force_ascii=False)
+        return
+    if orient == "split":
+        yield '{"columns":' + json.dumps([str(c) for c in df.columns]) + ',"data":['
+        for start in range(0, len(df), STREAM_BATCH_SIZE):
+            batch = df.iloc[start : start + STREAM_BATCH_SIZE]
+            text = batch.to_json(orient="values", date_format="iso")
+            # Remove os colchetes externos para emendar os lotes.
+            yield ("," if start else "") + text[1:-1]
+        yield "]}"
+        return
+    yield "{"
+    for position, column in enumerate(df.columns):
+        series = df.iloc[:, position]
+        if typed_arrays and _is_numpy_numeric(series.dtype):
+            text = json.dumps(_typed_array(series), separators=(",", ":"))
+        else:
+            text = series.to_json(orient="values", date_format="iso")
+        separator = "," if position else ""
+        yield f"{separator}{json.dumps(str(column))}:{text}"
+    yield "}"
+
+
+def _frame_to_json(df: pd.DataFrame, orient: str, typed_arrays: bool) -> Any:
+    """Converte um DataFrame para objetos Python no formato pedido."""
+    _check_orient(orient, typed_arrays)
+    if orient == "records":
+        return df.to_dict(orient="records")
+    if orient == "split":
+        return df.to_dict(orient="split", index=False)
+    data = df.to_dict(orient="list")
+    if typed_arrays:
+        for position, column in enumerate(df.columns):
+            series = df.iloc[:, position]
+            if _is_numpy_numeric(series.dtype):
+                data[column] = _typed_array(series)
+    return data
+
+
+@instrumented
+def excel_to_json(
+    file_path, sheet_name=None, engine=None, orient="records", typed_arrays=False
+):
     """
     🔄 Converte um arquivo Excel em JSON.
 
     Args:
         file_path (str): Caminho para o arquivo Excel.
         sheet_name (str ou None): Nome da planilha a ser lida. Se None, lê todas.
+        engine (str ou None): Engine de leitura. "fast" usa o leitor XML rápido.
+        orient (str): "records" (lista de dicts, padrão), "columns"
+            ({coluna: [valores]}) ou "split" ({"columns": [...], "data":
+            [[valores da linha], ...]}, como no pandas), sem repetir os nomes
+            das colunas.
+        typed_arrays (bool): Se True, colunas numéricas de "columns" são
+            codificadas como {"dtype": ..., "data": <base64>}, que pode ser
+            lido com np.frombuffer.
 
     Returns:
         list ou dict: Dados da planilha em formato JSON (lista se única, dict se múltiplas).
+    """  # noqa: E501
+    try:
+        with span("parse", source=file_path) as phase:
+            data = read_excel_with_engine(
+                file_path, sheet_name=sheet_name, engine=engine
+            )
+            phase.record(rows=count_rows(data))
+        with span("build", rows=count_rows(data)):
+            if isinstance(data, dict):
+                # ✅ Retorna diretamente a lista se houver apenas uma planilha
+                return (
+                    _frame_to_json(data[list(data.keys())[0]], orient, typed_arrays)
+                    if len(data) == 1
+                    else {
+                        sheet: _frame_to_json(df, orient, typed_arrays)
+                        for sheet, df in data.items()
+                    }
+                )
+            else:
+                return _frame_to_json(data, orient, typed_arrays)
+    except Exception as e:
+        raise ValueError(f"❌ Erro ao converter Excel para JSON: {str(e)}")
+
+
+def _open_compressed(output_path: str, compression: Optional[str]) -> io.BufferedIOBase:
+    """Abre o arquivo de saída, com compressão gzip ou zstd em streaming."""
+    if compression is None:
+        return open(output_path, "wb")
+    if compression == "gzip":
+        return gzip.open(output_path, "wb")
+    if compression == "zstd":
+        if not HAS_ZSTD:
+            raise ValueError("Compressão zstd requer o pacote 'zstandard'")
+        writer: io.BufferedIOBase = zstandard.ZstdCompressor().stream_writer(
+            open(output_path, "wb")
+        )
+        return writer
+    raise ValueError(f"Compressão inválida: {compression!r}. Use 'gzip' ou 'zstd'")
+
+
+@instrumented
+def excel_to_json_file(
+    file_path: str,
+    output_path: str,
+    sheet_name: Union[str, int, None] = None,
+    engine: Optional[str] = None,
+    orient: str = "columns",
+    typed_arrays: bool = False,
+    compression: Optional[str] = None,
+) -> None:
+    """
+    🔄 Converte um arquivo Excel em um arquivo JSON compacto.
+
+    O JSON é serializado coluna a coluna e gravado (e comprimido) à medida
+    que é gerado, sem montar o documento inteiro em memória.
+
+    Args:
+        file_path (str): Caminho para o arquivo Excel.
+        output_path (str): Caminho do arquivo JSON de saída.
+        sheet_name (str ou None): Planilha a ser lida. Se None, lê todas e
+            grava {planilha: dados}.
+        engine (str ou None): Engine de leitura. "fast" usa o leitor XML rápido.
+        orient (str): "columns" (padrão), "split" ou "records".
+        typed_arrays (bool): Codifica colunas numéricas como buffers base64
+            (somente com orient="columns").
+        compression (str ou None): "gzip", "zstd" ou None.
+
+    Returns:
+        None
     """
     try:
-        data = pd.read_excel(file_path, sheet_name=sheet_name)
-        if isinstance(data, dict):
-            # ✅ Retorna diretamente a lista se houver apenas uma planilha
-            return (
-                data[list(data.keys())[0]].to_dict(orient="records")
-                if len(data) == 1
-                else {sheet: df.to_dict(orient="records") for sheet, df in data.items()}
+        with span("parse", source=file_path) as phase:
+            data = read_excel_with_engine(
+                file_path, sheet_name=sheet_name, engine=engine
             )
-        else:
-            return data.to_dict(orient="records")
+            phase.record(rows=count_rows(data))
+        with span("serialize", rows=count_rows(data)), _open_compressed(
+            output_path, compression
+        ) as output:
+            if isinstance(data, dict):
+                output.write(b"{")
+                for position, (sheet, df) in enumerate(data.items()):
+                    prefix = "," if position else ""
+                    output.write(f"{prefix}{json.dumps(str(sheet))}:".encode("utf-8"))
+                    for text in _iter_frame_json(df, orient, typed_arrays):
+                        output.write(text.encode("utf-8"))
+                output.write(b"}")
+            else:
+                for text in _iter_frame_json(data, orient, typed_arrays):
+                    output.write(text.encode("utf-8"))
     except Exception as e:
         raise ValueError(f"❌ Erro ao converter Excel para JSON: {str(e)}")
 
 
-def json_to_excel(json_data, file_path, sheet_name="Sheet1"):
+def iter_excel_to_json(
+    file_path: str,
+    sheet_name: Union[str, int] = 0,
+    ndjson: bool = False,
+    chunksize: int = STREAM_BATCH_SIZE,
+) -> Iterator[Union[Dict[Any, Any], str]]:
     """
-    🔄 Converte dados JSON em um arquivo Excel.
+    🔄 Converte uma planilha em JSON linha a linha, sem carregá-la inteira.
+
+    A planilha é lida em blocos pelo leitor XML rápido e cada bloco é
+    convertido e descartado antes do próximo.
 
     Args:
-        json_data (list ou dict): Dados JSON a serem convertidos.
+        file_path (str): Caminho para o arquivo Excel.
+        sheet_name (str ou int): Planilha a ser lida.
+        ndjson (bool): Se True, gera linhas NDJSON (str) em vez de dicts.
+        chunksize (int): Linhas lidas por bloco.
+
+    Yields:
+        dict ou str: Um registro (ou uma linha NDJSON) por linha da planilha.
+    """
+    try:
+        for chunk in iter_excel_chunks(
+            file_path, sheet_name=sheet_name, chunksize=chunksize
+        ):
+            if ndjson:
+                lines = chunk.to_json(
+                    orient="records", lines=True, date_format="iso", force_ascii=False
+                )
+                # Only "\n" separates records: splitlines() would also break on
+                # characters such as U+2028 that to_json leaves inside strings.
+                yield from (line for line in lines.split("\n") if line)
+            else:
+                yield from chunk.to_dict(orient="records")
+    except Exception as e:
+        raise ValueError(f"❌ Erro ao converter Excel para JSON: {str(e)}")
+
+
+def _record_batches(records: Iterable[Any], batch_size: int) -> Iterator[pd.DataFrame]:
+    """Agrupa um iterável de registros em DataFrames de até batch_size linhas."""
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield pd.DataFrame.from_records(batch)
+
+
+@instrumented
+def json_stream_to_excel(
+    records: Union[str, "os.PathLike[str]", Iterable[Any]],
+    file_path: str,
+    sheet_name: str = "Sheet1",
+    batch_size: int = STREAM_BATCH_SIZE,
+    columns: Optional[List[Any]] = None,
+) -> None:
+    """
+    🔄 Converte registros JSON em Excel em lotes, com uso de memória limitado.
+
+    Args:
+        records (iterável de dict ou str): Registros (por exemplo, um gerador)
+            ou caminho para um arquivo NDJSON.
         file_path (str): Caminho para salvar o arquivo Excel.
         sheet_name (str): Nome da planilha no arquivo Excel.
+        batch_size (int): Registros convertidos e gravados por vez.
+        columns (list ou None): Ordem das colunas. Se None, usa as chaves do
+            primeiro lote.
 
     Returns:
         None
     """
     try:
-        if isinstance(json_data, dict):
-            with pd.ExcelWriter(file_path, engine="xlsxwriter") as writer:
-                for sheet, data in json_data.items():
-                    pd.DataFrame(data).to_excel(writer, sheet_name=sheet, index=False)
+        options: Dict[str, Any] = {"sheet_name": sheet_name, "columns": columns}
+        if isinstance(records, (str, os.PathLike)):
+            with pd.read_json(records, lines=True, chunksize=batch_size) as reader:
+                write_xlsx_stream(reader, file_path, **options)
         else:
-            pd.DataFrame(json_data).to_excel(
-                file_path, sheet_name=sheet_name, index=False
+            write_xlsx_stream(
+                _record_batches(records, batch_size), file_path, **options
             )
     except Exception as e:
         raise ValueError(f"❌ Erro ao converter JSON para Excel: {str(e)}")
 
 
-def excel_to_csv(excel_path, csv_path, sheet_name=0, encoding="utf-8", **kwargs):
+@instrumented
+def json_to_excel(json_data, file_path, sheet_name="Sheet1", engine=None):
+    """
+    🔄 Converte dados JSON em um arquivo Excel.
+
+    Args:
+        json_data (list ou dict): Dados JSON a serem convertidos.
+        file_path (str): Caminho para salvar o arquivo Excel.
+        sheet_name (str): Nome da planilha no arquivo Excel.
+        engine (str ou None): Engine de escrita ("native", "xlsxwriter" ou
+            "openpyxl"). Se None, usa o engine padrão.
+
+    Returns:
+        None
+    """
+    try:
+        with span("build") as phase:
+            if isinstance(json_data, dict):
+                sheets = {
+                    sheet: pd.DataFrame(data) for sheet, data in json_data.items()
+                }
+            else:
+                sheets = {sheet_name: pd.DataFrame(json_data)}
+            phase.record(rows=count_rows(sheets))
+        with span("serialize", rows=count_rows(sheets)):
+            write_excel_with_engine(sheets, file_path, engine=engine)
+    except Exception as e:
+        raise ValueError(f"❌ Erro ao converter JSON para Excel: {str(e)}")
+
+
+@instrumented
+def excel_to_csv(
+    excel_path, csv_path, sheet_name=0, encoding="utf-8", engine=None, **kwargs
+):
     """
     🔄 Converte um arquivo Excel em CSV.
 
@@ -65,35 +343,96 @@ def excel_to_csv(excel_path, csv_path, sheet_name=0, encoding="utf-8", **kwargs)
         csv_path (str): Caminho para salvar o arquivo CSV.
         sheet_name (str ou int): Nome ou índice da planilha a ser convertida.
         encoding (str): Codificação do arquivo CSV.
+        engine (str ou None): Engine de leitura. "fast" usa o leitor XML rápido.
         **kwargs: Argumentos adicionais para pd.DataFrame.to_csv()
 
     Returns:
         None
     """
     try:
-        df = pd.read_excel(excel_path, sheet_name=sheet_name)
-        df.to_csv(csv_path, encoding=encoding, index=False, **kwargs)
+        with span("parse", source=excel_path) as phase:
+            df = read_excel_with_engine(
+                excel_path, sheet_name=sheet_name, engine=engine
+            )
+            if isinstance(df, dict):
+                raise ValueError("sheet_name deve indicar uma única planilha")
+            phase.record(rows=len(df))
+        with span("serialize", rows=len(df)):
+            df.to_csv(csv_path, encoding=encoding, index=False, **kwargs)
     except Exception as e:
         raise ValueError(f"❌ Erro ao converter Excel para CSV: {str(e)}")
 
 
-def csv_to_excel(csv_path, excel_path, sheet_name="Sheet1", encoding="utf-8", **kwargs):
+@instrumented
+def csv_to_excel(
+    csv_path,
+    excel_path,
+    sheet_name="Sheet1",
+    encoding="utf-8",
+    writer_engine=None,
+    sort_by=None,
+    ascending=True,
+    group_by=None,
+    agg=None,
+    chunksize=DEFAULT_CHUNKSIZE,
+    run_rows=DEFAULT_RUN_ROWS,
+    temp_dir=None,
+    **kwargs,
+):
     """
     🔄 Converte um arquivo CSV em Excel.
 
+    Com ``sort_by`` ou ``group_by``, o CSV é lido em blocos, ordenado ou
+    agrupado fora da memória (com arquivos temporários quando excede
+    ``run_rows`` linhas) e gravado em streaming pelo writer nativo.
+
     Args:
         csv_path (str): Caminho para o arquivo CSV.
         excel_path (str): Caminho para salvar o arquivo Excel.
         sheet_name (str): Nome da planilha no arquivo Excel.
         encoding (str): Codificação do arquivo CSV.
+        writer_engine (str ou None): Engine de escrita do Excel ("native",
+            "xlsxwriter" ou "openpyxl"). Se None, usa o engine padrão.
+            Ordenação e agrupamento exigem o engine "native".
+        sort_by (str ou list, opcional): Colunas de ordenação da saída.
+        ascending (bool ou list): Sentido da ordenação.
+        group_by (str ou list, opcional): Colunas de agrupamento; a saída tem
+            uma linha por grupo, ordenada pelas chaves (ou por ``sort_by``).
+        agg (dict, opcional): Agregações por coluna, por exemplo
+            {"total": ["sum", "mean"]}; veja ``external_groupby``. Se None,
+            conta as linhas de cada grupo.
+        chunksize (int): Linhas lidas do CSV por bloco ao ordenar/agrupar.
+        run_rows (int): Linhas mantidas em memória ao ordenar/agrupar.
+        temp_dir (str, opcional): Diretório dos arquivos temporários.
         **kwargs: Argumentos adicionais para pd.read_csv()
 
     Returns:
         None
     """
     try:
-        df = pd.read_csv(csv_path, encoding=encoding, **kwargs)
-        df.to_excel(excel_path, sheet_name=sheet_name, index=False)
+        if sort_by is not None or group_by is not None:
+            if writer_engine not in (None, "native"):
+                raise ValueError(
+                    "Ordenação e agrupamento usam o writer em streaming 'native'"
+                )
+            options = {"run_rows": run_rows, "temp_dir": temp_dir}
+            with span("serialize", source=csv_path), pd.read_csv(
+                csv_path, encoding=encoding, chunksize=chunksize, **kwargs
+            ) as reader:
+                batches = reader
+                if group_by is not None:
+                    batches = external_groupby(
+                        batches, group_by, agg, sort=sort_by is None, **options
+                    )
+                if sort_by is not None:
+                    batches = external_sort(batches, sort_by, ascending, **options)
+                write_xlsx_stream(batches, excel_path, sheet_name=sheet_name)
+            return
+        with span("parse", source=csv_path) as phase:
+            df = pd.read_csv(csv_path, encoding=encoding, **kwargs)
+            phase.record(rows=len(df))
+        with span("serialize", rows=len(df)):
+            write_excel_with_engine({sheet_name: df}, excel_path, engine=writer_engine)
     except Exception as e:
         raise ValueError(f"❌ Erro ao converter CSV para Excel: {str(e)}")
 
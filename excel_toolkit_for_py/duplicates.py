@@ -0,0 +1,297 @@
+"""
+Duplicate-row and key-uniqueness detection.
+
+Rows (or a subset of key columns) are reduced to 64-bit hashes with
+``pd.util.hash_pandas_object``, chunk by chunk, and the hashes of every file
+in a batch are grouped together, so duplicates are found within a file and
+across files. Only a 20-byte record (hash, file, row) per row is kept.
+
+With ``memory_limit``, records beyond the limit are spilled to disk into
+hash partitions (by the top bits of the hash); each partition then holds all
+the copies of its rows and is grouped on its own, so the memory used is
+about ``total records / partitions``.
+
+Two different rows share a 64-bit hash with negligible probability (about
+``n**2 / 2**65`` for ``n`` rows, i.e. 3e-6 for ten million rows).
+"""
+
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import instrumented, span
+from .schema import _close, _file_chunks
+from .utils import ReadSource, describe_source
+
+DEFAULT_PARTITIONS = 256
+DEFAULT_CHUNKSIZE = 100_000
+
+_RECORD = np.dtype([("hash", "<u8"), ("file", "<u4"), ("row", "<u8")])
+_INT64_MAX = float(np.iinfo(np.int64).max)
+
+
+@dataclass
+class DuplicateReport:
+    """
+    Duplicates found in a batch of sources.
+
+    Attributes:
+        sources (List[str]): Source names, in input order.
+        rows (int): Rows read.
+        duplicate_rows (int): Rows repeating an earlier row (the first copy,
+            by source order and row position, is not counted).
+        groups (int): Distinct rows (or keys) that appear more than once.
+        counts (List[int]): ``duplicate_rows`` per source.
+        locations (pd.DataFrame): Every copy of every duplicated row, with
+            ``source``, ``row`` (0-based data row), ``group`` and ``first``
+            (True for the copy that is kept). Empty if locations were not
+            requested.
+    """
+
+    sources: List[str]
+    rows: int = 0
+    duplicate_rows: int = 0
+    groups: int = 0
+    counts: List[int] = field(default_factory=list)
+    locations: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+
+def _normalized(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aligns dtypes that vary between chunks and files for the same values:
+    whole-number float columns (e.g. integers with missing values) become
+    ``Int64`` and datetimes use nanoseconds.
+    """
+    columns = {}
+    for name, series in frame.items():
+        kind = series.dtype.kind
+        if kind == "f":
+            values = series.to_numpy()
+            present = values[~np.isnan(values)]
+            if np.all(present == np.floor(present)) and np.all(
+                np.abs(present) <= _INT64_MAX
+            ):
+                series = series.astype("Int64")
+        elif kind == "M":
+            series = series.astype("datetime64[ns]")
+        columns[name] = series
+    return pd.DataFrame(columns, index=frame.index)
+
+
+def row_hashes(df: pd.DataFrame, subset: Optional[Sequence[str]] = None) -> np.ndarray:
+    """
+    Returns a 64-bit hash per row of ``df`` (or of its ``subset`` columns).
+
+    Equal values hash equally whether they come from ``int64``, ``Int64`` or
+    whole-number ``float64`` columns, and from string, object or category
+    columns.
+    """
+    frame = df if subset is None else df[list(subset)]
+    hashes: np.ndarray = pd.util.hash_pandas_object(
+        _normalized(frame), index=False
+    ).to_numpy(dtype=np.uint64)
+    return hashes
+
+
+class _Partitions:
+    """Records appended to ``count`` files on disk, keyed by hash prefix."""
+
+    def __init__(self, count: int, temp_dir: Optional[str]) -> None:
+        if count < 1 or count & (count - 1):
+            raise ValueError("partitions must be a power of two")
+        self.shift = np.uint64(64 - count.bit_length() + 1)
+        self.directory = tempfile.TemporaryDirectory(
+            prefix="excel-toolkit-dups-", dir=temp_dir
+        )
+        self.paths = [
+            os.path.join(self.directory.name, f"{i:04d}.bin") for i in range(count)
+        ]
+        self.files = [open(path, "wb") for path in self.paths]
+
+    def write(self, records: np.ndarray) -> None:
+        if len(self.files) == 1:
+            records.tofile(self.files[0])
+            return
+        keys = (records["hash"] >> self.shift).astype(np.int64)
+        order = np.argsort(keys, kind="stable")
+        records, keys = records[order], keys[order]
+        bounds = np.searchsorted(keys, np.arange(len(self.files) + 1))
+        for i, handle in enumerate(self.files):
+            if bounds[i] < bounds[i + 1]:
+                records[bounds[i] : bounds[i + 1]].tofile(handle)
+
+    def read(self) -> Iterator[np.ndarray]:
+        for handle in self.files:
+            handle.close()
+        for path in self.paths:
+            yield np.fromfile(path, dtype=_RECORD)
+            os.remove(path)
+
+    def close(self) -> None:
+        for handle in self.files:
+            handle.close()
+        self.directory.cleanup()
+
+
+def _group(
+    records: np.ndarray, with_locations: bool
+) -> Tuple[int, int, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Groups equal hashes. Returns the duplicate rows, the groups, the
+    duplicate rows per file and, if requested, the records of every repeated
+    row (sorted by group) with a mask of the first copy of each group.
+    """
+    order = np.lexsort((records["row"], records["file"], records["hash"]))
+    records = records[order]
+    same = records["hash"][1:] == records["hash"][:-1]
+    # ``starts`` marks the first record of each run of equal hashes.
+    starts = np.concatenate(([True], ~same))
+    repeated = np.zeros(len(records), dtype=bool)
+    repeated[1:] |= same
+    repeated[:-1] |= same
+    extra = repeated & ~starts
+    groups = int(np.count_nonzero(repeated & starts))
+    per_file = np.bincount(records["file"][extra])
+    located = records[repeated] if with_locations else records[:0]
+    first = starts[repeated] if with_locations else starts[:0]
+    return int(np.count_nonzero(extra)), groups, per_file, located, first
+
+
+def _locations(
+    located: List[Tuple[np.ndarray, np.ndarray, np.ndarray]], names: List[str]
+) -> pd.DataFrame:
+    if not located:
+        located = [(np.empty(0, _RECORD), np.empty(0, np.int64), np.empty(0, bool))]
+    records, groups, first = (np.concatenate(part) for part in zip(*located))
+    return pd.DataFrame(
+        {
+            "source": pd.Categorical.from_codes(
+                records["file"].astype(np.int64), categories=names
+            ),
+            "row": records["row"].astype(np.int64),
+            "group": groups,
+            "first": first,
+        }
+    )
+
+
+def _source_names(sources: Sequence[Any]) -> List[str]:
+    names: List[str] = []
+    for i, source in enumerate(sources):
+        name = (
+            f"<DataFrame {i}>"
+            if isinstance(source, pd.DataFrame)
+            else describe_source(source)
+        )
+        names.append(f"{name} [{i}]" if name in names else name)
+    return names
+
+
+def _chunks(
+    source: Any, sheet_name: Union[str, int], chunksize: int, **kwargs: Any
+) -> Iterator[pd.DataFrame]:
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunksize):
+            yield source.iloc[start : start + chunksize]
+        return
+    chunks = _file_chunks(source, sheet_name, chunksize, **kwargs)
+    try:
+        yield from chunks
+    finally:
+        _close(chunks)
+
+
+@instrumented
+def find_duplicates(
+    sources: Union[ReadSource, pd.DataFrame, Sequence[Union[ReadSource, pd.DataFrame]]],
+    subset: Optional[Sequence[str]] = None,
+    sheet_name: Union[str, int] = 0,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    memory_limit: Optional[int] = None,
+    partitions: int = DEFAULT_PARTITIONS,
+    temp_dir: Optional[str] = None,
+    locations: bool = True,
+    **kwargs: Any,
+) -> DuplicateReport:
+    """
+    Finds duplicate rows, or repeated keys, within and across sources.
+
+    Args:
+        sources: An ``.xlsx``/``.csv`` path, buffer or DataFrame, or a list
+            of them. Paths ending in ``.csv`` are read as CSV.
+        subset (list, optional): Key columns; if None, whole rows are
+            compared.
+        sheet_name (str or int): Sheet read from each workbook.
+        chunksize (int): Rows hashed at a time.
+        memory_limit (int, optional): Bytes of hash records kept in memory;
+            beyond it, records are spilled to disk partitions. None keeps
+            everything in memory.
+        partitions (int): Disk partitions (a power of two) used when
+            spilling.
+        temp_dir (str, optional): Directory for the partitions.
+        locations (bool): If False, only counts are returned.
+        **kwargs: Additional options for the chunked readers.
+
+    Returns:
+        DuplicateReport: Counts and locations of the duplicates.
+    """
+    if isinstance(sources, (str, bytes, os.PathLike, pd.DataFrame)) or not isinstance(
+        sources, Sequence
+    ):
+        sources = [sources]
+    names = _source_names(sources)
+    report = DuplicateReport(sources=names, counts=[0] * len(names))
+    buffered: List[np.ndarray] = []
+    buffered_bytes = 0
+    spill: Optional[_Partitions] = None
+    try:
+        with span("hash") as phase:
+            for file_index, source in enumerate(sources):
+                offset = 0
+                for chunk in _chunks(source, sheet_name, chunksize, **kwargs):
+                    records = np.empty(len(chunk), dtype=_RECORD)
+                    records["hash"] = row_hashes(chunk, subset)
+                    records["file"] = file_index
+                    records["row"] = np.arange(offset, offset + len(chunk))
+                    offset += len(chunk)
+                    if spill is not None:
+                        spill.write(records)
+                        continue
+                    buffered.append(records)
+                    buffered_bytes += records.nbytes
+                    if memory_limit is not None and buffered_bytes > memory_limit:
+                        spill = _Partitions(partitions, temp_dir)
+                        for pending in buffered:
+                            spill.write(pending)
+                        buffered = []
+                report.rows += offset
+            phase.record(rows=report.rows)
+
+        with span("group", rows=report.rows):
+            parts = (
+                spill.read()
+                if spill is not None
+                else [np.concatenate(buffered) if buffered else np.empty(0, _RECORD)]
+            )
+            located, group_base = [], 0
+            for records in parts:
+                extra, groups, per_file, rows, starts = _group(records, locations)
+                report.duplicate_rows += extra
+                report.groups += groups
+                for i, count in enumerate(per_file):
+                    report.counts[i] += int(count)
+                if locations and len(rows):
+                    group_ids = np.cumsum(starts) - 1 + group_base
+                    located.append((rows, group_ids, starts))
+                group_base += groups
+    finally:
+        if spill is not None:
+            spill.close()
+
+    if locations:
+        report.locations = _locations(located, names)
+    return report
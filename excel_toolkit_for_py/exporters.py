@@ -11,7 +11,10 @@ import pandas as pd
 import weasyprint
 from jinja2 import Template
 
+from .instrumentation import instrumented, span
 
+
+@instrumented
 def to_json(
     data: Union[pd.DataFrame, Dict, List], output_path: str, orient: str = "records"
 ) -> None:
@@ -30,6 +33,7 @@ def to_json(
             json.dump(data, f, indent=4, ensure_ascii=False)
 
 
+@instrumented
 def to_xml(
     data: Union[pd.DataFrame, Dict, List], output_path: str, root_name: str = "data"
 ) -> None:
@@ -73,6 +77,7 @@ def to_xml(
     tree.write(output_path, encoding="utf-8", xml_declaration=True)
 
 
+@instrumented
 def to_html(
     data: Union[pd.DataFrame, Dict, List], output_path: str, template_path: str = None
 ) -> None:
@@ -100,6 +105,7 @@ def to_html(
         f.write(html_content)
 
 
+@instrumented
 def to_pdf(
     data: Union[pd.DataFrame, Dict, List], output_path: str, template_path: str = None
 ) -> None:
@@ -115,8 +121,11 @@ def to_pdf(
     html_path = str(Path(output_path).with_suffix(".html"))
     to_html(data, html_path, template_path)
 
-    # Depois, convertemos o HTML para PDF
-    weasyprint.HTML(filename=html_path).write_pdf(output_path)
+    # Depois, montamos o layout e gravamos o PDF
+    with span("layout"):
+        document = weasyprint.HTML(filename=html_path).render()
+    with span("write"):
+        document.write_pdf(output_path)
 
     # Removemos o arquivo HTML temporário
     Path(html_path).unlink()
@@ -0,0 +1,410 @@
+"""
+Out-of-core sort and group-by over chunked input.
+
+Both stages take an iterable of DataFrames (e.g. a chunked CSV or Excel
+reader) and yield DataFrames, so they can feed ``write_xlsx_stream``
+directly. At most about ``run_rows`` rows are kept in memory.
+
+``external_sort`` is an external merge sort: the input is cut into sorted
+runs of ``run_rows`` rows that are spilled to temporary files, then the runs
+are merged. The merge works on blocks: the current block of every run is
+sorted together and every row up to the last row of the block that ends
+first is emitted, since no row still on disk can sort before it. Ties keep
+their input order (the sort is stable).
+
+``external_groupby`` aggregates each chunk into partial results (sums,
+counts, minimums...) and combines them. When there are more groups than fit
+in memory, partial results are spilled into hash partitions of the group
+keys; each partition holds every partial result of its groups and is
+combined on its own.
+
+Spill files hold pickled blocks of rows and are removed when the output is
+exhausted or closed.
+"""
+
+import os
+import pickle
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .duplicates import row_hashes
+
+DEFAULT_RUN_ROWS = 1_000_000
+DEFAULT_BATCH_SIZE = 50_000
+DEFAULT_PARTITIONS = 64
+
+# Partial aggregates needed by each function, and how partials are combined.
+_PARTIALS = {
+    "sum": ("sum",),
+    "count": ("count",),
+    "size": ("size",),
+    "min": ("min",),
+    "max": ("max",),
+    "mean": ("sum", "count"),
+    "first": ("first",),
+    "last": ("last",),
+}
+_COMBINE = {
+    "sum": "sum",
+    "count": "sum",
+    "size": "sum",
+    "min": "min",
+    "max": "max",
+    "first": "first",
+    "last": "last",
+}
+
+AggSpec = Optional[Dict[str, Union[str, Sequence[str]]]]
+
+
+class _Spill:
+    """DataFrames appended to a temporary file and read back in order."""
+
+    def __init__(self, directory: str, name: str) -> None:
+        self.path = os.path.join(directory, name)
+        self.handle = open(self.path, "wb")
+        self.rows = 0
+
+    def write(self, frame: pd.DataFrame, block_rows: int) -> None:
+        for start in range(0, len(frame), block_rows):
+            block = frame.iloc[start : start + block_rows]
+            pickle.dump(block, self.handle, protocol=pickle.HIGHEST_PROTOCOL)
+        self.rows += len(frame)
+
+    def read(self) -> Iterator[pd.DataFrame]:
+        self.handle.close()
+        with open(self.path, "rb") as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
+
+    def close(self) -> None:
+        self.handle.close()
+
+
+class _SpillDirectory:
+    """A temporary directory of ``_Spill`` files."""
+
+    def __init__(self, temp_dir: Optional[str], prefix: str) -> None:
+        self.directory = tempfile.TemporaryDirectory(prefix=prefix, dir=temp_dir)
+        self.files: List[_Spill] = []
+
+    def new(self) -> _Spill:
+        spill = _Spill(self.directory.name, f"{len(self.files):05d}.pkl")
+        self.files.append(spill)
+        return spill
+
+    def close(self) -> None:
+        for spill in self.files:
+            spill.close()
+        self.directory.cleanup()
+
+
+def _as_list(columns: Union[Any, Sequence[Any]]) -> List[Any]:
+    if isinstance(columns, (list, tuple)):
+        return list(columns)
+    return [columns]
+
+
+def _sort_order(
+    frame: pd.DataFrame, by: List[Any], ascending: Union[bool, Sequence[bool]]
+) -> np.ndarray:
+    """Stable sort order of ``frame`` (which has a default index) by ``by``."""
+    keys = frame[by].sort_values(
+        by, ascending=ascending, kind="stable", na_position="last"
+    )
+    order: np.ndarray = keys.index.to_numpy()
+    return order
+
+
+def _sorted(
+    frame: pd.DataFrame, by: List[Any], ascending: Union[bool, Sequence[bool]]
+) -> pd.DataFrame:
+    frame = frame.reset_index(drop=True)
+    return frame.take(_sort_order(frame, by, ascending)).reset_index(drop=True)
+
+
+def _slices(frame: pd.DataFrame, batch_size: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(frame), batch_size):
+        yield frame.iloc[start : start + batch_size]
+
+
+class _Run:
+    """Reads a spilled run, keeping the rows not yet merged in ``rows``."""
+
+    def __init__(self, spill: _Spill) -> None:
+        self.blocks = spill.read()
+        self.rows: Optional[pd.DataFrame] = None
+        self.exhausted = False
+
+    def fill(self, target: int) -> None:
+        """Reads blocks until ``rows`` holds ``target`` rows or the run ends."""
+        pieces = [] if self.rows is None else [self.rows]
+        size = sum(len(piece) for piece in pieces)
+        while size < target and not self.exhausted:
+            block = next(self.blocks, None)
+            if block is None:
+                self.exhausted = True
+            else:
+                pieces.append(block)
+                size += len(block)
+        if len(pieces) > 1:
+            self.rows = pd.concat(pieces, ignore_index=True)
+        elif pieces:
+            self.rows = pieces[0]
+
+
+def _merge(
+    runs: List[_Run],
+    by: List[Any],
+    ascending: Union[bool, Sequence[bool]],
+    target: int,
+) -> Iterator[pd.DataFrame]:
+    """Merges sorted runs block by block."""
+    while True:
+        for run in runs:
+            if run.rows is None or len(run.rows) < target:
+                run.fill(target)
+        active = [run for run in runs if run.rows is not None and len(run.rows)]
+        if not active:
+            return
+        frames = [run.rows for run in active if run.rows is not None]
+        ends = np.cumsum([len(frame) for frame in frames])
+        buffer = pd.concat(frames, ignore_index=True)
+        order = _sort_order(buffer, by, ascending)
+        position = np.empty(len(order), dtype=np.int64)
+        position[order] = np.arange(len(order))
+        # Rows of a run that still has blocks on disk can only follow the last
+        # row of its current block.
+        limits = [
+            position[end - 1] for run, end in zip(active, ends) if not run.exhausted
+        ]
+        cut = min(limits) + 1 if limits else len(order)
+        yield buffer.take(order[:cut]).reset_index(drop=True)
+        # The rest stays with its run, in the run's order.
+        rest = np.sort(order[cut:])
+        bounds = np.searchsorted(rest, np.concatenate(([0], ends)))
+        for i, run in enumerate(active):
+            run.rows = buffer.take(rest[bounds[i] : bounds[i + 1]]).reset_index(
+                drop=True
+            )
+
+
+def external_sort(
+    chunks: Iterable[pd.DataFrame],
+    by: Union[Any, Sequence[Any]],
+    ascending: Union[bool, Sequence[bool]] = True,
+    run_rows: int = DEFAULT_RUN_ROWS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    temp_dir: Optional[str] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Sorts chunked data that may not fit in memory.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): Input blocks of rows.
+        by (str or list): Sort columns.
+        ascending (bool or list of bool): Sort direction, per column if a
+            list. Missing values are placed last.
+        run_rows (int): Rows sorted in memory at a time; if the input is
+            larger, sorted runs of this size are spilled to disk and merged.
+        batch_size (int): Rows per block written to (and read from) the
+            spill files, and per output frame when nothing was spilled.
+        temp_dir (str, optional): Directory for the spill files.
+
+    Yields:
+        pd.DataFrame: Consecutive blocks of the sorted rows.
+    """
+    by = _as_list(by)
+    ascending = list(ascending) if isinstance(ascending, (list, tuple)) else ascending
+    spills: Optional[_SpillDirectory] = None
+    pending: List[pd.DataFrame] = []
+    pending_rows = 0
+    try:
+        for chunk in chunks:
+            pending.append(chunk)
+            pending_rows += len(chunk)
+            if pending_rows >= run_rows:
+                spills = spills or _SpillDirectory(temp_dir, "excel-toolkit-sort-")
+                run = _sorted(pd.concat(pending, ignore_index=True), by, ascending)
+                spills.new().write(run, batch_size)
+                pending, pending_rows = [], 0
+        last = None
+        if pending:
+            last = _sorted(pd.concat(pending, ignore_index=True), by, ascending)
+        if spills is None:
+            if last is not None:
+                yield from _slices(last, batch_size)
+            return
+        if last is not None:
+            spills.new().write(last, batch_size)
+        runs = [_Run(spill) for spill in spills.files]
+        yield from _merge(runs, by, ascending, max(1, run_rows // len(runs)))
+    finally:
+        if spills is not None:
+            spills.close()
+
+
+def _agg_specs(agg: AggSpec) -> List[Tuple[str, Any, str]]:
+    """Returns ``(output name, column, function)`` for every aggregation."""
+    if not agg:
+        return [("size", None, "size")]
+    specs = []
+    for column, functions in agg.items():
+        names = [functions] if isinstance(functions, str) else list(functions)
+        for function in names:
+            if function not in _PARTIALS:
+                raise ValueError(
+                    f"Unsupported aggregation {function!r}; use one of "
+                    f"{sorted(_PARTIALS)}"
+                )
+            name = column if isinstance(functions, str) else f"{column}_{function}"
+            specs.append((name, column, function))
+    return specs
+
+
+class _GroupBy:
+    """Partial and final aggregation of a group-by."""
+
+    def __init__(self, by: List[Any], specs: List[Tuple[str, Any, str]]) -> None:
+        self.by = by
+        self.specs = specs
+        self.partials: Dict[str, Tuple[Any, str]] = {}
+        for _, column, function in specs:
+            for partial in _PARTIALS[function]:
+                key = (column, partial)
+                if key not in self.partials.values():
+                    self.partials[f"_p{len(self.partials)}"] = key
+
+    def _group(self, frame: pd.DataFrame) -> Any:
+        return frame.groupby(self.by, sort=False, dropna=False, observed=True)
+
+    def partial(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        named = {
+            name: (self.by[0] if column is None else column, partial)
+            for name, (column, partial) in self.partials.items()
+        }
+        return self._group(chunk).agg(**named).reset_index()
+
+    def combine(self, partials: List[pd.DataFrame]) -> pd.DataFrame:
+        frame = pd.concat(partials, ignore_index=True)
+        named = {
+            name: (name, _COMBINE[partial])
+            for name, (_, partial) in self.partials.items()
+        }
+        return self._group(frame).agg(**named).reset_index()
+
+    def final(self, combined: pd.DataFrame) -> pd.DataFrame:
+        names = {key: name for name, key in self.partials.items()}
+        data = {column: combined[column] for column in self.by}
+        for output, column, function in self.specs:
+            if function == "mean":
+                total = combined[names[(column, "sum")]]
+                count = combined[names[(column, "count")]]
+                data[output] = total / count.where(count > 0)
+            else:
+                data[output] = combined[names[(column, function)]]
+        return pd.DataFrame(data)
+
+
+def _partitioned(
+    frame: pd.DataFrame, by: List[Any], partitions: List[_Spill], block_rows: int
+) -> None:
+    codes = (row_hashes(frame, by) % np.uint64(len(partitions))).astype(np.int64)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(partitions) + 1))
+    for i, spill in enumerate(partitions):
+        if bounds[i] < bounds[i + 1]:
+            spill.write(frame.take(order[bounds[i] : bounds[i + 1]]), block_rows)
+
+
+def _groupby_unsorted(
+    chunks: Iterable[pd.DataFrame],
+    group: _GroupBy,
+    run_rows: int,
+    batch_size: int,
+    partitions: int,
+    temp_dir: Optional[str],
+) -> Iterator[pd.DataFrame]:
+    spills: Optional[_SpillDirectory] = None
+    partials: List[pd.DataFrame] = []
+    partial_rows = 0
+    try:
+        for chunk in chunks:
+            if not len(chunk):
+                continue
+            partial = group.partial(chunk)
+            if spills is not None:
+                _partitioned(partial, group.by, spills.files, batch_size)
+                continue
+            partials.append(partial)
+            partial_rows += len(partial)
+            if partial_rows > run_rows:
+                partials = [group.combine(partials)]
+                partial_rows = len(partials[0])
+                if partial_rows > run_rows // 2:
+                    # Too many groups to keep: spill them by key hash.
+                    spills = _SpillDirectory(temp_dir, "excel-toolkit-groupby-")
+                    for _ in range(partitions):
+                        spills.new()
+                    _partitioned(partials[0], group.by, spills.files, batch_size)
+                    partials, partial_rows = [], 0
+        if spills is None:
+            if partials:
+                yield group.final(group.combine(partials))
+            return
+        for spill in spills.files:
+            blocks = list(spill.read())
+            if blocks:
+                yield group.final(group.combine(blocks))
+    finally:
+        if spills is not None:
+            spills.close()
+
+
+def external_groupby(
+    chunks: Iterable[pd.DataFrame],
+    by: Union[Any, Sequence[Any]],
+    agg: AggSpec = None,
+    sort: bool = True,
+    run_rows: int = DEFAULT_RUN_ROWS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    partitions: int = DEFAULT_PARTITIONS,
+    temp_dir: Optional[str] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Groups chunked data that may not fit in memory.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): Input blocks of rows.
+        by (str or list): Group columns. Missing keys form their own group.
+        agg (dict, optional): ``{column: function or [functions]}`` with
+            "sum", "count", "size", "min", "max", "mean", "first" or "last".
+            A single function keeps the column name; a list names the outputs
+            ``<column>_<function>``. None counts the rows of each group in a
+            "size" column.
+        sort (bool): If True, groups are returned sorted by ``by`` (with an
+            external sort when the groups were spilled); otherwise in no
+            particular order.
+        run_rows (int): Partial groups kept in memory before spilling, and
+            rows per run of the final sort.
+        batch_size (int): Rows per block in the spill files.
+        partitions (int): Hash partitions used when spilling.
+        temp_dir (str, optional): Directory for the spill files.
+
+    Yields:
+        pd.DataFrame: The group keys followed by the aggregated columns.
+    """
+    by = _as_list(by)
+    group = _GroupBy(by, _agg_specs(agg))
+    groups = _groupby_unsorted(
+        chunks, group, run_rows, batch_size, partitions, temp_dir
+    )
+    if sort:
+        groups = external_sort(groups, by, True, run_rows, batch_size, temp_dir)
+    return groups
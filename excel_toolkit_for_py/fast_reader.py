@@ -0,0 +1,830 @@
+"""
+Fast-path reader engine for ``.xlsx`` files.
+
+Instead of going through openpyxl, which builds one Cell object per value and
+resolves styles that are never used, this module streams the worksheet XML
+straight from the zip container, resolves shared strings from a preloaded
+list and builds each column directly into a typed NumPy array. Date cells are
+converted in a single vectorized pass once the sheet has been read.
+"""
+
+import functools
+import itertools
+import posixpath
+import re
+import zipfile
+from array import array
+from xml.parsers import expat
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import pandas as pd
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+
+from .utils import binary_source
+
+try:
+    from lxml.etree import iterparse
+except ImportError:  # pragma: no cover - depends on the environment
+    from xml.etree.ElementTree import iterparse
+
+_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_DOC_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# Tag names as reported by expat with "}" as namespace separator.
+_ROW = _MAIN[1:] + "row"
+_CELL = _MAIN[1:] + "c"
+_VALUE = _MAIN[1:] + "v"
+_TEXT = _MAIN[1:] + "t"
+
+_READ_BLOCK_SIZE = 1024 * 1024
+# Smallest block read when only the first ``nrows`` rows are wanted.
+_MIN_READ_BLOCK_SIZE = 64 * 1024
+DEFAULT_CHUNKSIZE = 100_000
+
+# Excel serial day 0 in the 1900 and 1904 date systems.
+_EPOCH_1900 = np.datetime64("1899-12-30", "us")
+_EPOCH_1904 = np.datetime64("1904-01-01", "us")
+_MS_PER_DAY = 86400 * 1000
+# Whole numbers at or above this magnitude do not fit in int64 and stay float.
+_INT64_LIMIT = 2.0**63
+# Datetime resolution pandas uses for values read through openpyxl.
+_DATETIME_DTYPE = pd.Series([pd.Timestamp(0).to_pydatetime()]).dtype
+
+FAST_ENGINE_OPTIONS = frozenset(
+    {"usecols", "nrows", "skiprows", "dtype", "parse_dates"}
+)
+
+# Strings read as missing values, like pandas' default ``na_values``.
+_NA_STRINGS = frozenset(
+    {
+        "",
+        "#N/A",
+        "#N/A N/A",
+        "#NA",
+        "-1.#IND",
+        "-1.#QNAN",
+        "-NaN",
+        "-nan",
+        "1.#IND",
+        "1.#QNAN",
+        "<NA>",
+        "N/A",
+        "NA",
+        "NULL",
+        "NaN",
+        "None",
+        "n/a",
+        "nan",
+        "null",
+    }
+)
+
+Row = List[Tuple[int, Any, bool]]
+
+
+_COLUMN_INDEXES: Dict[str, int] = {}
+
+# Byte patterns for scanning worksheet XML without parsing it.
+_ROW_TAG = re.compile(rb"<(?:\w+:)?row\b([^>]*)>")
+_ROW_NUMBER = re.compile(rb'\sr="(\d+)"')
+_SHEET_DATA = re.compile(rb"<(\w+:)?sheetData\b[^>]*?(/?)>")
+_DIMENSION = re.compile(rb'(<(?:\w+:)?dimension\b[^>]*?\bref=")([^"]*)(")')
+_CELL_REF = re.compile(r"([A-Z]+)(\d+)")
+
+
+def _column_index(ref: str) -> int:
+    """Converts a cell reference such as 'AB12' into a 0-based column index."""
+    letters = ref.rstrip("0123456789")
+    index = _COLUMN_INDEXES.get(letters)
+    if index is None:
+        index = 0
+        for char in letters.upper():
+            index = index * 26 + (ord(char) - 64)
+        index = _COLUMN_INDEXES[letters] = index - 1
+    return index
+
+
+def _read_xml(zf: zipfile.ZipFile, path: str) -> Iterator[Any]:
+    """Yields the elements of an archive member as they finish parsing."""
+    with zf.open(path) as f:
+        for _, elem in iterparse(f, events=("end",)):
+            yield elem
+
+
+def _member_blocks(zf: zipfile.ZipFile, path: str) -> Iterator[bytes]:
+    """Yields the decompressed contents of an archive member in blocks."""
+    with zf.open(path) as f:
+        yield from iter(lambda: f.read(_READ_BLOCK_SIZE), b"")
+
+
+def sheet_dimension(zf: zipfile.ZipFile, path: str) -> Optional[str]:
+    """
+    Returns the ``dimension`` reference of a worksheet (e.g. "A1:C10").
+
+    Only the part of the worksheet before ``sheetData`` is decompressed.
+    Returns None when the worksheet does not declare its dimension.
+    """
+    head = b""
+    end = None
+    for block in _member_blocks(zf, path):
+        head += block
+        match = _SHEET_DATA.search(head)
+        if match is not None:
+            end = match.start()
+            break
+    dimension = _DIMENSION.search(head, 0, len(head) if end is None else end)
+    return None if dimension is None else dimension.group(2).decode("ascii")
+
+
+def last_row_number(zf: zipfile.ZipFile, path: str) -> int:
+    """
+    Returns the number of the last row of a worksheet (0 when it is empty).
+
+    The row tags are found with a byte scan of the decompressed XML; cells
+    are never parsed.
+    """
+    last = 0
+    tail = b""
+    for block in _member_blocks(zf, path):
+        data = tail + block
+        # A tag that starts before the last "<" also ends before it.
+        cut = data.rfind(b"<")
+        cut = len(data) if cut == -1 else cut
+        for match in _ROW_TAG.finditer(data, 0, cut):
+            number = _ROW_NUMBER.search(match.group(1))
+            last = int(number.group(1)) if number else last + 1
+        tail = data[cut:]
+    return last
+
+
+class _Workbook:
+    """Index of the sheets, shared strings and date styles of a workbook."""
+
+    def __init__(self, zf: zipfile.ZipFile, lazy_strings: bool = False) -> None:
+        self.zf = zf
+        # Parse the shared strings only up to the highest index looked up.
+        self.lazy_strings = lazy_strings
+        self.sheets: List[Tuple[str, str]] = []
+        self.date1904 = False
+
+        rels = {}
+        # Relationship type (e.g. "styles") -> archive path.
+        self.parts: Dict[str, str] = {}
+        for elem in _read_xml(zf, "xl/_rels/workbook.xml.rels"):
+            if elem.tag == _PKG_REL + "Relationship":
+                target = elem.get("Target")
+                if target.startswith("/"):
+                    target = target[1:]
+                else:
+                    target = posixpath.normpath(posixpath.join("xl", target))
+                rels[elem.get("Id")] = target
+                self.parts[elem.get("Type").rsplit("/", 1)[-1]] = target
+
+        for elem in _read_xml(zf, "xl/workbook.xml"):
+            if elem.tag == _MAIN + "sheet":
+                self.sheets.append((elem.get("name"), rels[elem.get(_DOC_REL + "id")]))
+            elif elem.tag == _MAIN + "workbookPr":
+                self.date1904 = elem.get("date1904") in ("1", "true")
+
+        self.date_styles = self._load_date_styles(self.parts.get("styles"))
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return [name for name, _ in self.sheets]
+
+    @functools.cached_property
+    def shared_strings(self) -> Any:
+        """The shared strings table, loaded on first use."""
+        strings = self._iter_shared_strings(self.parts.get("sharedStrings"))
+        if self.lazy_strings:
+            return _LazyStrings(strings)
+        return list(strings)
+
+    def _iter_shared_strings(self, path: Optional[str]) -> Iterator[str]:
+        """Yields the entries of the shared strings table in order."""
+        if path is None or path not in self.zf.namelist():
+            return
+        for elem in _read_xml(self.zf, path):
+            if elem.tag == _MAIN + "si":
+                # Rich text is split into runs; phonetic hints are skipped.
+                texts = [t.text or "" for t in elem.iter(_MAIN + "t")]
+                phonetic = [t.text or "" for p in elem.iter(_MAIN + "rPh") for t in p]
+                if phonetic:
+                    texts = texts[: len(texts) - len(phonetic)]
+                yield "".join(texts)
+                elem.clear()
+
+    def _load_date_styles(self, path: Optional[str]) -> List[bool]:
+        """Returns, for each cell style index, whether it formats a date."""
+        if path is None or path not in self.zf.namelist():
+            return []
+        custom = {}
+        flags = []
+        in_cell_xfs = False
+        with self.zf.open(path) as f:
+            for event, elem in iterparse(f, events=("start", "end")):
+                if elem.tag == _MAIN + "cellXfs":
+                    in_cell_xfs = event == "start"
+                elif event != "end":
+                    continue
+                elif elem.tag == _MAIN + "numFmt":
+                    custom[int(elem.get("numFmtId"))] = elem.get("formatCode")
+                elif elem.tag == _MAIN + "xf" and in_cell_xfs:
+                    fmt_id = int(elem.get("numFmtId", 0))
+                    code = custom.get(fmt_id, BUILTIN_FORMATS.get(fmt_id))
+                    flags.append(code is not None and is_date_format(code))
+        return flags
+
+    def resolve(self, sheet_name: Union[str, int]) -> Tuple[str, str]:
+        """Returns (name, archive path) for a sheet name or position."""
+        if isinstance(sheet_name, int):
+            return self.sheets[sheet_name]
+        for name, path in self.sheets:
+            if name == sheet_name:
+                return name, path
+        raise ValueError(f"Worksheet named '{sheet_name}' not found")
+
+
+class _LazyStrings:
+    """Shared strings parsed on demand, up to the highest index looked up."""
+
+    def __init__(self, strings: Iterator[str]) -> None:
+        self.strings: List[str] = []
+        self.pending = strings
+
+    def __getitem__(self, index: int) -> str:
+        strings = self.strings
+        while index >= len(strings):
+            value = next(self.pending, None)
+            if value is None:
+                raise IndexError(f"Shared string {index} out of range")
+            strings.append(value)
+        return strings[index]
+
+
+class _RowCollector:
+    """
+    Expat handlers that turn worksheet XML into rows.
+
+    Using callbacks instead of ``iterparse`` avoids building an Element for
+    every cell, which is where most of the parsing time would otherwise go.
+    A cell is complete when the next cell or row starts, or when the document
+    ends, so end tags only need to stop text capture.
+    """
+
+    def __init__(self, book: _Workbook, block_size: int = _READ_BLOCK_SIZE) -> None:
+        self.shared = book.shared_strings
+        self.block_size = block_size
+        self.date_styles = book.date_styles
+        self.rows: List[Tuple[int, Row]] = []
+        self.row: Row = []
+        self.row_index = -1
+        self.next_col = 0
+        # Column indexes to keep; cells outside it are never converted.
+        self.wanted: Optional[Set[int]] = None
+        self.skip = False
+        self.col = 0
+        self.kind = "n"
+        self.style = 0
+        self.capture = False
+        self.value: Optional[str] = None
+
+        self.parser = expat.ParserCreate(namespace_separator="}")
+        self.parser.buffer_text = True
+        self.parser.buffer_size = _READ_BLOCK_SIZE
+        self.parser.StartElementHandler = self.start
+        self.parser.EndElementHandler = self.end
+        self.parser.CharacterDataHandler = self.data
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        if tag == _CELL:
+            if self.value is not None:
+                self._add_cell(self.value)
+            ref = attrib.get("r")
+            self.col = _column_index(ref) if ref else self.next_col
+            self.next_col = self.col + 1
+            self.skip = self.wanted is not None and self.col not in self.wanted
+            self.kind = attrib.get("t", "n")
+            self.style = int(attrib.get("s", 0))
+            self.capture = False
+        elif tag == _VALUE or tag == _TEXT:
+            self.capture = not self.skip
+        elif tag == _ROW:
+            self._end_row()
+            ref = attrib.get("r")
+            self.row_index = int(ref) - 1 if ref else self.row_index + 1
+        else:
+            self.capture = False
+
+    def data(self, data: str) -> None:
+        if self.capture:
+            # Inline strings may be split into several rich text runs.
+            self.value = data if self.value is None else self.value + data
+
+    def end(self, tag: str) -> None:
+        self.capture = False
+
+    def _end_row(self) -> None:
+        if self.value is not None:
+            self._add_cell(self.value)
+        if self.row:
+            self.rows.append((self.row_index, self.row))
+            self.row = []
+        self.next_col = 0
+
+    def _add_cell(self, text: str) -> None:
+        self.value = None
+        kind = self.kind
+        if kind == "n":
+            style = self.style
+            is_date = style < len(self.date_styles) and self.date_styles[style]
+            self.row.append((self.col, float(text), is_date))
+        elif kind == "s":
+            self.row.append((self.col, self.shared[int(text)], False))
+        elif kind == "str" or kind == "inlineStr":
+            self.row.append((self.col, text, False))
+        elif kind == "b":
+            self.row.append((self.col, text == "1", False))
+        elif kind == "d":
+            self.row.append((self.col, pd.Timestamp(text), False))
+        # Error cells ("e") are read as missing values.
+
+    def feed(self, block: bytes, final: bool = False) -> List[Tuple[int, Row]]:
+        """Parses a block of XML and returns the rows completed so far."""
+        self.parser.Parse(block, final)
+        if final:
+            self._end_row()
+        rows, self.rows = self.rows, []
+        return rows
+
+    def iter_rows(
+        self, zf: zipfile.ZipFile, path: str
+    ) -> Generator[Tuple[int, Row], None, None]:
+        """
+        Streams the non-empty rows of a worksheet.
+
+        Yields (0-based sheet row index, cells) pairs, where cells is a list of
+        (column index, value, is_date) tuples and value is a float, str, bool
+        or pd.Timestamp.
+        """
+        with zf.open(path) as f:
+            for block in iter(lambda: f.read(self.block_size), b""):
+                yield from self.feed(block)
+        yield from self.feed(b"", final=True)
+
+
+class _ColumnBuilder:
+    """Accumulates the cells of one column into typed buffers."""
+
+    __slots__ = ("positions", "numbers", "dates", "other_positions", "others")
+
+    def __init__(self) -> None:
+        self.positions = array("q")
+        self.numbers = array("d")
+        self.dates = bytearray()
+        self.other_positions: List[int] = []
+        self.others: List[Any] = []
+
+    def append(self, position: int, value: Any, is_date: bool) -> None:
+        if type(value) is float:
+            self.positions.append(position)
+            self.numbers.append(value)
+            self.dates.append(is_date)
+        elif type(value) is not str or value not in _NA_STRINGS:
+            self.other_positions.append(position)
+            self.others.append(value)
+
+    def build(self, length: int, epoch: np.datetime64) -> np.ndarray:
+        """Returns the column as a NumPy array of ``length`` rows."""
+        positions = np.frombuffer(self.positions, dtype=np.int64)
+        numbers = np.frombuffer(self.numbers, dtype=np.float64)
+        dates = np.frombuffer(bytes(self.dates), dtype=np.bool_)
+
+        if not self.others and len(numbers) and dates.all():
+            values = np.full(length, np.datetime64("NaT"), dtype="datetime64[us]")
+            values[positions] = _excel_to_datetime(numbers, epoch)
+            return values.astype(_DATETIME_DTYPE)
+
+        if not self.others and not dates.any():
+            if (
+                len(numbers) == length
+                and length
+                and np.all(numbers % 1 == 0)
+                and np.abs(numbers).max() < _INT64_LIMIT
+            ):
+                return numbers.astype(np.int64)
+            values = np.full(length, np.nan)
+            values[positions] = numbers
+            return values
+
+        complete = len(numbers) + len(self.others) == length
+        if not len(numbers) and complete and all(type(v) is bool for v in self.others):
+            return np.array(self.others, dtype=np.bool_)
+
+        values = np.full(length, np.nan, dtype=object)
+        if len(numbers):
+            converted = numbers.astype(object)
+            integral = (numbers % 1 == 0) & (np.abs(numbers) < _INT64_LIMIT)
+            converted[integral] = numbers[integral].astype(np.int64)
+            if dates.any():
+                stamps = _excel_to_datetime(numbers[dates], epoch).astype(object)
+                converted[dates] = [pd.Timestamp(stamp) for stamp in stamps]
+            values[positions] = converted
+        if self.others:
+            values[self.other_positions] = self.others
+        return values
+
+
+def _excel_to_datetime(serials: np.ndarray, epoch: np.datetime64) -> np.ndarray:
+    """Vectorized conversion of Excel serial dates to datetime64[us]."""
+    serials = serials.copy()
+    if epoch == _EPOCH_1900:
+        # Excel treats 1900 as a leap year, so serials before March 1st
+        # are shifted by one day.
+        serials[(serials > 0) & (serials < 60)] += 1
+    # Like openpyxl, the time of day is rounded to whole milliseconds.
+    days = np.floor(serials)
+    millis = np.round((serials - days) * _MS_PER_DAY).astype(np.int64)
+    dates: np.ndarray = (
+        epoch
+        + days.astype(np.int64).astype("timedelta64[D]")
+        + millis.astype("timedelta64[ms]")
+    )
+    return dates
+
+
+def _header_names(row: Row) -> Dict[int, Any]:
+    """Maps column indexes to header names following pandas conventions."""
+    names = {}
+    for col, value, _ in row:
+        if type(value) is float and value.is_integer():
+            value = int(value)
+        names[col] = value
+    return names
+
+
+def _resolve_usecols(usecols: Any, names: Dict[int, Any]) -> Optional[Set[int]]:
+    """Converts a pandas-style ``usecols`` value into column indexes."""
+    if usecols is None:
+        return None
+    if callable(usecols):
+        return {col for col, name in names.items() if usecols(name)}
+    if isinstance(usecols, str):
+        # Excel-style letters and ranges, e.g. "A:C,F".
+        wanted: Set[int] = set()
+        for part in usecols.replace(" ", "").split(","):
+            first, _, last = part.partition(":")
+            start = _column_index(first)
+            stop = _column_index(last) if last else start
+            wanted.update(range(start, stop + 1))
+        return wanted
+
+    wanted = set()
+    positions = {name: col for col, name in names.items()}
+    for item in usecols:
+        if isinstance(item, int):
+            wanted.add(item)
+        elif item in positions:
+            wanted.add(positions[item])
+        else:
+            raise ValueError(f"Usecols do not match columns: {item!r} not found")
+    return wanted
+
+
+def _skip_predicate(skiprows: Any) -> Callable[[int], bool]:
+    """Converts a pandas-style ``skiprows`` value into a predicate."""
+    if skiprows is None:
+        return lambda index: False
+    if callable(skiprows):
+        predicate: Callable[[int], bool] = skiprows
+        return predicate
+    if isinstance(skiprows, int):
+        return lambda index: index < skiprows
+    skipped = set(skiprows)
+    return skipped.__contains__
+
+
+def _padded_rows(
+    rows: Iterator[Tuple[int, Row]], skip: Callable[[int], bool]
+) -> Generator[Row, None, None]:
+    """
+    Yields the rows not skipped, with an empty row for each blank row.
+
+    Blank rows are missing from the XML (or hold no values); like
+    ``pd.read_excel``, the ones between two non-empty rows are kept and the
+    trailing ones dropped.
+    """
+    previous = -1
+    for index, row in rows:
+        for blank in range(previous + 1, index):
+            if not skip(blank):
+                yield []
+        previous = index
+        if not skip(index):
+            yield row
+
+
+def _build_frame(
+    names: Dict[int, Any],
+    wanted: Optional[Set[int]],
+    builders: Dict[int, _ColumnBuilder],
+    length: int,
+    epoch: np.datetime64,
+    dtype: Any = None,
+    parse_dates: Any = None,
+) -> pd.DataFrame:
+    """Assembles the collected columns into a DataFrame."""
+    indexes: Sequence[int]
+    if wanted is None:
+        indexes = range(max([*names, *builders], default=-1) + 1)
+    else:
+        indexes = sorted(wanted)
+    columns = []
+    seen: Dict[Any, int] = {}
+    data = {}
+    for col in indexes:
+        name = names.get(col, f"Unnamed: {col}")
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+        builder = builders.get(col)
+        data[col] = (
+            builder.build(length, epoch)
+            if builder is not None
+            else np.full(length, np.nan)
+        )
+
+    df = pd.DataFrame(data)
+    df.columns = columns
+    if isinstance(dtype, dict):
+        # Like pandas, dtypes of columns that were not read are ignored.
+        dtype = {column: value for column, value in dtype.items() if column in df}
+    if dtype is not None:
+        df = df.astype(dtype)
+    # Without an index column, pandas parses nothing for a boolean.
+    if parse_dates and not isinstance(parse_dates, bool):
+        for column in parse_dates:
+            df[column] = pd.to_datetime(df[column])
+    return df
+
+
+def _iter_sheet(
+    book: _Workbook,
+    path: str,
+    chunksize: Optional[int] = None,
+    usecols: Any = None,
+    nrows: Optional[int] = None,
+    skiprows: Any = None,
+    dtype: Any = None,
+    parse_dates: Any = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Reads one worksheet using its first row as header.
+
+    Yields a single DataFrame, or one DataFrame per ``chunksize`` rows.
+    """
+    block_size = _READ_BLOCK_SIZE
+    if nrows is not None:
+        block_size = min(max(nrows * 512, _MIN_READ_BLOCK_SIZE), _READ_BLOCK_SIZE)
+    collector = _RowCollector(book, block_size)
+    skip = _skip_predicate(skiprows)
+    rows = _padded_rows(collector.iter_rows(book.zf, path), skip)
+    header = next(rows, None)
+    if header is None:
+        yield pd.DataFrame()
+        return
+    names = _header_names(header)
+    wanted = collector.wanted = _resolve_usecols(usecols, names)
+    epoch = _EPOCH_1904 if book.date1904 else _EPOCH_1900
+
+    builders: Dict[int, _ColumnBuilder] = {}
+    length = total = blanks = 0
+    emitted = False
+    for row in rows:
+        if not row:
+            # Blank rows are kept once a later row shows they are not
+            # trailing (pandas also trims them at the end of ``nrows``).
+            blanks += 1
+            continue
+        if nrows is not None and total + blanks >= nrows:
+            break
+        for cells in itertools.chain(itertools.repeat([], blanks), (row,)):
+            if length == chunksize:
+                yield _build_frame(
+                    names, wanted, builders, length, epoch, dtype, parse_dates
+                )
+                emitted = True
+                builders, length = {}, 0
+            for col, value, is_date in cells:
+                if wanted is not None and col not in wanted:
+                    continue
+                builder = builders.get(col)
+                if builder is None:
+                    builder = builders[col] = _ColumnBuilder()
+                builder.append(length, value, is_date)
+            length += 1
+            total += 1
+        blanks = 0
+    rows.close()
+
+    if length or not emitted:
+        yield _build_frame(names, wanted, builders, length, epoch, dtype, parse_dates)
+
+
+def _read_sheet(book: _Workbook, path: str, **options: Any) -> pd.DataFrame:
+    """Reads one worksheet into a DataFrame using its first row as header."""
+    return next(_iter_sheet(book, path, **options))
+
+
+def read_excel_fast(
+    source: Any,
+    sheet_name: Union[str, int, List[Union[str, int]], None] = 0,
+    **options: Any,
+) -> Union[pd.DataFrame, Dict[Any, pd.DataFrame]]:
+    """
+    Reads an ``.xlsx`` file with the fast XML engine.
+
+    Args:
+        source (str or file-like): Path to the Excel file or binary stream.
+        sheet_name (str, int, list or None): Same semantics as
+            ``pd.read_excel``. None reads all sheets.
+        **options: ``usecols``, ``nrows``, ``skiprows``, ``dtype`` and
+            ``parse_dates``, with the same meaning as in ``pd.read_excel``.
+            Cells outside ``usecols`` are skipped without being converted and
+            parsing stops once ``nrows`` rows have been read. Text cells
+            matching pandas' default ``na_values`` ("NA", "null", ...) are read
+            as missing values.
+
+    Returns:
+        pd.DataFrame or dict: Sheet data, or a dict of DataFrames when several
+        sheets are requested.
+    """
+    with zipfile.ZipFile(source) as zf:
+        book = _Workbook(zf)
+        if isinstance(sheet_name, (str, int)):
+            return _read_sheet(book, book.resolve(sheet_name)[1], **options)
+
+        requested = book.sheet_names if sheet_name is None else list(sheet_name)
+        return {
+            name: _read_sheet(book, book.resolve(name)[1], **options)
+            for name in requested
+        }
+
+
+def iter_excel_chunks(
+    source: Any,
+    sheet_name: Union[str, int] = 0,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    **options: Any,
+) -> Iterator[pd.DataFrame]:
+    """
+    Reads an ``.xlsx`` sheet in chunks with the fast XML engine.
+
+    Only the rows of the current chunk are held in memory, so very large
+    sheets can be processed with a bounded footprint.
+
+    Args:
+        source (str, file-like or buffer): Path to the Excel file, binary
+            stream, or bytes/memoryview/mmap with the file contents.
+        sheet_name (str or int): Sheet to read.
+        chunksize (int): Number of rows per DataFrame.
+        **options: Same options as ``read_excel_fast``.
+
+    Yields:
+        pd.DataFrame: Consecutive blocks of the sheet, all with the same
+        columns. Column dtypes are inferred per block.
+    """
+    unsupported = sorted(set(options) - FAST_ENGINE_OPTIONS)
+    if unsupported:
+        raise ValueError(f"Options not supported by the fast engine: {unsupported}")
+    with binary_source(source) as stream, zipfile.ZipFile(stream) as zf:
+        book = _Workbook(zf)
+        path = book.resolve(sheet_name)[1]
+        yield from _iter_sheet(book, path, chunksize=chunksize, **options)
+
+
+def _parse_dimension(ref: str) -> Optional[Tuple[int, int, int, int]]:
+    """Splits "B2:D10" into (first row, first column, last row, last column)."""
+    corners = []
+    for part in ref.upper().split(":"):
+        corner = _CELL_REF.fullmatch(part)
+        if corner is None:
+            return None
+        corners.append(corner)
+    first, last = corners[0], corners[-1]
+    return (
+        int(first.group(2)),
+        _column_index(first.group(1)) + 1,
+        int(last.group(2)),
+        _column_index(last.group(1)) + 1,
+    )
+
+
+def probe_sheet(
+    source: Any, sheet_name: Union[str, int] = 0, sample_rows: int = 100
+) -> Dict[str, Any]:
+    """
+    Describes an ``.xlsx`` sheet without parsing all of its cells.
+
+    The row and column counts come from the worksheet ``dimension`` (or, when
+    it is missing, from a byte scan of the row tags), and the column names
+    and types from the header and the first ``sample_rows`` rows. Shared
+    strings are only parsed up to the highest index the sample uses.
+
+    Args:
+        source (str, file-like or buffer): Path to the Excel file, binary
+            stream, or bytes/memoryview/mmap with the file contents.
+        sheet_name (str or int): Sheet to describe.
+        sample_rows (int): Number of data rows to parse.
+
+    Returns:
+        dict: ``sheet_names``, ``sheet_name``, ``dimension``, ``rows`` (data
+        rows, excluding the header), ``columns``, ``column_names``,
+        ``dtypes`` (of the sample), ``memory_bytes`` (estimated footprint of
+        the whole sheet as a DataFrame), ``rows_from`` ("dimension" or
+        "scan") and ``sample`` (the parsed rows).
+    """
+    with binary_source(source) as stream, zipfile.ZipFile(stream) as zf:
+        book = _Workbook(zf, lazy_strings=True)
+        name, path = book.resolve(sheet_name)
+        sample = _read_sheet(book, path, nrows=sample_rows)
+
+        ref = sheet_dimension(zf, path)
+        bounds = _parse_dimension(ref) if ref else None
+        if bounds is not None:
+            first_row, first_col, last_row, last_col = bounds
+            # A lone "A1" is also what empty sheets declare.
+            total = 0 if bounds == (1, 1, 1, 1) and sample.empty else last_row
+            total -= first_row - 1
+            width = last_col - first_col + 1
+            rows_from = "dimension"
+        else:
+            total = last_row_number(zf, path)
+            width = len(sample.columns)
+            rows_from = "scan"
+
+    rows = max(total - 1, 0) if len(sample.columns) else 0
+    memory = 0
+    if len(sample):
+        per_row = sample.memory_usage(index=False, deep=True).sum() / len(sample)
+        memory = int(per_row * rows)
+    return {
+        "sheet_names": book.sheet_names,
+        "sheet_name": name,
+        "dimension": ref,
+        "rows": rows,
+        "columns": max(width, len(sample.columns)),
+        "column_names": list(sample.columns),
+        "dtypes": {column: str(dtype) for column, dtype in sample.dtypes.items()},
+        "memory_bytes": memory,
+        "rows_from": rows_from,
+        "sample": sample,
+    }
+
+
+def read_excel_with_engine(
+    source: Any,
+    sheet_name: Union[str, int, List[Union[str, int]], None] = 0,
+    engine: Optional[str] = None,
+    **kwargs: Any,
+) -> Union[pd.DataFrame, Dict[Any, pd.DataFrame]]:
+    """
+    Reads an Excel file with the fast engine or through ``pd.read_excel``.
+
+    Args:
+        source (str, file-like or buffer): Path to the Excel file, binary
+            stream, or bytes/memoryview/mmap with the file contents.
+        sheet_name (str, int, list or None): Sheet(s) to read.
+        engine (str, optional): "fast" for this module's XML engine; any other
+            value is passed to ``pd.read_excel``.
+        **kwargs: Additional arguments for ``pd.read_excel``.
+
+    Returns:
+        pd.DataFrame or dict: Sheet data.
+    """
+    with binary_source(source) as stream:
+        if engine == "fast":
+            unsupported = sorted(set(kwargs) - FAST_ENGINE_OPTIONS)
+            if unsupported:
+                raise ValueError(
+                    f"Options not supported by the fast engine: {unsupported}"
+                )
+            return read_excel_fast(stream, sheet_name=sheet_name, **kwargs)
+        return pd.read_excel(stream, sheet_name=sheet_name, engine=engine, **kwargs)
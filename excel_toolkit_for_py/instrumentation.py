@@ -0,0 +1,274 @@
+"""
+Opt-in timing instrumentation for the public API.
+
+Public functions are wrapped in a span named after them and their internal
+phases (parse, build, serialize, ...) in nested spans, each recording its
+duration and, when known, the rows and bytes processed. Spans are delivered to
+registered callbacks and collected by ``profile()``.
+
+While no callback is registered and no ``profile()`` block is active, a span
+is a shared no-op object, so the instrumentation costs a global flag check.
+
+Example:
+    >>> with profile() as report:
+    ...     csv_to_excel("data.csv", "data.xlsx")
+    >>> print(report)
+    csv_to_excel                 0.842s
+      csv_to_excel/parse         0.201s  100000 rows  7.1 MiB
+      csv_to_excel/serialize     0.633s  100000 rows
+"""
+
+import functools
+import os
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from .utils import is_path
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class Span:
+    """A finished instrumentation span."""
+
+    name: str
+    start: float
+    duration: float
+    depth: int
+    rows: Optional[int] = None
+    bytes: Optional[int] = None
+    error: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+class _ActiveSpan:
+    """Context manager measuring one span while instrumentation is enabled."""
+
+    __slots__ = ("name", "rows", "bytes", "source", "extra", "start", "token")
+
+    def __init__(
+        self,
+        name: str,
+        rows: Optional[int] = None,
+        nbytes: Optional[int] = None,
+        source: Any = None,
+    ):
+        self.name = name
+        self.rows = rows
+        self.bytes = nbytes
+        self.source = source
+        self.extra: Dict[str, Any] = {}
+
+    def record(
+        self, rows: Optional[int] = None, bytes: Optional[int] = None, **extra: Any
+    ) -> None:
+        """Attaches the rows/bytes processed (and any extra values) to the span."""
+        if rows is not None:
+            self.rows = rows
+        if bytes is not None:
+            self.bytes = bytes
+        self.extra.update(extra)
+
+    def __enter__(self) -> "_ActiveSpan":
+        parent = _current.get()
+        if parent:
+            self.name = f"{parent}/{self.name}"
+        self.token = _current.set(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        duration = time.perf_counter() - self.start
+        _current.reset(self.token)
+        if self.bytes is None and self.source is not None:
+            self.bytes = source_size(self.source)
+        _emit(
+            Span(
+                name=self.name,
+                start=self.start,
+                duration=duration,
+                depth=self.name.count("/"),
+                rows=self.rows,
+                bytes=self.bytes,
+                error=None if exc_type is None else exc_type.__name__,
+                extra=self.extra,
+            )
+        )
+
+
+class _NullSpan:
+    """Shared no-op span used while instrumentation is disabled."""
+
+    __slots__ = ()
+
+    def record(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+_callbacks: List[Callable[[Span], None]] = []
+_lock = threading.Lock()
+_listeners = 0
+_current: ContextVar[str] = ContextVar("excel_toolkit_span", default="")
+_reports: ContextVar[Optional[List["Report"]]] = ContextVar(
+    "excel_toolkit_reports", default=None
+)
+
+
+def _emit(finished: Span) -> None:
+    for report in _reports.get() or ():
+        report.spans.append(finished)
+    for callback in list(_callbacks):
+        # A failing callback must not break the instrumented call.
+        try:
+            callback(finished)
+        except Exception as e:
+            warnings.warn(
+                f"Span callback {callback!r} failed on {finished.name!r}: "
+                f"{type(e).__name__}: {e}",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+
+
+def _add_listener(delta: int) -> None:
+    global _listeners
+    with _lock:
+        _listeners += delta
+
+
+def source_size(source: Any) -> Optional[int]:
+    """Returns the size in bytes of a path or in-memory buffer, if known."""
+    try:
+        if is_path(source):
+            return os.path.getsize(source)
+        return memoryview(source).nbytes
+    except (OSError, TypeError):
+        return None
+
+
+def count_rows(data: Any) -> Optional[int]:
+    """Returns the rows of a DataFrame, list or dict of DataFrames."""
+    if isinstance(data, dict):
+        return sum(len(value) for value in data.values())
+    try:
+        return len(data)
+    except TypeError:
+        return None
+
+
+def span(
+    name: str,
+    rows: Optional[int] = None,
+    bytes: Optional[int] = None,
+    source: Any = None,
+) -> Any:
+    """
+    Opens a named span.
+
+    Args:
+        name (str): Span name; nested spans are prefixed with their parent.
+        rows (int, optional): Rows processed, if already known.
+        bytes (int, optional): Bytes processed, if already known.
+        source (optional): Input path or buffer; its size is recorded as
+            ``bytes`` when the span closes.
+
+    Returns:
+        A context manager whose ``record(rows=..., bytes=...)`` method attaches
+        figures known only once the phase has run.
+    """
+    if not _listeners:
+        return _NULL_SPAN
+    return _ActiveSpan(name, rows, bytes, source)
+
+
+def enabled() -> bool:
+    """Returns True while spans are being recorded."""
+    return bool(_listeners)
+
+
+def instrumented(func: F) -> F:
+    """Wraps a public function in a span named after it."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if not _listeners:
+            return func(*args, **kwargs)
+        with _ActiveSpan(name):
+            return func(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def add_span_callback(callback: Callable[[Span], None]) -> None:
+    """
+    Registers a callable invoked with every finished ``Span``.
+
+    Exceptions raised by the callback are reported as a ``RuntimeWarning``
+    and never reach the instrumented function.
+    """
+    with _lock:
+        _callbacks.append(callback)
+    _add_listener(1)
+
+
+def remove_span_callback(callback: Callable[[Span], None]) -> None:
+    """Unregisters a callback added with ``add_span_callback``."""
+    with _lock:
+        _callbacks.remove(callback)
+    _add_listener(-1)
+
+
+class Report:
+    """Spans collected by a ``profile()`` block, in completion order."""
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+
+    def totals(self) -> Dict[str, float]:
+        """Returns the total duration per span name."""
+        totals: Dict[str, float] = {}
+        for item in self.spans:
+            totals[item.name] = totals.get(item.name, 0.0) + item.duration
+        return totals
+
+    def __str__(self) -> str:
+        lines = []
+        # Parents finish after their children; list them first.
+        for item in sorted(self.spans, key=lambda item: item.start):
+            line = f"{'  ' * item.depth}{item.name:<{40 - 2 * item.depth}}"
+            line += f"{item.duration:>9.3f}s"
+            if item.rows is not None:
+                line += f"  {item.rows} rows"
+            if item.bytes is not None:
+                line += f"  {item.bytes / 1024**2:.1f} MiB"
+            if item.error:
+                line += f"  ({item.error})"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile() -> Iterator[Report]:
+    """Collects every span finished inside the block into a ``Report``."""
+    report = Report()
+    token = _reports.set([*(_reports.get() or []), report])
+    _add_listener(1)
+    try:
+        yield report
+    finally:
+        _add_listener(-1)
+        _reports.reset(token)
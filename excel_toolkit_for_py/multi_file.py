@@ -0,0 +1,224 @@
+"""
+Reading and concatenating many ``.xlsx``/``.csv`` files.
+
+Files are parsed in a process pool, a bounded number at a time, and
+returned in input order. Their schemas are reconciled before building the
+result:
+
+* columns are the union of all files, in order of first appearance;
+* dtypes are widened: mixed integer/float columns become ``float64``,
+  datetimes keep the finest unit, integer columns missing from some file
+  become ``float64`` and any other mix becomes ``object``.
+
+The concatenated frame is built column by column into preallocated arrays,
+so each value is copied once instead of once per ``pd.concat`` level.
+"""
+
+import glob
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+import numpy as np
+import pandas as pd
+
+from .fast_reader import read_excel_with_engine
+from .parallel_csv import read_csv_with_engine
+
+PathPattern = Union[str, "os.PathLike[str]", Sequence[Union[str, "os.PathLike[str]"]]]
+
+
+def expand_paths(pattern: PathPattern) -> List[str]:
+    """Expands a glob pattern (``**`` is recursive) or a list of paths."""
+    if isinstance(pattern, (str, os.PathLike)):
+        paths = sorted(glob.glob(os.fspath(pattern), recursive=True))
+    else:
+        paths = [os.fspath(path) for path in pattern]
+    if not paths:
+        raise ValueError(f"No files match {pattern!r}")
+    return paths
+
+
+def read_file(
+    path: str,
+    sheet_name: Union[str, int] = 0,
+    engine: Optional[str] = "fast",
+    usecols: Any = None,
+    dtype: Optional[Dict[str, Any]] = None,
+    parse_dates: Optional[Sequence[str]] = None,
+    **kwargs: Any,
+) -> pd.DataFrame:
+    """
+    Reads one ``.csv`` or ``.xlsx`` file of a batch.
+
+    ``usecols``, ``dtype`` and ``parse_dates`` name columns that may be
+    missing from this file; only the columns present are read, converted or
+    parsed. Runs in the worker processes, so it must stay picklable.
+    """
+    options: Dict[str, Any] = dict(kwargs)
+    if isinstance(usecols, (list, tuple, set, frozenset)) and all(
+        isinstance(column, str) for column in usecols
+    ):
+        # A predicate instead of a list: absent columns are not an error.
+        options["usecols"] = frozenset(usecols).__contains__
+    elif usecols is not None:
+        options["usecols"] = usecols
+    df: pd.DataFrame
+    if path.lower().endswith(".csv"):
+        if dtype is not None:
+            options["dtype"] = dtype
+        df = read_csv_with_engine(path, **options)
+    else:
+        df = read_excel_with_engine(
+            path, sheet_name=sheet_name, engine=engine, **options
+        )
+        if dtype is not None:
+            df = df.astype({col: dt for col, dt in dtype.items() if col in df})
+    for column in parse_dates or ():
+        if column in df and df[column].dtype.kind != "M":
+            df[column] = pd.to_datetime(df[column], errors="coerce")
+    return df
+
+
+def iter_files(
+    paths: Sequence[str],
+    options: Dict[str, Any],
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yields ``read_file(path, **options)`` for every path, in order.
+
+    At most ``2 * workers`` files are parsed ahead of the consumer, so an
+    iterating caller holds a bounded number of frames.
+    """
+    if workers is None:
+        workers = min(len(paths), os.cpu_count() or 1)
+    if executor is None and workers <= 1:
+        # A single worker process would only add pickling overhead.
+        for path in paths:
+            yield read_file(path, **options)
+        return
+    owned = executor is None
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    ahead = 2 * workers
+    pending: "Deque[Future[pd.DataFrame]]" = deque()
+    try:
+        for path in paths[:ahead]:
+            pending.append(pool.submit(read_file, path, **options))
+        for i in range(len(paths)):
+            if i + ahead < len(paths):
+                pending.append(pool.submit(read_file, paths[i + ahead], **options))
+            yield pending.popleft().result()
+    finally:
+        # Executor.shutdown(cancel_futures=True) needs Python 3.9.
+        for future in pending:
+            future.cancel()
+        if owned:
+            pool.shutdown(wait=True)
+
+
+def union_columns(frames: Iterable[pd.DataFrame]) -> List[Any]:
+    """Columns of all frames, in order of first appearance."""
+    columns: Dict[Any, None] = {}
+    for frame in frames:
+        columns.update(dict.fromkeys(frame.columns))
+    return list(columns)
+
+
+def widen_dtypes(dtypes: Sequence[Any], missing: bool = False) -> Any:
+    """
+    Returns a dtype able to hold the values of all ``dtypes``; ``missing``
+    means some file lacks the column, so the result must hold NaN.
+    """
+    unique = list(dict.fromkeys(dtypes))
+    numpy = all(isinstance(dtype, np.dtype) for dtype in unique)
+    kinds = {dtype.kind for dtype in unique} if numpy else set()
+    if len(unique) == 1:
+        target = unique[0]
+    elif numpy and (kinds <= set("iuf") or kinds == {"M"}):
+        target = np.result_type(*unique)
+    else:
+        return np.dtype(object)
+    if missing and numpy and target.kind in "iu":
+        return np.dtype(np.float64)
+    if missing and numpy and target.kind == "b":
+        return np.dtype(object)
+    return target
+
+
+def _missing_value(dtype: Any) -> Any:
+    if isinstance(dtype, np.dtype) and dtype.kind in "mM":
+        return np.datetime64("NaT") if dtype.kind == "M" else np.timedelta64("NaT")
+    return np.nan
+
+
+def _source_values(sources: Sequence[str], lengths: Sequence[int]) -> pd.Categorical:
+    """The source of every row, as a categorical (one code per file)."""
+    categories = list(dict.fromkeys(sources))
+    codes = [categories.index(source) for source in sources]
+    return pd.Categorical.from_codes(
+        np.repeat(np.asarray(codes, dtype=np.int64), lengths), categories=categories
+    )
+
+
+def concat_frames(
+    frames: List[pd.DataFrame],
+    sources: Optional[Sequence[str]] = None,
+    source_column: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Concatenates frames with different columns and dtypes, optionally
+    adding ``source_column`` with the entry of ``sources`` of every frame.
+
+    NumPy-typed columns are copied once into an array of the total length;
+    extension-typed columns (strings, nullable integers, categories) are
+    concatenated with a single ``pd.concat`` per column.
+    """
+    columns = union_columns(frames)
+    lengths = [len(frame) for frame in frames]
+    total = sum(lengths)
+    data: Dict[Any, Any] = {}
+    for column in columns:
+        present = [frame[column] for frame in frames if column in frame]
+        missing = len(present) < len(frames)
+        target = widen_dtypes([series.dtype for series in present], missing)
+        if isinstance(target, np.dtype):
+            values = np.empty(total, dtype=target)
+            start = 0
+            for frame, length in zip(frames, lengths):
+                if column in frame:
+                    values[start : start + length] = frame[column].to_numpy(
+                        dtype=target
+                    )
+                else:
+                    values[start : start + length] = _missing_value(target)
+                start += length
+            data[column] = values
+        else:
+            pieces = [
+                (
+                    frame[column]
+                    if column in frame
+                    else pd.Series(np.nan, index=frame.index, dtype=object)
+                )
+                for frame in frames
+            ]
+            data[column] = pd.concat(pieces, ignore_index=True).astype(target)
+    df = pd.DataFrame(data, columns=columns, copy=False)
+    if source_column is not None:
+        if sources is None:
+            raise ValueError("source_column requires the sources of the frames")
+        df[source_column] = _source_values(sources, lengths)
+    return df
@@ -0,0 +1,1111 @@
+"""
+Native ``.xlsx`` writer for plain values.
+
+Each worksheet is rendered straight to SpreadsheetML and deflated in a worker
+process, then the compressed parts are assembled into the zip container by a
+minimal raw zip writer, so neither XML generation nor compression runs on a
+single core. Strings are written inline by default, which keeps the sheets
+independent from each other; with ``shared_strings=True`` text columns are
+factorized up front into one shared string table, so repeated values are
+stored once and cells only carry an index. Formatting is limited to a
+datetime number format.
+"""
+
+import datetime
+import decimal
+import math
+import os
+import re
+import shutil
+import struct
+import tempfile
+import time
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    IO,
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+import pandas as pd
+from openpyxl.utils import column_index_from_string, get_column_letter
+
+from .fast_reader import (
+    _DIMENSION,
+    _ROW_NUMBER,
+    _ROW_TAG,
+    _SHEET_DATA,
+    Row,
+    _RowCollector,
+    _Workbook,
+    _header_names,
+    _member_blocks,
+    last_row_number,
+    sheet_dimension,
+)
+
+DEFAULT_COMPRESSLEVEL = 6
+WRITER_ENGINES = ("native", "xlsxwriter", "openpyxl")
+# pandas' writer (styled header row); "native" is opt-in.
+DEFAULT_WRITER_ENGINE = "openpyxl"
+_MAX_SHEET_NAME = 31
+_ZIP32_LIMIT = 0xFFFFFFFF
+_EXCEL_EPOCH = np.datetime64("1899-12-30", "us")
+_EXCEL_EPOCH_1904 = np.datetime64("1904-01-01", "us")
+_US_PER_DAY = 86_400_000_000
+_COPY_BLOCK = 1024 * 1024
+
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+_CT_PREFIX = "application/vnd.openxmlformats-officedocument.spreadsheetml"
+
+# Style 1 is the built-in "m/d/yy h:mm" format used for datetime cells, style
+# 2 the "mm-dd-yy" date format and style 3 the "[h]:mm:ss" duration format.
+_STYLES_XML = (
+    f'{_XML_HEADER}<styleSheet xmlns="{_MAIN_NS}">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/>'
+    "</border></borders>"
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/>'
+    "</cellStyleXfs>"
+    '<cellXfs count="4"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" '
+    'xfId="0"/><xf numFmtId="22" fontId="0" fillId="0" borderId="0" xfId="0" '
+    'applyNumberFormat="1"/><xf numFmtId="14" fontId="0" fillId="0" '
+    'borderId="0" xfId="0" applyNumberFormat="1"/><xf numFmtId="46" fontId="0" '
+    'fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/>'
+    "</cellStyles></styleSheet>"
+)
+
+# (name, crc32, uncompressed size, deflated bytes)
+CompressedPart = Tuple[str, int, int, bytes]
+
+
+class RawZipWriter:
+    """
+    Minimal zip writer that accepts already deflated members.
+
+    ``zipfile`` always compresses the data it is given; this writer lets the
+    caller deflate parts elsewhere (e.g. in worker processes) or copy members
+    verbatim from another archive. ZIP64 is not supported.
+    """
+
+    def __init__(self, file: IO[bytes]) -> None:
+        self.file = file
+        self.entries: List[Tuple[bytes, int, int, int, int, int]] = []
+        now = time.localtime()
+        self.dos_time = now.tm_hour << 11 | now.tm_min << 5 | now.tm_sec // 2
+        self.dos_date = (now.tm_year - 1980) << 9 | now.tm_mon << 5 | now.tm_mday
+
+    def add_compressed(
+        self,
+        name: str,
+        crc: int,
+        size: int,
+        data: bytes,
+        method: int = 8,
+    ) -> None:
+        """Writes a member whose data is already compressed with ``method``."""
+        offset = self.file.tell()
+        self._check_limits(name, size, len(data), offset)
+        encoded = name.encode("utf-8")
+        self.file.write(self._local_header(encoded, method, crc, len(data), size))
+        self.file.write(data)
+        self.entries.append((encoded, method, crc, len(data), size, offset))
+
+    def add_stream(
+        self,
+        name: str,
+        blocks: Iterable[bytes],
+        compresslevel: int = DEFAULT_COMPRESSLEVEL,
+    ) -> None:
+        """
+        Deflates a member from an iterable of byte blocks in bounded memory.
+
+        The local header is written with placeholder sizes and patched once
+        the data is complete, so the output file must be seekable.
+        """
+        offset = self.file.tell()
+        encoded = name.encode("utf-8")
+        self.file.write(self._local_header(encoded, 8, 0, 0, 0))
+
+        compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+        crc = size = csize = 0
+        for block in blocks:
+            crc = zlib.crc32(block, crc)
+            size += len(block)
+            deflated = compressor.compress(block)
+            csize += len(deflated)
+            self.file.write(deflated)
+        deflated = compressor.flush()
+        csize += len(deflated)
+        self.file.write(deflated)
+        self._check_limits(name, size, csize, offset)
+
+        end = self.file.tell()
+        self.file.seek(offset)
+        self.file.write(self._local_header(encoded, 8, crc, csize, size))
+        self.file.seek(end)
+        self.entries.append((encoded, 8, crc, csize, size, offset))
+
+    @staticmethod
+    def _check_limits(name: str, size: int, csize: int, offset: int) -> None:
+        if max(size, csize, offset) >= _ZIP32_LIMIT:
+            raise ValueError(f"Part {name!r} is too large for a non-ZIP64 archive")
+
+    def _local_header(
+        self, encoded: bytes, method: int, crc: int, csize: int, size: int
+    ) -> bytes:
+        return (
+            struct.pack(
+                "<IHHHHHIIIHH",
+                0x04034B50,
+                20,
+                0x800,
+                method,
+                self.dos_time,
+                self.dos_date,
+                crc,
+                csize,
+                size,
+                len(encoded),
+                0,
+            )
+            + encoded
+        )
+
+    def copy_member(self, source: IO[bytes], info: zipfile.ZipInfo) -> None:
+        """
+        Copies a member of another archive without decompressing it.
+
+        Args:
+            source: The other archive, opened in binary mode.
+            info: The member, as listed by ``zipfile.ZipFile.infolist()``.
+        """
+        offset = self.file.tell()
+        self._check_limits(info.filename, info.file_size, info.compress_size, offset)
+        encoded = info.filename.encode("utf-8")
+        source.seek(info.header_offset)
+        header = source.read(30)
+        if header[:4] != b"PK\x03\x04":
+            raise ValueError(f"Bad local header for {info.filename!r}")
+        name_length, extra_length = struct.unpack("<HH", header[26:30])
+        source.seek(info.header_offset + 30 + name_length + extra_length)
+
+        self.file.write(
+            self._local_header(
+                encoded,
+                info.compress_type,
+                info.CRC,
+                info.compress_size,
+                info.file_size,
+            )
+        )
+        remaining = info.compress_size
+        while remaining:
+            block = source.read(min(remaining, _COPY_BLOCK))
+            if not block:
+                raise ValueError(f"Truncated member {info.filename!r}")
+            self.file.write(block)
+            remaining -= len(block)
+        self.entries.append(
+            (
+                encoded,
+                info.compress_type,
+                info.CRC,
+                info.compress_size,
+                info.file_size,
+                offset,
+            )
+        )
+
+    def add(
+        self, name: str, data: bytes, compresslevel: int = DEFAULT_COMPRESSLEVEL
+    ) -> None:
+        """Deflates and writes a member."""
+        self.add_compressed(*compress_part(name, data, compresslevel))
+
+    def close(self) -> None:
+        """Writes the central directory."""
+        start = self.file.tell()
+        for encoded, method, crc, csize, size, offset in self.entries:
+            self.file.write(
+                struct.pack(
+                    "<IHHHHHHIIIHHHHHII",
+                    0x02014B50,
+                    20,
+                    20,
+                    0x800,
+                    method,
+                    self.dos_time,
+                    self.dos_date,
+                    crc,
+                    csize,
+                    size,
+                    len(encoded),
+                    0,
+                    0,
+                    0,
+                    0,
+                    0,
+                    offset,
+                )
+            )
+            self.file.write(encoded)
+        end = self.file.tell()
+        self.file.write(
+            struct.pack(
+                "<IHHHHIIH",
+                0x06054B50,
+                0,
+                0,
+                len(self.entries),
+                len(self.entries),
+                end - start,
+                start,
+                0,
+            )
+        )
+
+
+def compress_part(
+    name: str, data: bytes, compresslevel: int = DEFAULT_COMPRESSLEVEL
+) -> CompressedPart:
+    """Deflates a zip member, returning what ``RawZipWriter`` needs."""
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+    deflated = compressor.compress(data) + compressor.flush()
+    return name, zlib.crc32(data), len(data), deflated
+
+
+_TEMPORAL_TYPES = (datetime.date, datetime.timedelta, np.datetime64, np.timedelta64)
+# Control characters that XML 1.0 does not allow, even escaped.
+_ILLEGAL_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _xml_text(value: Any, ref: Optional[str] = None) -> str:
+    """Escapes a cell text, rejecting characters XML cannot represent."""
+    text = str(value)
+    if _ILLEGAL_XML_CHARS.search(text):
+        where = f" in cell {ref}" if ref else ""
+        raise ValueError(
+            f"Illegal XML control character{where}: {text!r}. "
+            "Remove characters \\x00-\\x1f other than tab and line breaks."
+        )
+    return escape(text)
+
+
+def _inline_string(ref: str, value: Any) -> str:
+    text = _xml_text(value, ref)
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _column_cells(
+    letter: str,
+    series: pd.Series,
+    first_row: int = 2,
+    date_style: int = 1,
+    epoch: np.datetime64 = _EXCEL_EPOCH,
+    day_style: Optional[int] = 2,
+    duration_style: Optional[int] = 3,
+) -> List[str]:
+    """
+    Renders the data cells of one column, starting at ``first_row``.
+
+    Datetimes are written as serials from ``epoch`` with the ``date_style``
+    cell format. In object columns, as openpyxl does, ``datetime.date``
+    values use ``day_style``, ``timedelta`` values are written as days with
+    ``duration_style``, and ``Decimal`` and NumPy scalars are numbers;
+    infinities are left empty. A None style writes a plain number.
+    """
+    refs = [f"{letter}{row}" for row in range(first_row, len(series) + first_row)]
+    missing = series.isna().to_numpy()
+    kind = series.dtype.kind
+
+    if kind == "b":
+        values = series.to_numpy(dtype=object).tolist()
+        return [
+            "" if miss else f'<c r="{ref}" t="b"><v>{int(v)}</v></c>'
+            for ref, v, miss in zip(refs, values, missing)
+        ]
+
+    if kind in "iuf":
+        if kind == "f":
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            # Excel has no representation for infinities.
+            missing = missing | ~np.isfinite(values)
+        else:
+            values = series.to_numpy(dtype=object)
+        values = values.tolist()
+        return [
+            "" if miss else f'<c r="{ref}"><v>{v!r}</v></c>'
+            for ref, v, miss in zip(refs, values, missing)
+        ]
+
+    if kind == "M":
+        stamps = series.dt.tz_localize(None) if series.dt.tz else series
+        micros = (stamps.to_numpy().astype("datetime64[us]") - epoch).astype(np.int64)
+        serials = (micros / _US_PER_DAY).tolist()
+        return [
+            "" if miss else f'<c r="{ref}" s="{date_style}"><v>{v!r}</v></c>'
+            for ref, v, miss in zip(refs, serials, missing)
+        ]
+
+    base = epoch.astype(datetime.datetime)
+    cells = []
+    for ref, value, miss in zip(refs, series.to_numpy(dtype=object), missing):
+        if miss:
+            cells.append("")
+        elif isinstance(value, (bool, np.bool_)):
+            cells.append(f'<c r="{ref}" t="b"><v>{int(value)}</v></c>')
+        elif isinstance(value, _TEMPORAL_TYPES):
+            # Before the integers: np.timedelta64 is an np.integer subclass.
+            styles = (date_style, day_style, duration_style)
+            cells.append(_temporal_cell(ref, value, base, *styles))
+        elif isinstance(value, (int, np.integer)):
+            cells.append(f'<c r="{ref}"><v>{int(value)}</v></c>')
+        elif isinstance(value, (float, np.floating, decimal.Decimal)):
+            number = float(value)
+            finite = math.isfinite(number)
+            cells.append(f'<c r="{ref}"><v>{number!r}</v></c>' if finite else "")
+        else:
+            cells.append(_inline_string(ref, value))
+    return cells
+
+
+def _temporal_cell(
+    ref: str,
+    value: Any,
+    base: datetime.datetime,
+    date_style: int,
+    day_style: Optional[int],
+    duration_style: Optional[int],
+) -> str:
+    """Renders a date, datetime or timedelta object as a serial of days."""
+    day = datetime.timedelta(days=1)
+    if isinstance(value, (datetime.timedelta, np.timedelta64)):
+        serial, style = pd.Timedelta(value) / day, duration_style
+    elif isinstance(value, (datetime.datetime, np.datetime64)):
+        stamp = pd.Timestamp(value)
+        if stamp.tzinfo is not None:
+            stamp = stamp.tz_localize(None)
+        serial, style = (stamp - base) / day, date_style
+    else:
+        serial = (datetime.datetime.combine(value, datetime.time()) - base) / day
+        style = day_style
+    attribute = "" if style is None else f' s="{style}"'
+    return f'<c r="{ref}"{attribute}><v>{serial!r}</v></c>'
+
+
+def _shared_cells(letter: str, indexes: pd.Series, first_row: int = 2) -> List[str]:
+    """Renders a column of shared string indexes (-1 for a missing value)."""
+    refs = [f"{letter}{row}" for row in range(first_row, len(indexes) + first_row)]
+    return [
+        "" if i < 0 else f'<c r="{ref}" t="s"><v>{i}</v></c>'
+        for ref, i in zip(refs, indexes.tolist())
+    ]
+
+
+def _share_strings(
+    df: pd.DataFrame, table: Dict[str, int]
+) -> Tuple[pd.DataFrame, AbstractSet[int]]:
+    """
+    Replaces the text columns of ``df`` by their indexes in ``table``,
+    adding new values to it. Returns the frame and the replaced positions.
+    """
+    shared: Set[int] = set()
+    for i in range(df.shape[1]):
+        series = df.iloc[:, i]
+        if series.dtype.kind != "O" or isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.infer_dtype(series, skipna=True) != "string":
+            continue
+        # Each distinct value is looked up once; codes map it back to rows.
+        codes, uniques = pd.factorize(series)
+        lookup = np.fromiter(
+            (table.setdefault(value, len(table)) for value in uniques),
+            np.int64,
+            len(uniques),
+        )
+        indexes = np.full(len(codes), -1, dtype=np.int64)
+        present = codes >= 0
+        indexes[present] = lookup[codes[present]]
+        if not shared:
+            df = df.copy(deep=False)
+        df.isetitem(i, indexes)
+        shared.add(i)
+    return df, frozenset(shared)
+
+
+def _shared_strings_xml(table: Dict[str, int]) -> str:
+    items = "".join(
+        f'<si><t xml:space="preserve">{_xml_text(value)}</t></si>' for value in table
+    )
+    return (
+        f'{_XML_HEADER}<sst xmlns="{_MAIN_NS}" count="{len(table)}" '
+        f'uniqueCount="{len(table)}">{items}</sst>'
+    )
+
+
+def _header_row(letters: List[str], names: Iterable[Any]) -> str:
+    cells = "".join(
+        _inline_string(f"{letter}1", name) for letter, name in zip(letters, names)
+    )
+    return f'<row r="1">{cells}</row>'
+
+
+def _data_rows(
+    df: pd.DataFrame,
+    letters: List[str],
+    first_row: int = 2,
+    shared: AbstractSet[int] = frozenset(),
+    **cell_options: Any,
+) -> str:
+    """
+    Renders the rows of a DataFrame, the first one numbered ``first_row``.
+    Columns at the ``shared`` positions hold shared string indexes.
+    """
+    columns = [
+        (
+            _shared_cells(letter, df.iloc[:, i], first_row)
+            if i in shared
+            else _column_cells(letter, df.iloc[:, i], first_row, **cell_options)
+        )
+        for i, letter in enumerate(letters)
+    ]
+    return "".join(
+        f'<row r="{row}">{"".join(cells)}</row>'
+        for row, cells in enumerate(zip(*columns), start=first_row)
+    )
+
+
+def sheet_xml(df: pd.DataFrame, shared: AbstractSet[int] = frozenset()) -> bytes:
+    """
+    Renders a DataFrame as a worksheet, with the column names as header row.
+
+    Args:
+        df (pd.DataFrame): Data to render. The index is not written.
+        shared (set of int): Positions of the columns that hold shared
+            string indexes (see ``_share_strings``).
+
+    Returns:
+        bytes: The ``xl/worksheets/sheetN.xml`` part.
+    """
+    letters = [get_column_letter(i + 1) for i in range(len(df.columns))]
+    last = f"{letters[-1]}{len(df) + 1}" if letters else "A1"
+
+    parts = [
+        f'{_XML_HEADER}<worksheet xmlns="{_MAIN_NS}">',
+        f'<dimension ref="A1:{last}"/><sheetData>',
+    ]
+    if letters:
+        parts.append(_header_row(letters, df.columns))
+        parts.append(_data_rows(df, letters, shared=shared))
+    parts.append("</sheetData></worksheet>")
+    return "".join(parts).encode("utf-8")
+
+
+def _render_sheet(
+    task: Tuple[str, pd.DataFrame, int, AbstractSet[int]],
+) -> CompressedPart:
+    """Worker entry point: renders and deflates one worksheet."""
+    name, df, compresslevel, shared = task
+    return compress_part(name, sheet_xml(df, shared), compresslevel)
+
+
+def _package_parts(
+    sheet_names: List[str], shared_strings: bool = False
+) -> Dict[str, str]:
+    """Builds the workbook-level parts for the given sheets."""
+    count = len(sheet_names)
+    overrides = "".join(
+        f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+        f'ContentType="{_CT_PREFIX}.worksheet+xml"/>'
+        for i in range(1, count + 1)
+    )
+    if shared_strings:
+        overrides += (
+            '<Override PartName="/xl/sharedStrings.xml" '
+            f'ContentType="{_CT_PREFIX}.sharedStrings+xml"/>'
+        )
+        strings_rel = (
+            f'<Relationship Id="rId{count + 2}" Type="{_REL_NS}/sharedStrings" '
+            'Target="sharedStrings.xml"/>'
+        )
+    else:
+        strings_rel = ""
+    sheets = "".join(
+        f'<sheet name={quoteattr(name)} sheetId="{i}" r:id="rId{i}"/>'
+        for i, name in enumerate(sheet_names, start=1)
+    )
+    sheet_rels = "".join(
+        f'<Relationship Id="rId{i}" Type="{_REL_NS}/worksheet" '
+        f'Target="worksheets/sheet{i}.xml"/>'
+        for i in range(1, count + 1)
+    )
+    sheet_rels += strings_rel
+    return {
+        "[Content_Types].xml": (
+            f'{_XML_HEADER}<Types xmlns="{_CT_NS}">'
+            '<Default Extension="rels" '
+            'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            f'ContentType="{_CT_PREFIX}.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            f'ContentType="{_CT_PREFIX}.styles+xml"/>{overrides}</Types>'
+        ),
+        "_rels/.rels": (
+            f'{_XML_HEADER}<Relationships xmlns="{_PKG_REL_NS}">'
+            f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" '
+            'Target="xl/workbook.xml"/></Relationships>'
+        ),
+        "xl/workbook.xml": (
+            f'{_XML_HEADER}<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">'
+            f"<sheets>{sheets}</sheets></workbook>"
+        ),
+        "xl/_rels/workbook.xml.rels": (
+            f'{_XML_HEADER}<Relationships xmlns="{_PKG_REL_NS}">{sheet_rels}'
+            f'<Relationship Id="rId{count + 1}" Type="{_REL_NS}/styles" '
+            'Target="styles.xml"/></Relationships>'
+        ),
+        "xl/styles.xml": _STYLES_XML,
+    }
+
+
+def _check_sheet_names(names: Iterable[Any]) -> List[str]:
+    sheet_names = [str(name) for name in names]
+    if not sheet_names:
+        raise ValueError("At least one sheet is required")
+    for name in sheet_names:
+        if (
+            not name
+            or len(name) > _MAX_SHEET_NAME
+            or any(c in name for c in "[]:*?/\\")
+        ):
+            raise ValueError(f"Invalid sheet name: {name!r}")
+    if len({name.lower() for name in sheet_names}) != len(sheet_names):
+        raise ValueError("Sheet names must be unique")
+    return sheet_names
+
+
+def write_xlsx(
+    sheets: Dict[Any, pd.DataFrame],
+    file_path: str,
+    workers: Optional[int] = None,
+    compresslevel: int = DEFAULT_COMPRESSLEVEL,
+    shared_strings: bool = False,
+) -> None:
+    """
+    Writes DataFrames to an ``.xlsx`` file, one sheet per mapping entry.
+
+    Args:
+        sheets (dict): Sheet name -> DataFrame, in the desired sheet order.
+        file_path (str): Output path.
+        workers (int, optional): Worker processes used to render and
+            compress the sheets. Defaults to the number of CPUs; 1 renders
+            everything in the current process.
+        compresslevel (int): zlib compression level (0-9).
+        shared_strings (bool): Store the values of text columns once, in a
+            shared string table, instead of inline in every cell. Smaller
+            files that open faster when values repeat.
+    """
+    names = _check_sheet_names(sheets)
+    table: Dict[str, int] = {}
+    tasks = []
+    for i, df in enumerate(sheets.values(), start=1):
+        shared: AbstractSet[int] = frozenset()
+        if shared_strings:
+            df, shared = _share_strings(df, table)
+        tasks.append((f"xl/worksheets/sheet{i}.xml", df, compresslevel, shared))
+
+    # Opened outside the cleanup: if this fails there is nothing to remove.
+    with open(file_path, "wb") as f:
+        try:
+            zf = RawZipWriter(f)
+            parts = _package_parts(names, shared_strings)
+            if shared_strings:
+                parts["xl/sharedStrings.xml"] = _shared_strings_xml(table)
+            for name, content in parts.items():
+                zf.add(name, content.encode("utf-8"), compresslevel)
+
+            workers = min(workers or os.cpu_count() or 1, len(tasks))
+            if workers <= 1:
+                for task in tasks:
+                    zf.add_compressed(*_render_sheet(task))
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    for part in executor.map(_render_sheet, tasks):
+                        zf.add_compressed(*part)
+            zf.close()
+        except BaseException:
+            # Do not leave a truncated workbook behind.
+            f.close()
+            os.remove(file_path)
+            raise
+
+
+def _stream_sheet(
+    batches: Iterable[pd.DataFrame], columns: Optional[List[Any]]
+) -> Iterator[bytes]:
+    """Yields a worksheet part batch by batch."""
+    yield f'{_XML_HEADER}<worksheet xmlns="{_MAIN_NS}"><sheetData>'.encode("utf-8")
+    letters: Optional[List[str]] = None
+    row = 2
+    for batch in batches:
+        if columns is None:
+            columns = list(batch.columns)
+        if letters is None:
+            letters = [get_column_letter(i + 1) for i in range(len(columns))]
+            yield _header_row(letters, columns).encode("utf-8")
+        unexpected = [column for column in batch.columns if column not in columns]
+        if unexpected:
+            raise ValueError(f"Columns not present in the first batch: {unexpected}")
+        batch = batch.reindex(columns=columns)
+        yield _data_rows(batch, letters, row).encode("utf-8")
+        row += len(batch)
+    if letters is None and columns:
+        letters = [get_column_letter(i + 1) for i in range(len(columns))]
+        yield _header_row(letters, columns).encode("utf-8")
+    yield b"</sheetData></worksheet>"
+
+
+def write_xlsx_stream(
+    batches: Iterable[pd.DataFrame],
+    file_path: str,
+    sheet_name: str = "Sheet1",
+    columns: Optional[List[Any]] = None,
+    compresslevel: int = DEFAULT_COMPRESSLEVEL,
+) -> None:
+    """
+    Writes a single-sheet ``.xlsx`` file from an iterable of DataFrames.
+
+    Each batch is rendered and deflated as soon as it arrives, so memory use
+    is bounded by the batch size rather than by the sheet size.
+
+    Args:
+        batches (Iterable[pd.DataFrame]): Consecutive blocks of rows.
+        file_path (str): Output path.
+        sheet_name (str): Sheet name.
+        columns (list, optional): Column order. Defaults to the columns of the
+            first batch; later batches may omit columns but not add new ones.
+        compresslevel (int): zlib compression level (0-9).
+    """
+    names = _check_sheet_names([sheet_name])
+    # Opened outside the cleanup: if this fails there is nothing to remove.
+    with open(file_path, "wb") as f:
+        try:
+            zf = RawZipWriter(f)
+            for name, content in _package_parts(names).items():
+                zf.add(name, content.encode("utf-8"), compresslevel)
+            zf.add_stream(
+                "xl/worksheets/sheet1.xml",
+                _stream_sheet(batches, columns),
+                compresslevel,
+            )
+            zf.close()
+        except BaseException:
+            # Do not leave a truncated workbook behind.
+            f.close()
+            os.remove(file_path)
+            raise
+
+
+_SHEET_DATA_END = re.compile(rb"</(?:\w+:)?sheetData>")
+_CELL_XFS = re.compile(rb"<(\w+:)?cellXfs\b[^>]*>")
+_CELL_XFS_END = re.compile(rb"</(?:\w+:)?cellXfs>")
+_APPEND_BATCH = 10_000
+
+
+def _has_dates(series: pd.Series) -> bool:
+    """Whether a column has values written with a date format."""
+    if series.dtype.kind == "M":
+        return True
+    if series.dtype.kind != "O":
+        return False
+    return pd.api.types.infer_dtype(series, skipna=True) in (
+        "date",
+        "datetime",
+        "datetime64",
+        "mixed",
+    )
+
+
+def _date_style(book: Any, zf: zipfile.ZipFile) -> Tuple[int, Optional[bytes]]:
+    """
+    Finds a datetime cell format in the workbook styles.
+
+    Returns:
+        Tuple[int, Optional[bytes]]: The style index and, when the workbook
+        had none, the patched ``styles.xml`` that adds one.
+    """
+    for index, is_date in enumerate(book.date_styles):
+        if is_date:
+            return index, None
+    path = book.parts.get("styles")
+    xml = zf.read(path) if path else b""
+    start, end = _CELL_XFS.search(xml), _CELL_XFS_END.search(xml)
+    if start is None or end is None:
+        raise ValueError("The workbook has no cell formats to add a date format to")
+    prefix = start.group(1) or b""
+    index = len(book.date_styles)
+    xf = (
+        b"<" + prefix + b'xf numFmtId="22" fontId="0" fillId="0" borderId="0" '
+        b'xfId="0" applyNumberFormat="1"/>'
+    )
+    tag = re.sub(rb'count="\d+"', b'count="%d"' % (index + 1), start.group(0))
+    patched = (
+        xml[: start.start()]
+        + tag
+        + xml[start.end() : end.start()]
+        + xf
+        + xml[end.start() :]
+    )
+    return index, patched
+
+
+def _extend_dimension(ref: bytes, last_column: int, last_row: int) -> bytes:
+    """Grows a ``dimension`` reference such as b"A1:C10" to cover new rows."""
+    first, _, last = ref.decode("ascii").partition(":")
+    match = re.fullmatch(r"([A-Z]+)(\d+)", last or first)
+    if match:
+        last_column = max(last_column, column_index_from_string(match.group(1)))
+    return f"{first or 'A1'}:{get_column_letter(last_column)}{last_row}".encode("ascii")
+
+
+def _appended_rows(
+    df: pd.DataFrame, letters: List[str], first_row: int, **cell_options: Any
+) -> Iterator[bytes]:
+    """Renders the new rows in batches, with a header if the sheet is empty."""
+    if first_row == 1:
+        yield _header_row(letters, df.columns).encode("utf-8")
+        first_row = 2
+    for start in range(0, len(df), _APPEND_BATCH):
+        batch = df.iloc[start : start + _APPEND_BATCH]
+        yield _data_rows(batch, letters, first_row + start, **cell_options).encode(
+            "utf-8"
+        )
+
+
+def _first_row(book: _Workbook, zf: zipfile.ZipFile, path: str) -> Optional[Row]:
+    """Returns the cells of the first non-empty row of a worksheet, if any."""
+    rows = _RowCollector(book).iter_rows(zf, path)
+    try:
+        first = next(rows, None)
+    finally:
+        rows.close()
+    return first[1] if first else None
+
+
+def _align_to_header(
+    df: pd.DataFrame, header: Optional[Row]
+) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Orders the columns of ``df`` like the sheet header and returns their letters.
+
+    Columns are matched by name (compared as text); header columns missing
+    from ``df`` are left empty. Without a header the columns are written in
+    DataFrame order from column A.
+    """
+    if header is None:
+        return df, [get_column_letter(i + 1) for i in range(len(df.columns))]
+    positions: Dict[str, int] = {}
+    for col, name in _header_names(header).items():
+        positions.setdefault(str(name), col)
+    names = [str(column) for column in df.columns]
+    unknown = [
+        column for column, name in zip(df.columns, names) if name not in positions
+    ]
+    if unknown:
+        raise ValueError(f"Columns not found in the sheet header: {unknown}")
+    if len(set(names)) != len(names):
+        raise ValueError("The DataFrame has duplicate column names")
+    order = sorted(range(len(names)), key=lambda i: positions[names[i]])
+    letters = [get_column_letter(positions[names[i]] + 1) for i in order]
+    return df.iloc[:, order], letters
+
+
+class _StaleDimension(Exception):
+    """The last row of a worksheet could not be confirmed during the copy."""
+
+
+def _declared_last_row(ref: Optional[str]) -> Optional[int]:
+    """Returns the last row of a ``dimension`` reference, if it has one."""
+    number = re.search(r"(\d+)$", ref or "")
+    return int(number.group(1)) if number else None
+
+
+def _final_row(window: bytes, saw_rows: bool) -> Optional[int]:
+    """Number of the last row tag in ``window``; None if it cannot be told."""
+    last = None
+    for last in _ROW_TAG.finditer(window):
+        pass
+    if last is None:
+        return None if saw_rows else 0
+    number = _ROW_NUMBER.search(last.group(1))
+    return int(number.group(1)) if number else None
+
+
+def _patched_sheet(
+    blocks: Iterable[bytes],
+    rows: Callable[[int], Iterator[bytes]],
+    dimension: Callable[["re.Match[bytes]"], bytes],
+    last_row: Optional[int],
+    trusted: bool,
+) -> Iterator[bytes]:
+    """
+    Streams a worksheet through, inserting ``rows(first_row)`` at the end of
+    its data.
+
+    The new rows are numbered after the last row tag found before the end of
+    ``sheetData``. Unless ``trusted``, ``_StaleDimension`` is raised when that
+    number differs from ``last_row`` (already written in the dimension) or
+    cannot be read from the tag.
+    """
+    buffer = previous = b""
+    saw_rows = False
+    state = "head"
+
+    def insert(window: bytes) -> Iterator[bytes]:
+        found = last_row if trusted else _final_row(window, saw_rows)
+        if found is None or (last_row is not None and found != last_row):
+            raise _StaleDimension()
+        yield from rows(found + 1)
+
+    for block in blocks:
+        buffer += block
+        if state == "head":
+            match = _SHEET_DATA.search(buffer)
+            if match is None:
+                continue
+            if match.group(1):
+                raise ValueError("Prefixed worksheet namespaces are not supported")
+            yield _DIMENSION.sub(dimension, buffer[: match.start()], count=1)
+            if match.group(2):
+                yield b"<sheetData>"
+                yield from insert(b"")
+                yield b"</sheetData>"
+                state = "tail"
+            else:
+                yield match.group(0)
+                state = "data"
+            buffer = buffer[match.end() :]
+        if state == "data":
+            saw_rows = saw_rows or _ROW_TAG.search(buffer) is not None
+            match = _SHEET_DATA_END.search(buffer)
+            if match is None:
+                cut = buffer.rfind(b"<")
+                cut = len(buffer) if cut == -1 else cut
+                previous = buffer[:cut]
+                yield previous
+                buffer = buffer[cut:]
+                continue
+            yield buffer[: match.start()]
+            yield from insert(previous + buffer[: match.start()])
+            buffer = buffer[match.start() :]
+            state = "tail"
+        if state == "tail":
+            yield buffer
+            buffer = b""
+    if state != "tail":
+        raise ValueError("The worksheet has no sheetData element")
+
+
+def append_xlsx_rows(
+    file_path: str,
+    sheet_name: Any,
+    df: pd.DataFrame,
+    compresslevel: int = DEFAULT_COMPRESSLEVEL,
+) -> int:
+    """
+    Appends rows to a sheet of an existing ``.xlsx`` file in place.
+
+    Only the target worksheet is decompressed: it is streamed through once and
+    the new rows are inserted before the end of its data, while every other
+    member of the archive is copied byte for byte without being
+    decompressed. The last row is taken from the worksheet ``dimension`` and
+    confirmed against the final row tag; if they disagree the worksheet is
+    scanned and streamed again. The result replaces the file atomically.
+
+    Columns are placed under the header cell with the same name, in the
+    sheet's column order; header columns missing from ``df`` are left empty
+    and a column that is not in the header raises ``ValueError``. When the
+    sheet is empty, the columns are written in DataFrame order starting at
+    column A, with their names first as a header row.
+    Table ranges, defined names and formulas that refer to the old extent
+    are not updated.
+
+    Args:
+        file_path (str): Existing ``.xlsx`` file.
+        sheet_name (str or int): Sheet name or position.
+        df (pd.DataFrame): Rows to append. The index is not written.
+        compresslevel (int): zlib compression level for the worksheet.
+
+    Returns:
+        int: Number of the last row of the sheet after the append.
+    """
+    file_path = os.fspath(file_path)
+
+    def new_last_row(last_row: int) -> int:
+        return last_row + len(df) + (1 if last_row == 0 else 0)
+
+    with open(file_path, "rb") as source, zipfile.ZipFile(source) as zf:
+        book = _Workbook(zf, lazy_strings=True)
+        path = book.resolve(sheet_name)[1]
+        if df.empty:
+            return last_row_number(zf, path)
+        df, letters = _align_to_header(df, _first_row(book, zf, path))
+        width = column_index_from_string(letters[-1]) if letters else 0
+
+        options: Dict[str, Any] = {
+            "epoch": _EXCEL_EPOCH_1904 if book.date1904 else _EXCEL_EPOCH
+        }
+        styles = None
+        if any(_has_dates(df.iloc[:, i]) for i in range(df.shape[1])):
+            options["date_style"], styles = _date_style(book, zf)
+            # The workbook may have no date-only or duration format.
+            options.update(day_style=options["date_style"], duration_style=None)
+        written: List[int] = []
+
+        def rows(first_row: int) -> Iterator[bytes]:
+            written.append(new_last_row(first_row - 1))
+            return _appended_rows(df, letters, first_row, **options)
+
+        def write(output: IO[bytes], last_row: Optional[int], trusted: bool) -> None:
+            def extend(match: "re.Match[bytes]") -> bytes:
+                end = new_last_row(last_row or 0)
+                ref = _extend_dimension(match.group(2), width, end)
+                return match.group(1) + ref + match.group(3)
+
+            writer = RawZipWriter(output)
+            for info in zf.infolist():
+                if info.filename == path:
+                    blocks = _patched_sheet(
+                        _member_blocks(zf, path), rows, extend, last_row, trusted
+                    )
+                    writer.add_stream(path, blocks, compresslevel)
+                elif styles is not None and info.filename == book.parts["styles"]:
+                    writer.add(info.filename, styles, compresslevel)
+                else:
+                    writer.copy_member(source, info)
+            writer.close()
+
+        fd, tmp_path = tempfile.mkstemp(
+            suffix=".xlsx", dir=os.path.dirname(os.path.abspath(file_path))
+        )
+        try:
+            with os.fdopen(fd, "wb") as out:
+                try:
+                    write(
+                        out,
+                        _declared_last_row(sheet_dimension(zf, path)),
+                        trusted=False,
+                    )
+                except _StaleDimension:
+                    out.seek(0)
+                    out.truncate()
+                    write(out, last_row_number(zf, path), trusted=True)
+            shutil.copymode(file_path, tmp_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    os.replace(tmp_path, file_path)
+    return written[-1]
+
+
+# Rows converted to Python objects at a time by the xlsxwriter engine.
+_XLSXWRITER_BATCH = 10_000
+
+
+def _write_xlsxwriter(sheets: Dict[Any, pd.DataFrame], file_path: str) -> None:
+    """
+    Writes the sheets row by row with xlsxwriter in constant-memory mode.
+
+    Rows are converted to Python objects in batches, so at most one batch is
+    held as an object copy of the frame.
+    """
+    import xlsxwriter
+
+    options = {
+        "constant_memory": True,
+        "default_date_format": "yyyy-mm-dd hh:mm:ss",
+    }
+    with xlsxwriter.Workbook(file_path, options) as workbook:
+        for name, df in sheets.items():
+            ws = workbook.add_worksheet(str(name))
+            ws.write_row(0, 0, [str(column) for column in df.columns])
+            # constant_memory only accepts cells in row order.
+            for start in range(0, len(df), _XLSXWRITER_BATCH):
+                batch = df.iloc[start : start + _XLSXWRITER_BATCH]
+                values = batch.astype(object).where(batch.notna(), None)
+                rows = values.itertuples(index=False, name=None)
+                for row, cells in enumerate(rows, start + 1):
+                    ws.write_row(row, 0, cells)
+
+
+def _write_openpyxl(sheets: Dict[Any, pd.DataFrame], file_path: str) -> None:
+    """Writes the sheets through pandas' openpyxl writer."""
+    with pd.ExcelWriter(file_path, engine="openpyxl") as writer:
+        for name, df in sheets.items():
+            df.to_excel(writer, sheet_name=str(name), index=False)
+
+
+def write_excel_with_engine(
+    sheets: Dict[Any, pd.DataFrame],
+    file_path: str,
+    engine: Optional[str] = None,
+    workers: Optional[int] = None,
+    compresslevel: int = DEFAULT_COMPRESSLEVEL,
+    shared_strings: bool = False,
+) -> None:
+    """
+    Writes DataFrames to an ``.xlsx`` file with the requested writer engine.
+
+    Args:
+        sheets (dict): Sheet name -> DataFrame, in the desired sheet order.
+        file_path (str): Output path.
+        engine (str, optional): "native" (this module, fastest for plain
+            values), "xlsxwriter" (constant-memory streaming) or "openpyxl"
+            (pandas' writer, with styled headers). Defaults to
+            ``DEFAULT_WRITER_ENGINE``.
+        workers (int, optional): Worker processes for the "native" engine.
+        compresslevel (int): zlib level for the "native" engine.
+        shared_strings (bool): Shared string table for the "native" engine
+            (the other engines always use one).
+
+    Raises:
+        ValueError: If the engine is unknown.
+    """
+    engine = engine or DEFAULT_WRITER_ENGINE
+    if engine == "native":
+        write_xlsx(
+            sheets,
+            file_path,
+            workers=workers,
+            compresslevel=compresslevel,
+            shared_strings=shared_strings,
+        )
+    elif engine == "xlsxwriter":
+        _write_xlsxwriter(sheets, file_path)
+    elif engine == "openpyxl":
+        _write_openpyxl(sheets, file_path)
+    else:
+        raise ValueError(
+            f"Unknown writer engine: {engine!r}. Use one of {list(WRITER_ENGINES)}"
+        )
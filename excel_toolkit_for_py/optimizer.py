@@ -0,0 +1,311 @@
+"""
+Size and load-time optimizer for ``.xlsx`` files.
+
+Rewrites an existing workbook in place:
+
+* inline strings (``t="inlineStr"``, as written by the native writer) are
+  interned into the shared strings table, so every repeated value is stored
+  once and the cells only hold an index;
+* identical font, fill and border records and identical cell formats
+  (``cellXfs``) are merged, and the ``s`` style indexes of cells, rows and
+  columns are remapped;
+* the archive is written again with the chosen compression level (parts
+  that are not changed are copied without recompression unless a level is
+  given).
+
+Worksheets are processed whole in memory with byte-level regular
+expressions. Rich-text inline strings and namespace-prefixed cells are left
+as they are.
+"""
+
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from typing import Dict, List, Optional, Tuple
+
+from .fast_reader import _Workbook
+from .native_writer import (
+    _CT_PREFIX,
+    _MAIN_NS,
+    _REL_NS,
+    _XML_HEADER,
+    DEFAULT_COMPRESSLEVEL,
+    RawZipWriter,
+)
+
+_INLINE_STRING = re.compile(
+    rb'<c\b([^>]*?)\st="inlineStr"([^>]*)>'
+    rb'<is><t(?:\s+xml:space="preserve")?>([^<]*)</t></is></c>'
+)
+_SST_ITEM = re.compile(rb"<(?:\w+:)?si\b[^>]*?(?:/>|>.*?</(?:\w+:)?si>)", re.S)
+_SST_SIMPLE = re.compile(
+    rb'<si>\s*<t(?:\s+xml:space="preserve")?>([^<]*)</t>\s*</si>', re.S
+)
+_SST_OPEN = re.compile(rb"<(?:\w+:)?sst\b[^>]*>")
+_SST_END = re.compile(rb"</(?:\w+:)?sst>")
+_COUNT = re.compile(rb'\s(count|uniqueCount)="(\d+)"')
+_STYLE_IDS = re.compile(rb'\b(fontId|fillId|borderId)="(\d+)"')
+_CELL_STYLE = re.compile(rb'(<(?:\w+:)?(?:c|row)\b[^>]*?\ss=")(\d+)(")')
+_COL_STYLE = re.compile(rb'(<(?:\w+:)?col\b[^>]*?\sstyle=")(\d+)(")')
+
+# Style sections whose records are merged, with the attribute referencing them.
+_STYLE_RECORDS = ((b"fonts", b"font"), (b"fills", b"fill"), (b"borders", b"border"))
+
+
+def _section(name: bytes) -> "re.Pattern[bytes]":
+    return re.compile(
+        rb"(<(?:\w+:)?%s\b[^>]*>)(.*?)(</(?:\w+:)?%s>)" % (name, name), re.S
+    )
+
+
+def _records(tag: bytes) -> "re.Pattern[bytes]":
+    return re.compile(
+        rb"<(?:\w+:)?%s\b[^>]*?/>|<(?:\w+:)?%s\b[^>]*>.*?</(?:\w+:)?%s>"
+        % (tag, tag, tag),
+        re.S,
+    )
+
+
+def _dedupe(items: List[bytes]) -> Tuple[List[bytes], List[int]]:
+    """Keeps the first copy of each item; returns it and old -> new indexes."""
+    index: Dict[bytes, int] = {}
+    mapping = []
+    for item in items:
+        mapping.append(index.setdefault(item, len(index)))
+    return list(index), mapping
+
+
+def _with_count(open_tag: bytes, count: int) -> bytes:
+    open_tag = re.sub(rb'\scount="\d+"', b"", open_tag)
+    return open_tag[:-1] + b' count="%d">' % count
+
+
+def _merge_section(
+    styles: bytes, name: bytes, tag: bytes
+) -> Tuple[bytes, Optional[List[int]]]:
+    """Merges identical records of one section; None if nothing changed."""
+    match = _section(name).search(styles)
+    if match is None:
+        return styles, None
+    items = _records(tag).findall(match.group(2))
+    kept, mapping = _dedupe(items)
+    if len(kept) == len(items):
+        return styles, None
+    body = _with_count(match.group(1), len(kept)) + b"".join(kept) + match.group(3)
+    return styles[: match.start()] + body + styles[match.end() :], mapping
+
+
+def merge_styles(styles: bytes) -> Tuple[bytes, Optional[List[int]], int]:
+    """
+    Merges identical records of ``styles.xml``.
+
+    Returns:
+        tuple: The new part, the old -> new ``cellXfs`` index mapping (None
+        if the cell formats did not change) and the number of records
+        removed.
+    """
+    removed = 0
+    mappings = {}
+    for name, tag in _STYLE_RECORDS:
+        styles, mapping = _merge_section(styles, name, tag)
+        if mapping is not None:
+            mappings[tag + b"Id"] = mapping
+            removed += len(mapping) - len(set(mapping))
+    if mappings:
+
+        def remap(match: "re.Match[bytes]") -> bytes:
+            mapping = mappings.get(match.group(1))
+            if mapping is None:
+                return match.group(0)
+            return b'%s="%d"' % (match.group(1), mapping[int(match.group(2))])
+
+        styles = _STYLE_IDS.sub(remap, styles)
+    styles, xf_mapping = _merge_section(styles, b"cellXfs", b"xf")
+    if xf_mapping is not None:
+        removed += len(xf_mapping) - len(set(xf_mapping))
+    return styles, xf_mapping, removed
+
+
+def _remap_styles(sheet: bytes, mapping: List[int]) -> bytes:
+    def remap(match: "re.Match[bytes]") -> bytes:
+        index = int(match.group(2))
+        new = mapping[index] if index < len(mapping) else index
+        return b"%s%d%s" % (match.group(1), new, match.group(3))
+
+    return _COL_STYLE.sub(remap, _CELL_STYLE.sub(remap, sheet))
+
+
+class _SharedStrings:
+    """The shared strings table, extended with interned inline strings."""
+
+    def __init__(self, part: Optional[bytes]) -> None:
+        self.part = part
+        self.index: Dict[bytes, int] = {}
+        self.size = 0
+        self.added: List[bytes] = []
+        self.references = 0
+        if part is not None:
+            for item in _SST_ITEM.findall(part):
+                simple = _SST_SIMPLE.fullmatch(item)
+                if simple is not None:
+                    self.index.setdefault(simple.group(1), self.size)
+                self.size += 1
+
+    def intern(self, sheet: bytes) -> bytes:
+        """Replaces the inline strings of a worksheet by shared references."""
+
+        def replace(match: "re.Match[bytes]") -> bytes:
+            text = match.group(3)
+            position = self.index.get(text)
+            if position is None:
+                position = self.index[text] = self.size
+                self.size += 1
+                self.added.append(text)
+            self.references += 1
+            return b'<c%s t="s"%s><v>%d</v></c>' % (
+                match.group(1),
+                match.group(2),
+                position,
+            )
+
+        return _INLINE_STRING.sub(replace, sheet)
+
+    def render(self) -> bytes:
+        items = b"".join(
+            b'<si><t xml:space="preserve">%s</t></si>' % text for text in self.added
+        )
+        if self.part is None:
+            header = f'{_XML_HEADER}<sst xmlns="{_MAIN_NS}" count="0" uniqueCount="0">'
+            self.part = header.encode("utf-8") + b"</sst>"
+
+        def update(attr: "re.Match[bytes]") -> bytes:
+            if attr.group(1) == b"uniqueCount":
+                value = self.size
+            else:
+                value = int(attr.group(2)) + self.references
+            return b' %s="%d"' % (attr.group(1), value)
+
+        def counts(match: "re.Match[bytes]") -> bytes:
+            return _COUNT.sub(update, match.group(0))
+
+        part = _SST_OPEN.sub(counts, self.part, count=1)
+        end = _SST_END.search(part)
+        if end is None:
+            raise ValueError("The shared strings part has no closing </sst> tag")
+        return part[: end.start()] + items + part[end.start() :]
+
+
+def _register_shared_strings(parts: Dict[str, bytes]) -> None:
+    """Adds the content type and relationship of a new shared strings part."""
+    types = parts["[Content_Types].xml"]
+    override = (
+        b'<Override PartName="/xl/sharedStrings.xml" '
+        b'ContentType="%s.sharedStrings+xml"/>' % _CT_PREFIX.encode("ascii")
+    )
+    parts["[Content_Types].xml"] = types.replace(b"</Types>", override + b"</Types>")
+    rels = parts["xl/_rels/workbook.xml.rels"]
+    relationship = (
+        b'<Relationship Id="rIdSharedStrings" Type="%s/sharedStrings" '
+        b'Target="sharedStrings.xml"/>' % _REL_NS.encode("ascii")
+    )
+    parts["xl/_rels/workbook.xml.rels"] = rels.replace(
+        b"</Relationships>", relationship + b"</Relationships>"
+    )
+
+
+def optimize_xlsx(
+    file_path: str,
+    output_path: Optional[str] = None,
+    shared_strings: bool = True,
+    merge_duplicate_styles: bool = True,
+    compresslevel: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Shrinks an ``.xlsx`` file: shares repeated strings, merges duplicate
+    styles and recompresses the archive.
+
+    Args:
+        file_path (str): Workbook to optimize.
+        output_path (str, optional): Where to write the result; defaults to
+            replacing ``file_path`` (atomically).
+        shared_strings (bool): Move inline strings to the shared strings
+            table.
+        merge_duplicate_styles (bool): Merge identical style records.
+        compresslevel (int, optional): zlib level (0-9) for every part. If
+            None, rewritten parts use the default level and the other parts
+            are copied as they are.
+
+    Returns:
+        dict: ``size_before`` and ``size_after`` in bytes, ``strings_shared``
+        (cells moved to the shared strings table) and ``styles_removed``
+        (duplicate style records merged).
+    """
+    file_path = os.fspath(file_path)
+    output_path = os.fspath(output_path or file_path)
+    size_before = os.path.getsize(file_path)
+    with open(file_path, "rb") as source, zipfile.ZipFile(source) as zf:
+        book = _Workbook(zf)
+        names = set(zf.namelist())
+        changed: Dict[str, bytes] = {}
+        xf_mapping = None
+        styles_removed = 0
+        styles_path = book.parts.get("styles")
+        if merge_duplicate_styles and styles_path in names:
+            styles, xf_mapping, styles_removed = merge_styles(zf.read(styles_path))
+            if styles_removed:
+                changed[styles_path] = styles
+
+        sst_path = book.parts.get("sharedStrings")
+        if sst_path not in names:
+            sst_path = None
+        strings = _SharedStrings(zf.read(sst_path) if sst_path else None)
+        for _, path in book.sheets:
+            if not (shared_strings or xf_mapping):
+                break
+            sheet = zf.read(path)
+            updated = strings.intern(sheet) if shared_strings else sheet
+            if xf_mapping is not None:
+                updated = _remap_styles(updated, xf_mapping)
+            if updated != sheet:
+                changed[path] = updated
+        if strings.references:
+            if sst_path is None:
+                sst_path = "xl/sharedStrings.xml"
+                for part in ("[Content_Types].xml", "xl/_rels/workbook.xml.rels"):
+                    changed[part] = zf.read(part)
+                _register_shared_strings(changed)
+            changed[sst_path] = strings.render()
+
+        fd, tmp_path = tempfile.mkstemp(
+            suffix=".xlsx", dir=os.path.dirname(os.path.abspath(output_path))
+        )
+        try:
+            with os.fdopen(fd, "wb") as out:
+                writer = RawZipWriter(out)
+                level = (
+                    DEFAULT_COMPRESSLEVEL if compresslevel is None else compresslevel
+                )
+                for info in zf.infolist():
+                    if info.filename in changed:
+                        writer.add(info.filename, changed.pop(info.filename), level)
+                    elif compresslevel is None:
+                        writer.copy_member(source, info)
+                    else:
+                        writer.add(info.filename, zf.read(info), level)
+                # New parts (e.g. the shared strings table) go last.
+                for name, data in changed.items():
+                    writer.add(name, data, level)
+                writer.close()
+            shutil.copymode(file_path, tmp_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    os.replace(tmp_path, output_path)
+    return {
+        "size_before": size_before,
+        "size_after": os.path.getsize(output_path),
+        "strings_shared": strings.references,
+        "styles_removed": styles_removed,
+    }
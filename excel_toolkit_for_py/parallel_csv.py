@@ -0,0 +1,379 @@
+"""
+Parallel CSV reading.
+
+Large CSV files are split into newline-aligned byte ranges that are parsed in
+a process pool, with the header line prepended to every range. When
+``pyarrow`` is installed its multithreaded parser can be used instead.
+
+Column dtypes are inferred once, from the first lines of every range, and
+passed to all workers, so a column does not change type between ranges.
+
+Byte-range splitting assumes that quoted fields do not contain line breaks.
+
+Without an explicit engine, files of at least ``AUTO_PARALLEL_BYTES`` are
+read in parallel when every option is one the byte-range reader handles like
+``pd.read_csv`` and no quoted field seems to span lines; anything else is
+left to pandas.
+"""
+
+import codecs
+import io
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+import pandas as pd
+
+from .utils import as_binary_source, binary_source, is_path
+
+try:
+    import pyarrow  # noqa: F401
+
+    HAS_PYARROW = True
+except ImportError:  # pragma: no cover - depends on the environment
+    HAS_PYARROW = False
+
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+DEFAULT_CHUNKSIZE = 100_000
+# Lines read from the start of every byte range to infer the column dtypes.
+SAMPLE_LINES = 1_000
+_UNSUPPORTED_PARALLEL_OPTIONS = ("nrows", "skiprows", "skipfooter", "chunksize")
+# Files at least this large use the "parallel" engine when none is given.
+AUTO_PARALLEL_BYTES = 2 * DEFAULT_CHUNK_BYTES
+# Options that read the same through byte ranges as through pd.read_csv.
+_AUTO_PARALLEL_OPTIONS = frozenset(
+    {
+        "sep",
+        "delimiter",
+        "header",
+        "usecols",
+        "dtype",
+        "converters",
+        "parse_dates",
+        "na_values",
+        "keep_default_na",
+        "true_values",
+        "false_values",
+        "decimal",
+        "thousands",
+        "encoding",
+    }
+)
+# Encodings in which a newline is always the single byte b"\n".
+_SPLITTABLE_ENCODINGS = frozenset(
+    {"utf-8", "utf-8-sig", "ascii", "iso8859-1", "cp1252"}
+)
+_COMPRESSED_SUFFIXES = (".gz", ".bz2", ".zip", ".xz", ".zst", ".tar", ".tgz")
+
+# (path, header, start, end, read_csv options, inferred dtypes)
+Task = Tuple[str, bytes, int, int, Dict[str, Any], Dict[Any, Any]]
+
+
+def _byte_ranges(
+    file_path: str, chunk_bytes: int, has_header: bool
+) -> Tuple[bytes, List[Tuple[int, int]]]:
+    """
+    Splits a file into ranges that start and end on line boundaries.
+
+    Returns:
+        Tuple[bytes, List[Tuple[int, int]]]: The header line (empty when the
+        file has no header) and the (start, end) offsets of each range.
+    """
+    size = os.path.getsize(file_path)
+    ranges = []
+    with open(file_path, "rb") as f:
+        header = f.readline() if has_header else b""
+        position = f.tell()
+        while position < size:
+            end = min(position + chunk_bytes, size)
+            if end < size:
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            ranges.append((position, end))
+            position = end
+    return header, ranges
+
+
+def _is_text(values: pd.Series) -> bool:
+    if isinstance(values.dtype, pd.StringDtype):
+        return True
+    # Booleans with missing values are also read as object.
+    return bool(
+        values.dtype == object and pd.api.types.infer_dtype(values) != "boolean"
+    )
+
+
+def _user_columns(options: Dict[str, Any]) -> Optional[Set[Any]]:
+    """Columns typed by the caller; None when ``dtype`` covers every column."""
+    user_dtype = options.get("dtype")
+    if user_dtype is not None and not isinstance(user_dtype, dict):
+        return None
+    columns = set(user_dtype or ()) | set(options.get("converters") or ())
+    parse_dates = options.get("parse_dates")
+    if isinstance(parse_dates, (list, tuple)):
+        columns.update(parse_dates)
+    return columns
+
+
+def _infer_dtypes(
+    file_path: str,
+    header: bytes,
+    ranges: List[Tuple[int, int]],
+    options: Dict[str, Any],
+) -> Dict[Any, Any]:
+    """
+    Infers the dtypes to enforce in every range from the first
+    ``SAMPLE_LINES`` lines of each one.
+
+    Text columns are read as ``str`` and float columns as ``float64``. Integer
+    and boolean columns are left to each range, since a missing value further
+    down would not fit them; ``pd.concat`` widens them as pandas would.
+    """
+    fixed = _user_columns(options)
+    if fixed is None:
+        return {}
+    blocks = [header]
+    with open(file_path, "rb") as f:
+        for start, end in ranges:
+            f.seek(start)
+            block = b"".join(islice(iter(f.readline, b""), SAMPLE_LINES))
+            block = block[: end - start]
+            blocks.append(block if block.endswith(b"\n") else block + b"\n")
+    sample = pd.read_csv(io.BytesIO(b"".join(blocks)), **options)
+
+    inferred: Dict[Any, Any] = {}
+    for column, values in sample.items():
+        if column in fixed:
+            continue
+        if _is_text(values):
+            inferred[column] = str
+        elif values.dtype.kind == "f":
+            inferred[column] = "float64"
+    return inferred
+
+
+def _read_range(task: Task) -> pd.DataFrame:
+    """Parses one byte range of a CSV file, with the header prepended."""
+    file_path, header, start, end, options, inferred = task
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    if not inferred:
+        return pd.read_csv(io.BytesIO(header + data), **options)
+    dtype = {**inferred, **(options.get("dtype") or {})}
+    try:
+        return pd.read_csv(io.BytesIO(header + data), **{**options, "dtype": dtype})
+    except ValueError:
+        # Text further down a float column: only text columns stay enforced.
+        dtype = {column: value for column, value in dtype.items() if value is str}
+        dtype.update(options.get("dtype") or {})
+        return pd.read_csv(io.BytesIO(header + data), **{**options, "dtype": dtype})
+
+
+def _reconcile(chunks: List[pd.DataFrame], tasks: List[Task]) -> List[pd.DataFrame]:
+    """
+    Re-reads as text the columns that some ranges parsed as numbers while
+    others found text, so the result matches a single ``pd.read_csv``.
+    """
+    fixed = _user_columns(tasks[0][4])
+    if fixed is None:
+        return chunks
+    text = {
+        column
+        for chunk in chunks
+        for column, values in chunk.items()
+        if column not in fixed and _is_text(values)
+    }
+    for position, chunk in enumerate(chunks):
+        numeric = [
+            column
+            for column, values in chunk.items()
+            if column in text and not _is_text(values)
+        ]
+        if numeric:
+            file_path, header, start, end, options, inferred = tasks[position]
+            inferred = {**inferred, **{column: str for column in numeric}}
+            task = (file_path, header, start, end, options, inferred)
+            chunks[position] = _read_range(task)
+    return chunks
+
+
+def _has_multiline_fields(file_path: str, chunk_bytes: int) -> bool:
+    """
+    Whether a quoted field seems to span lines, judging by the first
+    ``SAMPLE_LINES`` lines of the file and of every byte range: such a line
+    has an odd number of quote characters.
+    """
+    size = os.path.getsize(file_path)
+    with open(file_path, "rb") as f:
+        for offset in range(0, size, chunk_bytes):
+            f.seek(offset)
+            if offset:
+                f.readline()
+            for line in islice(iter(f.readline, b""), SAMPLE_LINES):
+                if line.count(b'"') % 2:
+                    return True
+    return False
+
+
+def _auto_engine(
+    source: Any, iterator: bool, workers: Optional[int], options: Dict[str, Any]
+) -> Optional[str]:
+    """Returns "parallel" when it can read ``source`` faster, None otherwise."""
+    if iterator or workers == 1 or (workers is None and (os.cpu_count() or 1) < 2):
+        return None
+    if not is_path(source) or set(options) - _AUTO_PARALLEL_OPTIONS:
+        return None
+    file_path = os.fspath(source)
+    if file_path.lower().endswith(_COMPRESSED_SUFFIXES):
+        return None
+    if options.get("header", "infer") not in ("infer", 0, None):
+        return None
+    encoding = options.get("encoding") or "utf-8"
+    if codecs.lookup(encoding).name not in _SPLITTABLE_ENCODINGS:
+        return None
+    if (
+        not os.path.isfile(file_path)
+        or os.path.getsize(file_path) < AUTO_PARALLEL_BYTES
+    ):
+        return None
+    if _has_multiline_fields(file_path, DEFAULT_CHUNK_BYTES):
+        return None
+    return "parallel"
+
+
+def _ordered_map(
+    executor: Executor, fn: Callable[[Any], Any], items: List[Any], window: int
+) -> Iterator[Any]:
+    """Like executor.map, but keeps at most ``window`` results pending."""
+    pending = []
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.pop(0).result()
+    for future in pending:
+        yield future.result()
+
+
+def _iter_parallel(tasks: List[Task], workers: Optional[int]) -> Iterator[pd.DataFrame]:
+    """Parses the byte ranges in a process pool, yielding them in order."""
+    if len(tasks) <= 1 or workers == 1:
+        for task in tasks:
+            yield _read_range(task)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        yield from _ordered_map(executor, _read_range, tasks, window=2 * workers)
+
+
+def read_csv_parallel(
+    file_path: str,
+    workers: Optional[int] = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    iterator: bool = False,
+    **kwargs: Any,
+) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+    """
+    Reads a CSV file by parsing newline-aligned byte ranges in parallel.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        workers (int, optional): Number of worker processes. Defaults to the
+            number of CPUs.
+        chunk_bytes (int): Approximate size of each byte range.
+        iterator (bool): If True, returns an iterator of DataFrames, one per
+            byte range, instead of a single concatenated DataFrame. The text
+            and float columns of the sample keep their dtype in every chunk;
+            values outside the sample (e.g. a missing value in an integer
+            column) may still change the dtype of one chunk, as with
+            ``pd.read_csv(chunksize=...)``. The concatenated DataFrame has
+            the dtypes of a single ``pd.read_csv`` call.
+        **kwargs: Additional arguments for ``pd.read_csv``.
+
+    Returns:
+        pd.DataFrame or Iterator[pd.DataFrame]: CSV data.
+    """
+    unsupported = [key for key in _UNSUPPORTED_PARALLEL_OPTIONS if key in kwargs]
+    if unsupported:
+        raise ValueError(f"Options not supported by the parallel reader: {unsupported}")
+
+    file_path = os.fspath(file_path)
+    has_header = kwargs.get("header", "infer") is not None
+    header, ranges = _byte_ranges(file_path, chunk_bytes, has_header)
+    if not ranges:
+        empty = pd.read_csv(io.BytesIO(header), **kwargs)
+        return iter([empty]) if iterator else empty
+
+    inferred = (
+        _infer_dtypes(file_path, header, ranges, kwargs) if len(ranges) > 1 else {}
+    )
+    tasks = [(file_path, header, start, end, kwargs, inferred) for start, end in ranges]
+    chunks = _iter_parallel(tasks, workers)
+    if iterator:
+        return chunks
+    return pd.concat(_reconcile(list(chunks), tasks), ignore_index=True)
+
+
+def read_csv_with_engine(
+    source: Any,
+    engine: Optional[str] = None,
+    iterator: bool = False,
+    chunksize: Optional[int] = None,
+    workers: Optional[int] = None,
+    **kwargs: Any,
+) -> Union[pd.DataFrame, Iterable[pd.DataFrame]]:
+    """
+    Reads a CSV file with the requested parser engine.
+
+    Args:
+        source (str, file-like or buffer): Path to the CSV file, text/binary
+            stream, or bytes/memoryview/mmap with the file contents.
+        engine (str, optional): "c" (pandas default), "python", "pyarrow"
+            (multithreaded, falls back to "parallel" when pyarrow is not
+            installed) or "parallel" (byte ranges parsed in a process pool).
+            When None, files of at least ``AUTO_PARALLEL_BYTES`` are read
+            with "parallel" unless an option, the encoding, compression or a
+            quoted multi-line field rules it out; other sources use pandas.
+        iterator (bool): If True, returns an iterator of DataFrame chunks.
+        chunksize (int, optional): Rows per chunk for the pandas engines when
+            ``iterator`` is True.
+        workers (int, optional): Worker processes for the "parallel" engine.
+        **kwargs: Additional arguments for ``pd.read_csv``.
+
+    Returns:
+        pd.DataFrame or Iterable[pd.DataFrame]: CSV data.
+    """
+    if engine is None:
+        engine = _auto_engine(source, iterator, workers, kwargs)
+    if engine == "pyarrow" and (not HAS_PYARROW or iterator):
+        # pandas' pyarrow engine cannot produce chunks.
+        engine = "parallel"
+    if engine == "parallel" and not is_path(source):
+        engine = None
+
+    if engine == "parallel":
+        return read_csv_parallel(source, workers=workers, iterator=iterator, **kwargs)
+    if iterator:
+        # The chunk reader keeps the stream open until it is exhausted.
+        return pd.read_csv(
+            as_binary_source(source),
+            engine=engine,
+            chunksize=chunksize or DEFAULT_CHUNKSIZE,
+            **kwargs,
+        )
+    with binary_source(source) as stream:
+        return pd.read_csv(stream, engine=engine, **kwargs)
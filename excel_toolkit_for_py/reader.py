@@ -1,69 +1,345 @@
+import os
+from typing import Any, Dict, Iterator, List, Optional, Union
+
 import pandas as pd
 
+from .cache import ExcelCache
+from .fast_reader import probe_sheet, read_excel_with_engine
+from .instrumentation import count_rows, instrumented, span
+from .multi_file import (
+    PathPattern,
+    _source_values,
+    concat_frames,
+    expand_paths,
+    iter_files,
+)
+from .parallel_csv import read_csv_with_engine
+from .schema import Schema
+from .utils import (
+    ReadSource,
+    binary_source,
+    describe_source,
+    optimize_dtypes,
+)
+
+
+def _read_options(**options: Any) -> Dict[str, Any]:
+    """
+    Keeps only the read options that were actually given.
+
+    A ``Schema`` given as ``dtype`` is expanded into its dtype map and, unless
+    ``parse_dates`` was given, its datetime columns.
+    """
+    schema = options.get("dtype")
+    if isinstance(schema, Schema):
+        usecols = options.get("usecols")
+        if isinstance(usecols, (list, tuple)) and all(
+            isinstance(column, str) for column in usecols
+        ):
+            schema = schema.subset(usecols)
+        options["dtype"] = schema.dtypes()
+        if options.get("parse_dates") is None:
+            options["parse_dates"] = schema.parse_dates() or None
+    return {key: value for key, value in options.items() if value is not None}
+
+
+def _downcast(data: Any) -> Any:
+    """Applies optimize_dtypes to a DataFrame or a dict of DataFrames."""
+    if isinstance(data, dict):
+        return {name: optimize_dtypes(df) for name, df in data.items()}
+    return optimize_dtypes(data)
+
 
-def read_excel(file_path: str, sheet_name: str = None) -> pd.DataFrame:
+@instrumented
+def read_excel(
+    file_path: ReadSource,
+    sheet_name: str = None,
+    cache: Optional[ExcelCache] = None,
+    engine: str = "openpyxl",
+    usecols: Any = None,
+    dtype: Any = None,
+    nrows: Optional[int] = None,
+    skiprows: Any = None,
+    parse_dates: Any = None,
+    downcast: bool = False,
+) -> pd.DataFrame:
     """
     📥 Reads an Excel file and returns a DataFrame.
 
     Args:
-        file_path (str): Path to the Excel file.
+        file_path (str, file-like or buffer): Path to the Excel file, binary
+            stream, or bytes/memoryview/mmap with the file contents.
         sheet_name (str, optional): Sheet name. If None, reads the first sheet.
+        cache (ExcelCache, optional): On-disk cache used to skip re-parsing
+            workbooks that did not change since the last read.
+        engine (str): "openpyxl" (default) or "fast" for the streaming XML
+            engine, which skips openpyxl's cell and style objects.
+        usecols (list or str, optional): Columns to read, by name, position or
+            Excel letters ("A:C,F"). With engine="fast", cells of the other
+            columns are never converted.
+        dtype (type, dict or Schema, optional): Data type(s) to apply to
+            columns; a ``Schema`` from ``infer_schema`` also sets
+            ``parse_dates`` to its datetime columns.
+        nrows (int, optional): Number of data rows to read.
+        skiprows (int or list, optional): Sheet rows to skip before parsing.
+        parse_dates (list, optional): Columns to convert to datetime.
+        downcast (bool): Narrows numeric dtypes and converts low-cardinality
+            strings to ``category`` to reduce memory usage.
 
     Returns:
         pd.DataFrame: Sheet data in DataFrame format.
     """
+    options = _read_options(
+        usecols=usecols,
+        dtype=dtype,
+        nrows=nrows,
+        skiprows=skiprows,
+        parse_dates=parse_dates,
+    )
     try:
-        return pd.read_excel(file_path, sheet_name=sheet_name, engine="openpyxl")
+        with span("parse", source=file_path) as phase:
+            if cache is not None and isinstance(file_path, (str, os.PathLike)):
+                data = cache.read_excel(
+                    file_path, sheet_name=sheet_name, engine=engine, **options
+                )
+            else:
+                data = read_excel_with_engine(
+                    file_path, sheet_name=sheet_name, engine=engine, **options
+                )
+            phase.record(rows=count_rows(data))
+        if not downcast:
+            return data
+        with span("downcast", rows=count_rows(data)):
+            return _downcast(data)
     except Exception as e:
-        raise ValueError(f"❌ Error reading file {file_path}: {str(e)}")
+        raise ValueError(
+            f"❌ Error reading file {describe_source(file_path)}: {str(e)}"
+        )
 
 
-def read_csv(file_path: str) -> pd.DataFrame:
+@instrumented
+def read_csv(
+    file_path: ReadSource,
+    usecols: Any = None,
+    dtype: Any = None,
+    nrows: Optional[int] = None,
+    skiprows: Any = None,
+    parse_dates: Any = None,
+    downcast: bool = False,
+    engine: Optional[str] = None,
+    iterator: bool = False,
+    chunksize: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
     """
     📥 Reads a CSV file and returns a DataFrame.
 
     Args:
-        file_path (str): Path to the CSV file.
+        file_path (str, file-like or buffer): Path to the CSV file, stream,
+            or bytes/memoryview/mmap with the file contents.
+        usecols (list, optional): Columns to read. The other columns are
+            skipped by the parser.
+        dtype (type, dict or Schema, optional): Data type(s) to apply to
+            columns; a ``Schema`` from ``infer_schema`` also sets
+            ``parse_dates`` to its datetime columns.
+        nrows (int, optional): Number of rows to read.
+        skiprows (int or list, optional): Lines to skip at the start.
+        parse_dates (list, optional): Columns to convert to datetime.
+        downcast (bool): Narrows numeric dtypes and converts low-cardinality
+            strings to ``category`` to reduce memory usage.
+        engine (str, optional): "c", "python", "pyarrow" for multithreaded
+            parsing or "parallel" to parse newline-aligned byte ranges in a
+            process pool. When None, large files are read with "parallel" if
+            the options allow it, and with pandas' "c" parser otherwise.
+        iterator (bool): If True, returns an iterator of DataFrame chunks.
+        chunksize (int, optional): Rows per chunk for the pandas engines.
+        workers (int, optional): Worker processes for the "parallel" engine.
 
     Returns:
-        pd.DataFrame: CSV data in DataFrame format.
+        pd.DataFrame: CSV data in DataFrame format, or an iterator of chunks.
     """
+    options = _read_options(
+        usecols=usecols,
+        dtype=dtype,
+        nrows=nrows,
+        skiprows=skiprows,
+        parse_dates=parse_dates,
+    )
     try:
-        return pd.read_csv(file_path)
+        if iterator:
+            data = read_csv_with_engine(
+                file_path,
+                engine=engine,
+                iterator=True,
+                chunksize=chunksize,
+                workers=workers,
+                **options,
+            )
+            return (optimize_dtypes(df) if downcast else df for df in data)
+        with span("parse", source=file_path) as phase:
+            data = read_csv_with_engine(
+                file_path, engine=engine, workers=workers, **options
+            )
+            phase.record(rows=count_rows(data))
+        if not downcast:
+            return data
+        with span("downcast", rows=count_rows(data)):
+            return optimize_dtypes(data)
     except Exception as e:
-        raise ValueError(f"❌ Error reading CSV file {file_path}: {str(e)}")
+        raise ValueError(
+            f"❌ Error reading CSV file {describe_source(file_path)}: {str(e)}"
+        )
+
+
+@instrumented
+def probe_excel(
+    file_path: ReadSource, sheet_name: Union[str, int] = 0, sample_rows: int = 100
+) -> Dict[str, Any]:
+    """
+    🔎 Describes an Excel sheet without reading all of its cells.
+
+    Row and column counts come from the sheet's ``<dimension>`` element, and
+    column names and types from the header and a small sample of rows, so
+    even very large sheets are described in milliseconds.
+
+    Args:
+        file_path (str, file-like or buffer): Path to the Excel file, binary
+            stream, or bytes/memoryview/mmap with the file contents.
+        sheet_name (str or int): Sheet name or position. Defaults to the first.
+        sample_rows (int): Number of data rows parsed to infer the types.
+
+    Returns:
+        dict: ``sheet_names``, ``sheet_name``, ``dimension``, ``rows``,
+        ``columns``, ``column_names``, ``dtypes`` (inferred from the sample),
+        ``memory_bytes`` (estimated DataFrame footprint), ``rows_from``
+        ("dimension", or "scan" when the sheet declares no dimension) and
+        ``sample`` (DataFrame with the sampled rows).
+    """
+    try:
+        return probe_sheet(file_path, sheet_name=sheet_name, sample_rows=sample_rows)
+    except Exception as e:
+        raise ValueError(
+            f"❌ Error probing file {describe_source(file_path)}: {str(e)}"
+        )
+
+
+@instrumented
+def read_many(
+    pattern: PathPattern,
+    sheet_name: Union[str, int] = 0,
+    engine: str = "fast",
+    usecols: Any = None,
+    dtype: Any = None,
+    parse_dates: Any = None,
+    source_column: Union[str, bool, None] = None,
+    workers: Optional[int] = None,
+    iterator: bool = False,
+    **kwargs: Any,
+) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+    """
+    📚 Reads many Excel/CSV files in a process pool and concatenates them.
+
+    Schemas are reconciled: the result has the union of all columns and
+    dtypes are widened where files disagree (e.g. int and float columns
+    become float). The result is built with one preallocated copy per column
+    instead of repeated ``pd.concat`` calls.
+
+    Args:
+        pattern (str or list): Glob pattern (``**`` is recursive), or a list
+            of paths. Files ending in ``.csv`` are read as CSV, the others as
+            Excel.
+        sheet_name (str or int): Sheet read from every workbook.
+        engine (str): Excel engine, "fast" (default) or "openpyxl".
+        usecols (list, optional): Columns to read from every file; files
+            without some of them are read with the others.
+        dtype (dict or Schema, optional): Data types applied per file to the
+            columns present.
+        parse_dates (list, optional): Columns to convert to datetime.
+        source_column (str or bool, optional): Adds a categorical column with
+            the path of the file each row came from; True names it "source".
+        workers (int, optional): Worker processes. Defaults to the number of
+            CPUs; 1 reads the files in this process.
+        iterator (bool): If True, returns an iterator of one DataFrame per
+            file, in order and with that file's columns, instead of
+            concatenating.
+        **kwargs: Additional options for the CSV or Excel reader.
+
+    Returns:
+        pd.DataFrame or Iterator[pd.DataFrame]: The concatenated data, or one
+        DataFrame per file.
+    """
+    try:
+        paths = expand_paths(pattern)
+        options = _read_options(usecols=usecols, dtype=dtype, parse_dates=parse_dates)
+        options.update(kwargs, sheet_name=sheet_name, engine=engine)
+        if source_column is True:
+            source_column = "source"
+        frames = iter_files(paths, options, workers=workers)
+        if iterator:
+            return _with_source(frames, paths, source_column or None)
+        with span("parse") as phase:
+            loaded = list(frames)
+            phase.record(rows=count_rows(loaded), files=len(paths))
+        with span("concat", rows=count_rows(loaded)):
+            return concat_frames(loaded, paths, source_column or None)
+    except Exception as e:
+        raise ValueError(f"❌ Error reading files {pattern!r}: {str(e)}")
+
+
+def _with_source(
+    frames: Iterator[pd.DataFrame], paths: List[str], source_column: Optional[str]
+) -> Iterator[pd.DataFrame]:
+    for path, frame in zip(paths, frames):
+        if source_column is not None:
+            frame[source_column] = _source_values([path], [len(frame)])
+        yield frame
 
 
-def get_sheet_names(file_path: str) -> list:
+@instrumented
+def get_sheet_names(file_path: ReadSource) -> list:
     """
     📋 Gets the names of all sheets in an Excel file.
 
     Args:
-        file_path (str): Path to the Excel file.
+        file_path (str, file-like or buffer): Path to the Excel file, binary
+            stream, or bytes/memoryview/mmap with the file contents.
 
     Returns:
         list: List of sheet names.
     """
     try:
-        xls = pd.ExcelFile(file_path)
-        return xls.sheet_names
+        with binary_source(file_path) as source:
+            with pd.ExcelFile(source) as xls:
+                return xls.sheet_names
     except Exception as e:
-        raise ValueError(f"❌ Error getting sheet names from {file_path}: {str(e)}")
+        raise ValueError(
+            f"❌ Error getting sheet names from {describe_source(file_path)}: {str(e)}"
+        )
 
 
-def get_dict_sheets(file_path: str, sheet_name: str = None) -> dict:
+@instrumented
+def get_dict_sheets(
+    file_path: ReadSource, sheet_name: str = None, cache: Optional[ExcelCache] = None
+) -> dict:
     """
     📋 Gets a dictionary of all sheets in an Excel file.
 
     Args:
-        file_path (str): Path to the Excel file.
+        file_path (str, file-like or buffer): Path to the Excel file, binary
+            stream, or bytes/memoryview/mmap with the file contents.
         sheet_name (str, optional): Specific sheet name. If None, gets all sheets.
+        cache (ExcelCache, optional): On-disk cache of parsed sheets.
 
     Returns:
         dict: Dictionary with sheet names as keys and DataFrames as values.
     """
     try:
-        dfs = pd.read_excel(file_path, sheet_name=sheet_name)
+        if cache is not None and isinstance(file_path, (str, os.PathLike)):
+            return cache.read_excel(file_path, sheet_name=sheet_name)
+        with binary_source(file_path) as source:
+            dfs = pd.read_excel(source, sheet_name=sheet_name)
         return dfs
     except Exception as e:
-        raise ValueError(f"❌ Error getting sheets from {file_path}: {str(e)}")
+        raise ValueError(
+            f"❌ Error getting sheets from {describe_source(file_path)}: {str(e)}"
+        )
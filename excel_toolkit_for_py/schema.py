@@ -0,0 +1,424 @@
+"""
+Schema inference.
+
+A sheet or CSV file is read in chunks. Every chunk contributes exact null
+counts and numeric/datetime ranges, and the logical type of each column as
+reported by ``pd.api.types.infer_dtype`` (a vectorized pass). Distinct values
+are counted exactly through their 64-bit hashes (8 bytes per distinct value
+and column), which gives the cardinality and uniqueness of each column. A
+fixed-size uniform sample of rows is kept with reservoir sampling and
+provides the example values.
+
+Excel stores every number as a float, so whole-number cells are reported as
+``int``; integer columns with missing values are recognised as ``int`` too.
+
+The resulting ``Schema`` maps column names to Python types, so it can be
+passed to ``validate_excel_schema`` as is, and ``Schema.dtypes()`` /
+``Schema.parse_dates()`` give the ``dtype`` / ``parse_dates`` options that
+let later reads skip type inference (readers also accept the ``Schema``
+itself as ``dtype``).
+"""
+
+import builtins
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Union
+
+import numpy as np
+import pandas as pd
+
+from .fast_reader import DEFAULT_CHUNKSIZE, iter_excel_chunks
+from .instrumentation import instrumented
+from .parallel_csv import read_csv_with_engine
+from .utils import ReadSource
+
+DEFAULT_SAMPLE_SIZE = 10_000
+
+# infer_dtype result -> logical type name.
+_LOGICAL_TYPES = {
+    "integer": "int",
+    "floating": "float",
+    "mixed-integer-float": "float",
+    "decimal": "float",
+    "boolean": "bool",
+    "datetime64": "datetime",
+    "datetime": "datetime",
+    "date": "datetime",
+    "string": "str",
+}
+_PYTHON_TYPES: Dict[str, type] = {
+    "int": int,
+    "float": float,
+    "bool": bool,
+    "datetime": pd.Timestamp,
+    "str": str,
+    "object": object,
+}
+# Text is only read as dates when every value starts with a full ISO date.
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+
+@dataclass
+class ColumnSchema:
+    """Inferred description of one column."""
+
+    name: str
+    type: str
+    nullable: bool
+    null_count: int
+    cardinality: int
+    unique: bool
+    min: Any = None
+    max: Any = None
+    examples: List[Any] = field(default_factory=list)
+
+    @property
+    def python_type(self) -> builtins.type:
+        """Type accepted by ``validate_excel_schema``."""
+        return _PYTHON_TYPES[self.type]
+
+    @property
+    def dtype(self) -> Any:
+        """pandas dtype for reads, or None for datetimes and mixed columns."""
+        if self.type == "int":
+            return "Int64" if self.nullable else "int64"
+        if self.type == "bool":
+            return "boolean" if self.nullable else "bool"
+        if self.type == "float":
+            return "float64"
+        if self.type == "str":
+            return str
+        return None
+
+
+class Schema(Mapping[str, type]):
+    """
+    Inferred schema: a read-only mapping of column name -> Python type.
+
+    Attributes:
+        columns (Dict[str, ColumnSchema]): Per-column details.
+        rows (int): Rows read to infer the schema.
+        sample_size (int): Rows kept in the reservoir sample.
+    """
+
+    def __init__(
+        self, columns: Dict[str, ColumnSchema], rows: int, sample_size: int
+    ) -> None:
+        self.columns = columns
+        self.rows = rows
+        self.sample_size = sample_size
+
+    def __getitem__(self, name: str) -> type:
+        return self.columns[name].python_type
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def __repr__(self) -> str:
+        types = ", ".join(f"{name}: {col.type}" for name, col in self.columns.items())
+        return f"Schema({types}; rows={self.rows})"
+
+    def subset(self, names: Iterable[str]) -> "Schema":
+        """Returns the schema of the given columns only."""
+        columns = {name: self.columns[name] for name in names if name in self.columns}
+        return Schema(columns, self.rows, self.sample_size)
+
+    def dtypes(self) -> Dict[str, Any]:
+        """Returns a ``dtype`` map for ``read_excel`` / ``read_csv``."""
+        return {
+            name: col.dtype
+            for name, col in self.columns.items()
+            if col.dtype is not None
+        }
+
+    def parse_dates(self) -> List[str]:
+        """Returns the datetime columns, for the ``parse_dates`` option."""
+        return [name for name, col in self.columns.items() if col.type == "datetime"]
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the column details as plain dictionaries."""
+        return {
+            name: {
+                "type": col.type,
+                "nullable": col.nullable,
+                "null_count": col.null_count,
+                "cardinality": col.cardinality,
+                "unique": col.unique,
+                "min": col.min,
+                "max": col.max,
+            }
+            for name, col in self.columns.items()
+        }
+
+
+def _logical_type(series: pd.Series) -> Optional[str]:
+    """Logical type of a chunk column; None when it only has missing values."""
+    inferred = pd.api.types.infer_dtype(series, skipna=True)
+    if inferred == "empty":
+        return None
+    kind = _LOGICAL_TYPES.get(inferred, "object")
+    if kind == "float" and series.hasnans:
+        # Integer columns with missing values are read as floats.
+        values = _non_null(series, kind).to_numpy(dtype=np.float64)
+        if np.all(np.isfinite(values)) and np.all(values == np.floor(values)):
+            kind = "int"
+    return kind
+
+
+def _non_null(series: pd.Series, kind: str) -> pd.Series:
+    """Non-missing values of a numeric or datetime column, converted."""
+    if kind == "datetime":
+        if series.dtype.kind != "M":
+            series = pd.to_datetime(series, errors="coerce")
+    elif series.dtype.kind not in "iuf":
+        series = pd.to_numeric(series, errors="coerce")
+    return series.dropna()
+
+
+def _as_dates(series: pd.Series) -> Optional[pd.Series]:
+    """Parses a text column as ISO dates; None if any value is not a date."""
+    values = series.dropna()
+    # A quick check on the first values spares parsing whole text columns.
+    for candidate in (values.head(20), values):
+        # ISO8601 parsing also accepts bare years ("2020") and months.
+        if not candidate.astype(str).str.match(_ISO_DATE).all():
+            return None
+        parsed = pd.to_datetime(candidate, format="ISO8601", errors="coerce")
+        if parsed.isna().any():
+            return None
+    return parsed
+
+
+def _merge_types(kinds: Set[str]) -> str:
+    if not kinds:
+        return "object"
+    if len(kinds) == 1:
+        return next(iter(kinds))
+    if kinds <= {"int", "float"}:
+        return "float"
+    return "object"
+
+
+class _DistinctCounter:
+    """Exact number of distinct non-null values, kept as 64-bit hashes."""
+
+    def __init__(self) -> None:
+        self.merged = np.empty(0, dtype=np.uint64)
+        self.pending: List[np.ndarray] = []
+        self.pending_size = 0
+        self.values = 0
+
+    def add(self, series: pd.Series, kind: Optional[str]) -> None:
+        values = series.dropna()
+        if kind in ("int", "float"):
+            # Chunks may read the same numbers as int64 or float64.
+            values = values.astype(np.float64)
+        elif kind == "datetime":
+            values = pd.Series(values.to_numpy(dtype="datetime64[us]"))
+        self.values += len(values)
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        self.pending.append(np.unique(hashes))
+        self.pending_size += len(self.pending[-1])
+        # Merging once the pending hashes outgrow the merged ones keeps the
+        # total cost of the merges linear in the number of hashes.
+        if self.pending_size > len(self.merged):
+            self._merge()
+
+    def _merge(self) -> None:
+        self.merged = np.unique(np.concatenate([self.merged, *self.pending]))
+        self.pending, self.pending_size = [], 0
+
+    @property
+    def count(self) -> int:
+        self._merge()
+        return len(self.merged)
+
+
+class _Reservoir:
+    """Uniform sample of ``size`` rows over a stream (Algorithm R)."""
+
+    def __init__(self, size: int, seed: Optional[int]) -> None:
+        self.size = size
+        self.seen = 0
+        self.rng = np.random.default_rng(seed)
+        self.columns: Dict[str, np.ndarray] = {}
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        n = len(chunk)
+        for name in chunk.columns:
+            if name not in self.columns:
+                # Columns missing from earlier chunks start as missing values.
+                self.columns[name] = np.full(min(self.seen, self.size), None, object)
+        # Row t (0-based) replaces slot j ~ U[0, t] when j < size.
+        positions = np.arange(self.seen, self.seen + n)
+        slots = np.where(
+            positions < self.size,
+            positions,
+            (self.rng.random(n) * (positions + 1)).astype(np.int64),
+        )
+        chosen = np.flatnonzero(slots < self.size)
+        slots = slots[chosen]
+        filled = min(self.seen + n, self.size)
+        for name, values in self.columns.items():
+            if len(values) < filled:
+                values = self.columns[name] = np.concatenate(
+                    [values, np.full(filled - len(values), None, object)]
+                )
+            if name in chunk.columns:
+                source = chunk[name].to_numpy(dtype=object)[chosen]
+            else:
+                source = np.full(len(chosen), None, object)
+            # Later rows win when several pick the same slot, as in Algorithm R.
+            values[slots] = source
+        self.seen += n
+
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.columns)
+
+
+def _update_range(stats: Dict[str, Any], series: pd.Series, kind: str) -> None:
+    if kind not in ("int", "float", "datetime"):
+        return
+    values = _non_null(series, kind)
+    if values.empty:
+        return
+    low, high = values.min(), values.max()
+    stats["min"] = low if stats.get("min") is None else min(stats["min"], low)
+    stats["max"] = high if stats.get("max") is None else max(stats["max"], high)
+
+
+def _plain(value: Any) -> Any:
+    """Converts NumPy scalars to Python values."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _file_chunks(
+    source: ReadSource, sheet_name: Union[str, int], chunksize: int, **kwargs: Any
+) -> Iterator[pd.DataFrame]:
+    """Chunked read of a ``.csv`` path, or of an ``.xlsx`` sheet otherwise."""
+    path = os.fspath(source) if isinstance(source, (str, os.PathLike)) else ""
+    if path.lower().endswith(".csv"):
+        return iter(
+            read_csv_with_engine(source, iterator=True, chunksize=chunksize, **kwargs)
+        )
+    return iter_excel_chunks(
+        source, sheet_name=sheet_name, chunksize=chunksize, **kwargs
+    )
+
+
+def _close(chunks: Any) -> None:
+    close = getattr(chunks, "close", None)
+    if close is not None:
+        close()
+
+
+def infer_schema_from_chunks(
+    chunks: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+    max_rows: Optional[int] = None,
+    seed: Optional[int] = 0,
+) -> Schema:
+    """
+    Infers a schema from a DataFrame or an iterable of DataFrame chunks.
+
+    Args:
+        chunks: DataFrame or consecutive blocks of rows.
+        sample_size (int): Rows kept in the reservoir sample, used for the
+            examples.
+        max_rows (int, optional): Stop after this many rows.
+        seed (int, optional): Seed of the reservoir sampler.
+
+    Returns:
+        Schema: The inferred schema.
+    """
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+    reservoir = _Reservoir(sample_size, seed)
+    kinds: Dict[str, Set[str]] = {}
+    stats: Dict[str, Dict[str, Any]] = {}
+    distinct: Dict[str, _DistinctCounter] = {}
+    rows = 0
+    for chunk in chunks:
+        if max_rows is not None and rows + len(chunk) > max_rows:
+            chunk = chunk.iloc[: max_rows - rows]
+        for name in chunk.columns:
+            series = chunk[name]
+            column_stats = stats.setdefault(name, {"nulls": rows})
+            column_stats["nulls"] += int(series.isna().sum())
+            kind = _logical_type(series)
+            if kind == "str" and column_stats.get("dates", True):
+                # Dates in CSV files are read as text.
+                dates = _as_dates(series)
+                column_stats["dates"] = dates is not None
+                if dates is not None:
+                    kind, series = "datetime", dates
+            if kind is not None:
+                kinds.setdefault(name, set()).add(kind)
+                _update_range(column_stats, series, kind)
+            distinct.setdefault(name, _DistinctCounter()).add(series, kind)
+        for name in set(stats) - set(chunk.columns):
+            stats[name]["nulls"] += len(chunk)
+        reservoir.add(chunk)
+        rows += len(chunk)
+        if max_rows is not None and rows >= max_rows:
+            break
+
+    sample = reservoir.frame()
+    columns = {}
+    for name, column_stats in stats.items():
+        kind = _merge_types(kinds.get(name, set()))
+        values = sample[name].dropna()
+        counter = distinct[name]
+        ranged = kind in ("int", "float", "datetime")
+        low, high = column_stats.get("min"), column_stats.get("max")
+        if kind == "int" and low is not None and high is not None:
+            low, high = int(low), int(high)
+        columns[str(name)] = ColumnSchema(
+            name=str(name),
+            type=kind,
+            nullable=column_stats["nulls"] > 0,
+            null_count=column_stats["nulls"],
+            cardinality=counter.count,
+            unique=counter.count == counter.values and counter.values > 0,
+            min=_plain(low) if ranged else None,
+            max=_plain(high) if ranged else None,
+            examples=[_plain(v) for v in values.drop_duplicates().head(5)],
+        )
+    return Schema(columns, rows, len(sample))
+
+
+@instrumented
+def infer_schema(
+    source: ReadSource,
+    sheet_name: Union[str, int] = 0,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+    max_rows: Optional[int] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    seed: Optional[int] = 0,
+    **kwargs: Any,
+) -> Schema:
+    """
+    Infers the schema of an Excel sheet or a CSV file with a streamed read.
+
+    Args:
+        source (str, file-like or buffer): ``.xlsx`` or ``.csv`` file. Paths
+            ending in ``.csv`` are read as CSV, anything else as ``.xlsx``.
+        sheet_name (str or int): Sheet to read from a workbook.
+        sample_size (int): Rows kept in the reservoir sample.
+        max_rows (int, optional): Stop reading after this many rows.
+        chunksize (int): Rows per chunk of the streamed read.
+        seed (int, optional): Seed of the reservoir sampler.
+        **kwargs: Additional options for the chunked reader.
+
+    Returns:
+        Schema: The inferred schema.
+    """
+    chunks = _file_chunks(source, sheet_name, chunksize, **kwargs)
+    try:
+        return infer_schema_from_chunks(chunks, sample_size, max_rows, seed)
+    finally:
+        _close(chunks)
@@ -0,0 +1,160 @@
+"""
+Utility functions shared by the reader, writer and validation modules.
+"""
+
+import contextlib
+import io
+import mmap
+import os
+from typing import IO, Any, Iterator, Union
+
+import numpy as np
+import pandas as pd
+
+# Anything the read functions accept as input.
+ReadSource = Union[
+    str, "os.PathLike[str]", IO[bytes], bytes, bytearray, memoryview, mmap.mmap
+]
+
+
+class MemoryViewReader(io.RawIOBase):
+    """
+    Read-only, seekable binary stream over a buffer, without copying it.
+
+    Only the bytes requested by each ``read`` call are copied, so bytes,
+    bytearray, memoryview and mmap inputs can be handed to the zip and CSV
+    parsers as they are.
+    """
+
+    def __init__(self, buffer: Any) -> None:
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else self._position + size
+        data = self._view[self._position : end].tobytes()
+        self._position += len(data)
+        return data
+
+    def readinto(self, buffer: Any) -> int:
+        data = self._view[self._position : self._position + len(buffer)]
+        buffer[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(0, offset)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def as_binary_source(source: Any) -> Any:
+    """
+    Normalizes a read source for the parsers.
+
+    Paths and file-like objects are returned unchanged; bytes, bytearray,
+    memoryview and mmap objects are wrapped in a zero-copy binary stream.
+
+    Args:
+        source: Path, file-like object or in-memory buffer.
+
+    Returns:
+        Path or binary file-like object.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        return MemoryViewReader(source)
+    return source
+
+
+@contextlib.contextmanager
+def binary_source(source: Any) -> Iterator[Any]:
+    """
+    Context manager version of ``as_binary_source``.
+
+    The zero-copy wrapper, if one was created, is closed on exit so the
+    underlying buffer (e.g. an mmap) can be closed by the caller afterwards.
+    """
+    wrapped = as_binary_source(source)
+    try:
+        yield wrapped
+    finally:
+        if wrapped is not source:
+            wrapped.close()
+
+
+def is_path(source: Any) -> bool:
+    """Checks whether a read source is a filesystem path."""
+    return isinstance(source, (str, os.PathLike))
+
+
+def describe_source(source: Any) -> str:
+    """Returns a short description of a read source for error messages."""
+    if is_path(source):
+        path: str = os.fspath(source)
+        return path
+    return f"<{type(source).__name__}>"
+
+
+def _is_string_column(series: pd.Series) -> bool:
+    """Checks whether a column only holds strings (ignoring missing values)."""
+    if pd.api.types.is_string_dtype(series.dtype) and not pd.api.types.is_object_dtype(
+        series.dtype
+    ):
+        return True
+    if not pd.api.types.is_object_dtype(series.dtype):
+        return False
+    return bool(series.dropna().map(type).eq(str).all())
+
+
+def optimize_dtypes(df: pd.DataFrame, category_threshold: float = 0.5) -> pd.DataFrame:
+    """
+    Reduces the memory footprint of a DataFrame.
+
+    Integers are narrowed to the smallest type that holds them, floats become
+    float32 when that is lossless and string columns whose ratio of distinct
+    values is at most ``category_threshold`` are converted to ``category``.
+
+    Args:
+        df (pd.DataFrame): DataFrame to optimize.
+        category_threshold (float): Maximum ratio of unique values (0-1) for a
+            string column to be converted to ``category``.
+
+    Returns:
+        pd.DataFrame: New DataFrame with narrowed dtypes.
+    """
+    result = df.copy()
+    for i in range(result.shape[1]):
+        series = result.iloc[:, i]
+        dtype = series.dtype
+
+        if pd.api.types.is_bool_dtype(dtype):
+            continue
+        if pd.api.types.is_integer_dtype(dtype) and isinstance(dtype, np.dtype):
+            result.isetitem(i, pd.to_numeric(series, downcast="integer"))
+        elif pd.api.types.is_float_dtype(dtype) and isinstance(dtype, np.dtype):
+            with np.errstate(over="ignore"):
+                narrowed = series.astype(np.float32)
+            lossless = (narrowed.astype(dtype) == series) | series.isna()
+            if lossless.all():
+                result.isetitem(i, narrowed)
+        elif len(series) and _is_string_column(series):
+            if series.nunique() / len(series) <= category_threshold:
+                result.isetitem(i, series.astype("category"))
+    return result
@@ -1,65 +1,114 @@
-import pandas as pd
+from typing import Any, Dict, Optional, Sequence, Union
 
+import pandas as pd
 
-def _check_dtype(series, expected_type):
-    """
-    🎯 Verifica se a série possui o tipo de dado esperado.
-    - Aceita floats inteiros como válidos para int.
-    - Lida com valores nulos.
-    """
-    try:
-        if expected_type == int:
-            return series.dropna().apply(lambda x: float(x).is_integer()).all()
-        elif expected_type == float:
-            return (
-                series.dropna().apply(lambda x: isinstance(x, (float, int))).all()
-            )  # noqa501
-        elif expected_type == str:
-            return series.dropna().apply(lambda x: isinstance(x, str)).all()
-        else:
-            return (
-                series.dropna().apply(lambda x: isinstance(x, expected_type)).all()
-            )  # noqa501
-    except Exception:
-        return False
-
-
-def validate_excel_schema(file_path, schema, sheet_name=None):
+from .constraints import Rule, compile_schema
+from .duplicates import find_duplicates
+from .fast_reader import probe_sheet, read_excel_with_engine
+from .instrumentation import count_rows, instrumented, span
+from .parallel_csv import read_csv_with_engine
+from .utils import ReadSource
+
+# 💬 Mensagens de erro por tipo de regra (ver ``constraints.Rule``)
+_MENSAGENS = {
+    "min": "{n} valor(es) abaixo do mínimo {param}",
+    "max": "{n} valor(es) acima do máximo {param}",
+    "pattern": "{n} valor(es) fora do padrão '{param}'",
+    "isin": "{n} valor(es) fora dos valores permitidos",
+    "unique": "{n} valor(es) duplicados",
+}
+
+
+def _mensagem(regra: Rule, violacao: Dict[str, Any]) -> str:
+    """💬 Descreve em português a violação de uma regra compilada."""
+    coluna, n = regra.column, violacao["count"]
+    if regra.kind == "type":
+        return f"⚠️ Coluna '{coluna}' com tipo inválido. Esperado: {regra.param.__name__}"  # noqa: E501
+    if regra.kind == "not_null":
+        return f"⚠️ Coluna '{coluna}' com valores nulos"
+    linhas = ", ".join(str(linha) for linha in violacao["rows"])
+    if regra.kind == "check":
+        return f"⚠️ Regra '{regra.param}' violada em {n} linha(s) (linhas: {linhas})"
+    detalhe = _MENSAGENS[regra.kind].format(n=n, param=regra.param)
+    return f"⚠️ Coluna '{coluna}': {detalhe} (linhas: {linhas})"
+
+
+def _file_info(df: pd.DataFrame) -> Dict[str, Any]:
+    """📊 Resume linhas, colunas, tipos e valores nulos de um DataFrame."""
+    return {
+        "linhas": len(df),
+        "colunas": len(df.columns),
+        "nomes_colunas": list(df.columns),
+        "tipos_colunas": {col: str(df[col].dtype) for col in df.columns},
+        "valores_nulos": df.isnull().sum().to_dict(),
+    }
+
+
+def _probe_info(probe: Dict[str, Any]) -> Dict[str, Any]:
+    """🔎 Converte o resultado de ``probe_sheet`` nas chaves de ``_file_info``."""
+    return {
+        "linhas": probe["rows"],
+        "colunas": probe["columns"],
+        "nomes_colunas": probe["column_names"],
+        "tipos_colunas": probe["dtypes"],
+        "memoria_estimada": probe["memory_bytes"],
+    }
+
+
+@instrumented
+def validate_excel_schema(
+    file_path, schema, sheet_name=None, engine=None, checks=None, sample_size=5
+):
     """
     🛡️ Valida se um arquivo Excel segue o esquema especificado.
 
     Args:
         file_path (str): Caminho para o arquivo Excel.
         schema (dict): Dicionário com o nome da coluna e o tipo esperado. Ex.: {"Nome": str, "Idade": int} # noqa501
+            Os valores também podem ser ``Column`` (ou dicts com suas opções)
+            com restrições declarativas: ``nullable``, ``min``/``max``,
+            ``pattern``, ``isin`` e ``unique``. Aceita ainda um ``Schema`` de
+            ``infer_schema`` (colunas sem nulos na inferência não podem ter
+            valores nulos) ou um ``CompiledSchema`` de ``compile_schema``,
+            reaproveitável entre muitos arquivos.
         sheet_name (str ou None): Nome da planilha. Se None, lê a primeira.
+        engine (str ou None): Engine de leitura. "fast" usa o leitor XML rápido.
+        checks (list ou None): Expressões entre colunas que devem valer em
+            todas as linhas. Ex.: ["Fim >= Inicio"]
+        sample_size (int): Quantidade de linhas de exemplo por regra violada.
 
     Returns:
         dict: {
             "valid": bool,
-            "errors": list (se houver)
+            "errors": list (se houver),
+            "violations": dict (por regra: coluna, tipo, contagem e linhas)
         }
     """
-    resultado = {"valid": True, "errors": []}
+    resultado: Dict[str, Any] = {"valid": True, "errors": [], "violations": {}}
 
     try:
-        df = pd.read_excel(file_path, sheet_name=sheet_name)
-
-        # ✅ Força leitura da primeira planilha se múltiplas forem retornadas
-        if isinstance(df, dict):
-            df = list(df.values())[0]
-
-        # 🚨 Verificar se todas as colunas existem e validar tipos
-        for coluna, tipo in schema.items():
-            if coluna not in df.columns:
-                resultado["valid"] = False
+        # ⚙️ Compila o esquema uma única vez em regras vetorizadas
+        validador = compile_schema(schema, checks)
+
+        with span("read", source=file_path) as phase:
+            df = read_excel_with_engine(file_path, sheet_name=sheet_name, engine=engine)
+
+            # ✅ Força leitura da primeira planilha se múltiplas forem retornadas
+            if isinstance(df, dict):
+                df = list(df.values())[0]
+            phase.record(rows=len(df))
+
+        # 🚨 Verificar se todas as colunas existem e avaliar as regras
+        with span("validate", rows=len(df)):
+            relatorio = validador.validate(df, sample_size=sample_size)
+            resultado["valid"] = relatorio["valid"]
+            resultado["violations"] = relatorio["violations"]
+            for coluna in relatorio["missing_columns"]:
                 resultado["errors"].append(f"❌ Coluna ausente: '{coluna}'")
-            else:
-                # 🎯 Validação robusta de tipo
-                if not _check_dtype(df[coluna], tipo):
-                    resultado["valid"] = False
-                    resultado["errors"].append(
-                        f"⚠️ Coluna '{coluna}' com tipo inválido. Esperado: {tipo.__name__}"
-                    )  # noqa501
+            for regra in validador.rules:
+                violacao = relatorio["violations"].get(regra.name)
+                if violacao and violacao["count"]:
+                    resultado["errors"].append(_mensagem(regra, violacao))
 
     except Exception as e:
         resultado["valid"] = False
@@ -68,13 +117,20 @@ def validate_excel_schema(file_path, schema, sheet_name=None):
     return resultado
 
 
-def validate_excel(file_path, sheet_name=None, **kwargs):
+@instrumented
+def validate_excel(file_path, sheet_name=None, engine=None, probe=False, **kwargs):
     """
     🛡️ Valida um arquivo Excel.
 
     Args:
         file_path (str): Caminho para o arquivo Excel.
         sheet_name (str ou None): Nome da planilha. Se None, lê a primeira.
+        engine (str ou None): Engine de leitura. "fast" usa o leitor XML rápido.
+        probe (bool): Se True, não lê a planilha inteira: linhas e colunas vêm
+            do elemento <dimension> e os tipos de uma amostra das primeiras
+            linhas (ver ``probe_excel``). Nesse modo, "valores_nulos" é
+            omitido, "memoria_estimada" (bytes) é incluído e, dos kwargs, só
+            ``sample_rows`` é usado; as opções de leitura são ignoradas.
         **kwargs: Argumentos adicionais para pd.read_excel()
 
     Returns:
@@ -87,20 +143,27 @@ def validate_excel(file_path, sheet_name=None, **kwargs):
     resultado = {"valid": True, "errors": [], "info": {}}
 
     try:
-        df = pd.read_excel(file_path, sheet_name=sheet_name, **kwargs)
-
-        # ✅ Força leitura da primeira planilha se múltiplas forem retornadas
-        if isinstance(df, dict):
-            df = list(df.values())[0]
+        if probe:
+            amostra = {k: v for k, v in kwargs.items() if k == "sample_rows"}
+            with span("probe", source=file_path):
+                resultado["info"] = _probe_info(
+                    probe_sheet(file_path, sheet_name=sheet_name or 0, **amostra)
+                )
+            return resultado
+
+        with span("read", source=file_path) as phase:
+            df = read_excel_with_engine(
+                file_path, sheet_name=sheet_name, engine=engine, **kwargs
+            )
+
+            # ✅ Força leitura da primeira planilha se múltiplas forem retornadas
+            if isinstance(df, dict):
+                df = list(df.values())[0]
+            phase.record(rows=len(df))
 
         # 📊 Coleta informações sobre o arquivo
-        resultado["info"] = {
-            "linhas": len(df),
-            "colunas": len(df.columns),
-            "nomes_colunas": list(df.columns),
-            "tipos_colunas": {col: str(df[col].dtype) for col in df.columns},
-            "valores_nulos": df.isnull().sum().to_dict(),
-        }
+        with span("validate", rows=len(df)):
+            resultado["info"] = _file_info(df)
 
     except Exception as e:
         resultado["valid"] = False
@@ -109,13 +172,18 @@ def validate_excel(file_path, sheet_name=None, **kwargs):
     return resultado
 
 
-def validate_csv(file_path, encoding="utf-8", **kwargs):
+@instrumented
+def validate_csv(file_path, encoding="utf-8", engine=None, **kwargs):
     """
     🛡️ Valida um arquivo CSV.
 
     Args:
         file_path (str): Caminho para o arquivo CSV.
         encoding (str): Codificação do arquivo.
+        engine (str ou None): Engine de leitura do CSV. "pyarrow" usa o parser
+            multithread e "parallel" divide o arquivo em blocos processados em
+            paralelo. Se None, arquivos grandes usam "parallel" quando as
+            opções permitem (ver ``read_csv_with_engine``).
         **kwargs: Argumentos adicionais para pd.read_csv()
 
     Returns:
@@ -128,16 +196,15 @@ def validate_csv(file_path, encoding="utf-8", **kwargs):
     resultado = {"valid": True, "errors": [], "info": {}}
 
     try:
-        df = pd.read_csv(file_path, encoding=encoding, **kwargs)
+        with span("read", source=file_path) as phase:
+            df = read_csv_with_engine(
+                file_path, engine=engine, encoding=encoding, **kwargs
+            )
+            phase.record(rows=count_rows(df))
 
         # 📊 Coleta informações sobre o arquivo
-        resultado["info"] = {
-            "linhas": len(df),
-            "colunas": len(df.columns),
-            "nomes_colunas": list(df.columns),
-            "tipos_colunas": {col: str(df[col].dtype) for col in df.columns},
-            "valores_nulos": df.isnull().sum().to_dict(),
-        }
+        with span("validate", rows=count_rows(df)):
+            resultado["info"] = _file_info(df)
 
     except Exception as e:
         resultado["valid"] = False
@@ -146,6 +213,71 @@ def validate_csv(file_path, encoding="utf-8", **kwargs):
     return resultado
 
 
+@instrumented
+def validate_duplicates(
+    file_paths: Union[ReadSource, pd.DataFrame, Sequence[Any]],
+    subset: Optional[Sequence[str]] = None,
+    sheet_name: Union[str, int, None] = None,
+    memory_limit: Optional[int] = None,
+    **kwargs: Any,
+) -> Dict[str, Any]:
+    """
+    🛡️ Procura linhas duplicadas (ou chaves repetidas) em um ou mais arquivos.
+
+    As linhas são reduzidas a hashes de 64 bits com
+    ``pd.util.hash_pandas_object``, bloco a bloco, o que encontra duplicatas
+    dentro de cada arquivo e entre arquivos do lote (ver ``find_duplicates``).
+
+    Args:
+        file_paths (str ou list): Arquivo(s) Excel ou CSV (ou DataFrames).
+        subset (list ou None): Colunas da chave. Se None, compara linhas
+            inteiras.
+        sheet_name (str ou None): Nome da planilha. Se None, lê a primeira.
+        memory_limit (int ou None): Bytes de hashes mantidos em memória;
+            acima disso, os hashes são particionados em disco.
+        **kwargs: Argumentos adicionais para ``find_duplicates``.
+
+    Returns:
+        dict: {
+            "valid": bool,
+            "errors": list (se houver),
+            "duplicates": dict (linhas, duplicadas, grupos, por arquivo e
+                DataFrame com as ocorrências)
+        }
+    """
+    resultado: Dict[str, Any] = {"valid": True, "errors": [], "duplicates": {}}
+
+    try:
+        relatorio = find_duplicates(
+            file_paths,
+            subset=subset,
+            sheet_name=sheet_name or 0,
+            memory_limit=memory_limit,
+            **kwargs,
+        )
+        resultado["duplicates"] = {
+            "linhas": relatorio.rows,
+            "duplicadas": relatorio.duplicate_rows,
+            "grupos": relatorio.groups,
+            "por_arquivo": dict(zip(relatorio.sources, relatorio.counts)),
+            "ocorrencias": relatorio.locations,
+        }
+        # 🚨 Uma mensagem por arquivo com duplicatas
+        alvo = f"chave(s) {list(subset)}" if subset else "linha(s)"
+        for fonte, quantidade in zip(relatorio.sources, relatorio.counts):
+            if quantidade:
+                resultado["valid"] = False
+                resultado["errors"].append(
+                    f"⚠️ {quantidade} {alvo} duplicada(s) em '{fonte}'"
+                )
+
+    except Exception as e:
+        resultado["valid"] = False
+        resultado["errors"].append(f"❌ Erro ao procurar duplicatas: {str(e)}")
+
+    return resultado
+
+
 # 🌟 Exemplo de uso
 if __name__ == "__main__":
     # Validação de esquema
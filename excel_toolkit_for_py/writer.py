@@ -1,6 +1,25 @@
+from typing import Any, Dict, List, Optional, Union
+
 import pandas as pd
+from openpyxl import Workbook
+from openpyxl.chart import Reference, Series
+from openpyxl.utils import get_column_letter
+
+from .advanced_features import make_chart
+from .instrumentation import count_rows, instrumented, span
+from .native_writer import (
+    DEFAULT_COMPRESSLEVEL,
+    DEFAULT_WRITER_ENGINE,
+    append_xlsx_rows,
+    write_excel_with_engine,
+)
+from .optimizer import optimize_xlsx
+
+# Linhas ocupadas por cada gráfico posicionado automaticamente.
+_CHART_ROW_SPAN = 16
 
 
+@instrumented
 def write_list_to_excel(filename, data, sheet_name="Sheet1"):
     """Cria um arquivo Excel a partir de uma lista de listas."""
     try:
@@ -18,8 +37,14 @@ def write_list_to_excel(filename, data, sheet_name="Sheet1"):
         raise ValueError(f"❌ Erro ao criar o Excel: {str(e)}")
 
 
+@instrumented
 def write_excel(
-    dataframe: pd.DataFrame, file_path: str, sheet_name: str = "Sheet1"
+    dataframe: pd.DataFrame,
+    file_path: str,
+    sheet_name: str = "Sheet1",
+    engine: Optional[str] = None,
+    optimize: bool = False,
+    compresslevel: Optional[int] = None,
 ) -> None:  # noqa501
     """
     📤 Exporta um DataFrame para um arquivo Excel.
@@ -28,16 +53,109 @@ def write_excel(
         dataframe (pd.DataFrame): DataFrame a ser exportado.
         file_path (str): Caminho de saída do arquivo Excel.
         sheet_name (str): Nome da planilha.
+        engine (str, optional): "openpyxl" (padrão, cabeçalho formatado
+            pelo pandas), "native" (o mais rápido para valores) ou
+            "xlsxwriter" (streaming com memória constante).
+        optimize (bool): Se True, textos repetidos são gravados uma única
+            vez na tabela de strings compartilhadas e estilos duplicados são
+            unificados (arquivo menor e mais rápido de abrir). O "native" já
+            grava assim; os demais engines passam pelo ``optimize_xlsx``.
+        compresslevel (int, optional): Nível de compressão zip (0-9) do
+            arquivo final.
     """
     try:
-        with pd.ExcelWriter(file_path, engine="openpyxl") as writer:
-            dataframe.to_excel(writer, sheet_name=sheet_name, index=False)
+        engine = engine or DEFAULT_WRITER_ENGINE
+        native = engine == "native"
+        with span("serialize", rows=len(dataframe)):
+            write_excel_with_engine(
+                {sheet_name: dataframe},
+                file_path,
+                engine=engine,
+                compresslevel=(
+                    DEFAULT_COMPRESSLEVEL if compresslevel is None else compresslevel
+                ),
+                shared_strings=optimize,
+            )
+        # O writer nativo já grava strings compartilhadas e estilos únicos.
+        if not native and (optimize or compresslevel is not None):
+            with span("optimize"):
+                optimize_xlsx(
+                    file_path,
+                    shared_strings=optimize,
+                    merge_duplicate_styles=optimize,
+                    compresslevel=compresslevel,
+                )
     except Exception as e:
         raise ValueError(
             f"❌ Erro ao exportar o DataFrame para {file_path}: {str(e)}"
         )  # noqa501
 
 
+@instrumented
+def write_excel_sheets(
+    sheets: Dict[str, pd.DataFrame],
+    file_path: str,
+    workers: Optional[int] = None,
+    engine: Optional[str] = None,
+) -> None:
+    """
+    📤 Exporta vários DataFrames para um arquivo Excel, uma planilha por item.
+
+    O XML de cada planilha é gerado e comprimido em processos paralelos e o
+    arquivo .xlsx é montado em seguida, usando todos os núcleos da máquina.
+    Somente valores são gravados (sem formatação além de datas).
+
+    Args:
+        sheets (Dict[str, pd.DataFrame]): Nome da planilha -> DataFrame, na
+            ordem desejada.
+        file_path (str): Caminho de saída do arquivo Excel.
+        workers (int, optional): Número de processos. Padrão: número de CPUs.
+        engine (str, optional): Engine de escrita (ver ``write_excel``).
+            Padrão: "native", o único que gera as planilhas em paralelo.
+    """
+    try:
+        with span("serialize", rows=count_rows(sheets)):
+            write_excel_with_engine(
+                sheets, file_path, engine=engine or "native", workers=workers
+            )
+    except Exception as e:
+        raise ValueError(f"❌ Erro ao exportar as planilhas para {file_path}: {str(e)}")
+
+
+@instrumented
+def append_rows(
+    file_path: str, sheet_name: Union[str, int], dataframe: pd.DataFrame
+) -> int:
+    """
+    ➕ Acrescenta linhas ao final de uma planilha de um arquivo Excel existente.
+
+    Só o XML da planilha de destino é reescrito: as linhas existentes passam
+    em streaming e as novas são inseridas no final, enquanto os demais
+    arquivos internos do .xlsx são copiados byte a byte, sem descompressão.
+    O custo é proporcional à planilha alterada, e não ao arquivo inteiro.
+
+    Cada coluna é gravada sob a célula do cabeçalho com o mesmo nome, na
+    ordem da planilha; colunas do cabeçalho ausentes no DataFrame ficam
+    vazias e uma coluna que não está no cabeçalho gera erro. Se a planilha
+    estiver vazia, as colunas são gravadas na ordem do DataFrame a partir da
+    coluna A, com o cabeçalho antes.
+
+    Args:
+        file_path (str): Caminho do arquivo Excel existente.
+        sheet_name (str ou int): Nome ou posição da planilha.
+        dataframe (pd.DataFrame): Linhas a acrescentar.
+
+    Returns:
+        int: Número da última linha da planilha após a inclusão.
+    """
+    try:
+        with span("append", rows=len(dataframe), source=file_path):
+            return append_xlsx_rows(file_path, sheet_name, dataframe)
+    except Exception as e:
+        raise ValueError(f"❌ Erro ao acrescentar linhas em {file_path}: {str(e)}")
+
+
+@instrumented
 def write_csv(dataframe: pd.DataFrame, file_path: str) -> None:
     """
     📤 Exporta um DataFrame para um arquivo CSV.
@@ -47,8 +165,89 @@ def write_csv(dataframe: pd.DataFrame, file_path: str) -> None:
         file_path (str): Caminho de saída do arquivo CSV.
     """
     try:
-        dataframe.to_csv(file_path, index=False)
+        with span("serialize", rows=len(dataframe)):
+            dataframe.to_csv(file_path, index=False)
     except Exception as e:
         raise ValueError(
             f"❌ Erro ao exportar o DataFrame para CSV {file_path}: {str(e)}"
         )  # noqa501
+
+
+def _chart_from_spec(
+    spec: Dict[str, Any], ws: Any, columns: List[Any], n_rows: int
+) -> Any:
+    """Monta um gráfico openpyxl a partir de uma especificação."""
+    chart = make_chart(spec.get("type", "bar"))
+    x_col = columns.index(spec.get("x", columns[0])) + 1
+    y_names = spec["y"] if isinstance(spec["y"], (list, tuple)) else [spec["y"]]
+    last_row = n_rows + 1
+
+    categories = Reference(ws, min_col=x_col, min_row=2, max_row=last_row)
+    for name in y_names:
+        y_col = columns.index(name) + 1
+        values = Reference(ws, min_col=y_col, min_row=1, max_row=last_row)
+        if spec.get("type") == "scatter":
+            chart.series.append(Series(values, categories, title_from_data=True))
+        else:
+            chart.add_data(values, titles_from_data=True)
+    if spec.get("type") != "scatter":
+        chart.set_categories(categories)
+
+    chart.title = spec.get("title")
+    chart.style = spec.get("style", 13)
+    if spec.get("x_title") and hasattr(chart, "x_axis"):
+        chart.x_axis.title = spec["x_title"]
+    if spec.get("y_title") and hasattr(chart, "y_axis"):
+        chart.y_axis.title = spec["y_title"]
+    return chart
+
+
+@instrumented
+def write_excel_with_charts(
+    dataframe: pd.DataFrame,
+    file_path: str,
+    charts: List[Dict[str, Any]],
+    sheet_name: str = "Sheet1",
+) -> None:
+    """
+    📊 Exporta um DataFrame e vários gráficos em uma única escrita.
+
+    Os dados são gravados em modo streaming (``write_only``) e todos os
+    gráficos são serializados no mesmo salvamento, sem reabrir o arquivo.
+
+    Args:
+        dataframe (pd.DataFrame): DataFrame a ser exportado.
+        file_path (str): Caminho de saída do arquivo Excel.
+        charts (List[Dict]): Especificações dos gráficos, com as chaves
+            ``type`` ('bar', 'line', 'pie' ou 'scatter'), ``y`` (coluna ou
+            lista de colunas), e opcionalmente ``x`` (padrão: primeira
+            coluna), ``title``, ``x_title``, ``y_title``, ``style`` e
+            ``anchor`` (célula, ex.: "H2"; padrão: à direita dos dados).
+        sheet_name (str): Nome da planilha.
+    """
+    try:
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(sheet_name)
+
+        # Os gráficos são montados antes das linhas para validar as
+        # especificações sem deixar o arquivo pela metade.
+        columns = list(dataframe.columns)
+        built = [_chart_from_spec(spec, ws, columns, len(dataframe)) for spec in charts]
+
+        ws.append([str(column) for column in columns])
+        with span("rows", rows=len(dataframe)):
+            values = dataframe.astype(object).where(dataframe.notna(), None)
+            for row in values.itertuples(index=False, name=None):
+                ws.append(row)
+
+        anchor_column = get_column_letter(len(columns) + 2)
+        for position, (spec, chart) in enumerate(zip(charts, built)):
+            default_anchor = f"{anchor_column}{1 + position * _CHART_ROW_SPAN}"
+            ws.add_chart(chart, spec.get("anchor", default_anchor))
+
+        with span("save"):
+            wb.save(file_path)
+    except Exception as e:
+        raise ValueError(
+            f"❌ Erro ao exportar o DataFrame com gráficos para {file_path}: {str(e)}"
+        )
@@ -6,13 +6,18 @@ import os
 import pytest
 import pandas as pd
 import openpyxl
+from msoffcrypto.format.ooxml import OOXMLFile
 from excel_toolkit_for_py.advanced_features import (
     read_protected_excel,
+    read_protected_excel_batch,
+    iter_protected_excel_chunks,
     validate_empty_cells,
+    validate_empty_cells_chunked,
     apply_conditional_formatting,
     extract_formulas,
     add_chart,
     protect_excel,
+    protect_excel_batch,
 )
 
 # Dados de teste
@@ -50,6 +55,23 @@ def test_validate_empty_cells():
     assert "Cidade" in result["empty_cells"]
     assert len(result["columns_above_threshold"]) > 0
 
+    empty = validate_empty_cells(pd.DataFrame(columns=["Nome"]))
+    assert empty["empty_cells"]["Nome"] == {"count": 0, "percent": 0.0}
+
+
+def test_validate_empty_cells_chunked():
+    """Testa a validação de células vazias em blocos"""
+    df = pd.DataFrame(TEST_DATA)
+    chunks = (df.iloc[start : start + 2] for start in range(0, len(df), 2))
+    result = validate_empty_cells_chunked(chunks)
+
+    expected = validate_empty_cells(df)
+    assert result["empty_cells"] == expected["empty_cells"]
+    assert result["columns_above_threshold"] == expected["columns_above_threshold"]
+    assert [block["rows"] for block in result["blocks"]] == [2, 2, 1]
+    assert result["blocks"][0]["density"] == 0.0
+    assert result["blocks"][1]["density"] == pytest.approx(2 / 6)
+
 
 def test_apply_conditional_formatting():
     """Testa a aplicação de formatação condicional"""
@@ -118,6 +140,9 @@ def test_add_chart():
     # Verifica se o gráfico foi adicionado
     assert len(ws._charts) > 0
 
+    with pytest.raises(ValueError, match="Unsupported chart type"):
+        add_chart(file_path, "area", "A1:B6", "Test Chart", output_file)
+
     os.remove(file_path)
     os.remove(output_file)
 
@@ -150,3 +175,109 @@ def test_read_protected_excel():
     df = read_protected_excel(file_path, password)
     assert isinstance(df, pd.DataFrame)
     assert not df.empty
+
+
+def test_read_protected_excel_from_bytes(tmp_path):
+    """Testa a leitura de um arquivo criptografado recebido em memória"""
+    plain = tmp_path / "plain.xlsx"
+    encrypted = tmp_path / "encrypted.xlsx"
+    pd.DataFrame(TEST_DATA).to_excel(plain, index=False)
+    with open(plain, "rb") as source, open(encrypted, "wb") as target:
+        OOXMLFile(source).encrypt("test123", target)
+
+    df = read_protected_excel(encrypted.read_bytes(), "test123")
+    assert df["Nome"].tolist()[:2] == ["Alice", "Bob"]
+
+    df_fast = read_protected_excel(str(encrypted), "test123", engine="fast")
+    pd.testing.assert_frame_equal(df, df_fast)
+
+    with pytest.raises(ValueError, match="Error reading protected file"):
+        read_protected_excel(str(encrypted), "senha_errada")
+
+
+def test_read_protected_excel_batch_and_chunks(tmp_path):
+    """Testa a leitura em lote e em blocos de arquivos criptografados"""
+    plain = tmp_path / "plain.xlsx"
+    pd.DataFrame(TEST_DATA).to_excel(plain, index=False)
+    folder = tmp_path / "protegidos"
+    folder.mkdir()
+    for name in ("a.xlsx", "b.xlsx"):
+        with open(plain, "rb") as source, open(folder / name, "wb") as target:
+            OOXMLFile(source).encrypt("test123", target)
+
+    frames = read_protected_excel_batch(str(folder), "test123", workers=2)
+    assert list(frames) == [str(folder / "a.xlsx"), str(folder / "b.xlsx")]
+    assert all(df["Nome"].tolist()[:2] == ["Alice", "Bob"] for df in frames.values())
+
+    chunks = list(
+        iter_protected_excel_chunks(str(folder / "a.xlsx"), "test123", chunksize=2)
+    )
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert pd.concat(chunks)["Cidade"].tolist()[:3] == ["SP", "RJ", "BH"]
+
+    with pytest.raises(ValueError):
+        read_protected_excel_batch([str(folder / "a.xlsx")], "senha_errada")
+
+
+def test_read_protected_excel_reuses_password_hash(tmp_path, monkeypatch):
+    """Testa se o hash da senha é derivado uma vez para arquivos com o mesmo sal"""
+    from collections import OrderedDict
+
+    from msoffcrypto.method.ecma376_agile import ECMA376Agile
+
+    from excel_toolkit_for_py import advanced_features
+
+    plain = tmp_path / "plain.xlsx"
+    pd.DataFrame(TEST_DATA).to_excel(plain, index=False)
+    paths = [tmp_path / "a.xlsx", tmp_path / "b.xlsx"]
+    for path in paths:
+        with open(plain, "rb") as source:
+            path.write_bytes(
+                ECMA376Agile.encrypt("test123", source, salt_value=b"s" * 16)
+            )
+
+    derive = ECMA376Agile._derive_iterated_hash_from_password
+    calls = []
+
+    def counting(*args):
+        calls.append(args)
+        return derive(*args)
+
+    monkeypatch.setattr(
+        ECMA376Agile, "_derive_iterated_hash_from_password", staticmethod(counting)
+    )
+    monkeypatch.setattr(advanced_features, "_derived_keys", OrderedDict())
+    frames = read_protected_excel_batch(
+        [str(path) for path in paths], "test123", workers=1
+    )
+    assert len(calls) == 1
+    assert all(df["Nome"].tolist()[:2] == ["Alice", "Bob"] for df in frames.values())
+
+    with pytest.raises(ValueError, match="Key verification failed"):
+        read_protected_excel(str(paths[0]), "senha_errada")
+    assert len(calls) == 2
+
+
+def test_protect_excel_encrypt_and_batch(tmp_path):
+    """Testa a criptografia completa e a proteção em lote"""
+    plain = tmp_path / "plain.xlsx"
+    pd.DataFrame(TEST_DATA).to_excel(plain, index=False)
+
+    encrypted = tmp_path / "encrypted.xlsx"
+    protect_excel(str(plain), "test123", str(encrypted), mode="encrypt")
+    df = read_protected_excel(str(encrypted), "test123")
+    assert df["Nome"].tolist()[:2] == ["Alice", "Bob"]
+
+    folder = tmp_path / "entrada"
+    folder.mkdir()
+    for name in ("a.xlsx", "b.xlsx"):
+        (folder / name).write_bytes(plain.read_bytes())
+    outputs = protect_excel_batch(
+        str(folder), "test123", output_dir=str(tmp_path / "saida"), workers=2
+    )
+    assert [os.path.basename(path) for path in outputs] == ["a.xlsx", "b.xlsx"]
+    frames = read_protected_excel_batch(outputs, "test123", workers=1)
+    assert all(len(df) == 5 for df in frames.values())
+
+    with pytest.raises(ValueError, match="Unknown protection mode"):
+        protect_excel(str(plain), "test123", mode="invalido")
@@ -0,0 +1,95 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import threading
+import time
+
+import pandas as pd
+import pytest
+from excel_toolkit_for_py import aio
+
+
+@pytest.fixture(autouse=True)
+def pools():
+    aio.configure(workers=2, max_concurrency=2)
+    yield
+    aio.shutdown()
+
+
+@pytest.fixture
+def sample_excel_file(tmp_path):
+    file_path = tmp_path / "dados.xlsx"
+    df = pd.DataFrame({"id": range(25), "valor": [i * 1.5 for i in range(25)]})
+    df.to_excel(file_path, index=False)
+    return file_path
+
+
+# ⚡ ✅ Teste: leitura e conversão assíncronas dão o mesmo resultado
+def test_async_read_and_convert(sample_excel_file, tmp_path):
+    async def main():
+        df = await aio.read_excel(str(sample_excel_file), sheet_name=0, engine="fast")
+        csv_path = tmp_path / "dados.csv"
+        await aio.excel_to_csv(sample_excel_file, csv_path)
+        validation = await aio.validate_csv(csv_path)
+        return df, validation
+
+    df, validation = asyncio.run(main())
+    assert df["id"].tolist() == list(range(25))
+    assert validation["valid"] and validation["info"]["linhas"] == 25
+
+
+# ⚡ ✅ Teste: erros das funções síncronas chegam ao chamador
+def test_async_errors_propagate(tmp_path):
+    with pytest.raises(ValueError):
+        asyncio.run(aio.read_excel(str(tmp_path / "inexistente.xlsx")))
+
+
+# ⚡ ✅ Teste: blocos chegam por iterador assíncrono
+def test_async_chunk_iterator(sample_excel_file):
+    async def main():
+        return [
+            len(chunk)
+            async for chunk in aio.iter_excel_chunks(sample_excel_file, chunksize=10)
+        ]
+
+    assert asyncio.run(main()) == [10, 10, 5]
+
+
+# ⚡ ✅ Teste: o limite de concorrência é respeitado
+def test_concurrency_limit():
+    active, peak = [0], [0]
+    guard = threading.Lock()
+
+    def work():
+        with guard:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with guard:
+            active[0] -= 1
+
+    async def main():
+        await asyncio.gather(*(aio.run_in_thread(work) for _ in range(6)))
+
+    asyncio.run(main())
+    assert peak[0] == 2
+
+
+# ⚡ ✅ Teste: cancelamento libera a vaga para as próximas chamadas
+def test_cancellation_releases_slot():
+    async def main():
+        slow = [asyncio.ensure_future(aio.run_in_thread(time.sleep, 0.5))]
+        slow.append(asyncio.ensure_future(aio.run_in_thread(time.sleep, 0.5)))
+        await asyncio.sleep(0.05)
+        for task in slow:
+            task.cancel()
+        start = time.perf_counter()
+        await aio.run_in_thread(lambda: None)
+        return time.perf_counter() - start, [task.cancelled() for task in slow]
+
+    elapsed, cancelled = asyncio.run(main())
+    assert cancelled == [True, True]
+    assert elapsed < 0.4
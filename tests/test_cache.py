@@ -0,0 +1,107 @@
+"""
+Testes para o cache em disco de planilhas Excel.
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from excel_toolkit_for_py.cache import ExcelCache
+from excel_toolkit_for_py.reader import get_dict_sheets, read_excel
+
+
+@pytest.fixture
+def sample_excel_file(tmp_path):
+    """Fixture com um arquivo Excel de duas planilhas."""
+    file_path = tmp_path / "reference.xlsx"
+    with pd.ExcelWriter(file_path, engine="openpyxl") as writer:
+        pd.DataFrame({"A": [1, 2, 3], "B": ["x", "y", "z"]}).to_excel(
+            writer, sheet_name="Sheet1", index=False
+        )
+        pd.DataFrame({"C": [1.5, None, 2.0]}).to_excel(
+            writer, sheet_name="Sheet2", index=False
+        )
+    return file_path
+
+
+def test_read_excel_cached_matches_uncached(sample_excel_file, tmp_path):
+    """Testa se a leitura em cache retorna os mesmos dados."""
+    cache = ExcelCache(tmp_path / "cache")
+    expected = read_excel(sample_excel_file, sheet_name="Sheet1")
+
+    first = read_excel(sample_excel_file, sheet_name="Sheet1", cache=cache)
+    second = read_excel(sample_excel_file, sheet_name="Sheet1", cache=cache)
+
+    pd.testing.assert_frame_equal(expected, first)
+    pd.testing.assert_frame_equal(expected, second)
+    assert cache.size() > 0
+
+
+def test_get_dict_sheets_cached(sample_excel_file, tmp_path):
+    """Testa a leitura de todas as planilhas através do cache."""
+    cache = ExcelCache(tmp_path / "cache")
+    get_dict_sheets(sample_excel_file, cache=cache)
+    sheets = get_dict_sheets(sample_excel_file, cache=cache)
+
+    assert list(sheets) == ["Sheet1", "Sheet2"]
+    assert sheets["Sheet2"]["C"].isna().sum() == 1
+
+
+def test_cache_invalidated_when_file_changes(sample_excel_file, tmp_path):
+    """Testa se uma alteração no arquivo invalida o cache."""
+    cache = ExcelCache(tmp_path / "cache")
+    read_excel(sample_excel_file, sheet_name="Sheet1", cache=cache)
+
+    pd.DataFrame({"A": [9]}).to_excel(sample_excel_file, index=False)
+    stat = os.stat(sample_excel_file)
+    os.utime(sample_excel_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    df = read_excel(sample_excel_file, sheet_name="Sheet1", cache=cache)
+    assert df["A"].tolist() == [9]
+
+
+def test_cache_evicts_least_recently_used(sample_excel_file, tmp_path):
+    """Testa a remoção LRU quando o limite de bytes é excedido."""
+    cache = ExcelCache(tmp_path / "cache", max_bytes=1)
+    read_excel(sample_excel_file, sheet_name="Sheet1", cache=cache)
+
+    assert cache.size() == 0
+
+
+def test_cache_typed_headers_and_memory_map(tmp_path):
+    """Testa cabeçalhos não textuais e colunas numéricas mapeadas em memória."""
+    import numpy as np
+
+    df = pd.DataFrame(
+        {pd.Timestamp("2024-01-31"): [1.5, 2.5], 2024: [1, 2], "Nome": ["a", "b"]}
+    )
+    target = tmp_path / "sheet"
+    ExcelCache._store_sheet(df, target)
+    # Uma segunda gravação concorrente do mesmo destino é descartada
+    ExcelCache._store_sheet(df, target)
+    assert [p.name for p in tmp_path.iterdir()] == ["sheet"]
+
+    loaded = ExcelCache._load_sheet(target)
+    pd.testing.assert_frame_equal(loaded, df)
+
+    if not (target / "data.feather").exists():
+        values = loaded[2024].to_numpy()
+        while not isinstance(values, np.memmap) and values.base is not None:
+            values = values.base
+        assert isinstance(values, np.memmap)
+        # Alterações no DataFrame não chegam ao arquivo do cache
+        loaded.iloc[0, 1] = 99
+        assert ExcelCache._load_sheet(target).iloc[0, 1] == 1
+
+
+def test_cache_store_reraises_os_errors(tmp_path, monkeypatch):
+    """Testa se erros de disco (fora da corrida de gravação) são propagados."""
+
+    def fail(src, dst):
+        raise PermissionError(13, "Permission denied")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(PermissionError):
+        ExcelCache._store_sheet(pd.DataFrame({"A": [1]}), tmp_path / "sheet")
+    assert list(tmp_path.iterdir()) == []
@@ -5,7 +5,18 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 import pytest
 import pandas as pd
-from excel_toolkit_for_py.conversions import excel_to_json, json_to_excel
+import base64
+import gzip
+import json
+import numpy as np
+from excel_toolkit_for_py.conversions import (
+    excel_to_json,
+    excel_to_json_file,
+    iter_excel_to_json,
+    json_stream_to_excel,
+    json_to_excel,
+)
+from excel_toolkit_for_py.native_writer import write_xlsx_stream
 
 
 @pytest.fixture
@@ -39,6 +50,96 @@ def test_json_to_excel(sample_json_data, tmp_path):
     assert result == sample_json_data
 
 
+# 🔄 ✅ Teste: JSON (várias planilhas) -> Excel com cada engine de escrita
+@pytest.mark.parametrize("engine", ["native", "xlsxwriter", "openpyxl"])
+def test_json_to_excel_engines(sample_json_data, tmp_path, engine):
+    file_path = tmp_path / f"output_{engine}.xlsx"
+    json_to_excel(
+        {"A": sample_json_data, "B": sample_json_data[:1]}, file_path, engine=engine
+    )
+
+    sheets = pd.read_excel(file_path, sheet_name=None)
+    assert list(sheets) == ["A", "B"]
+    assert sheets["A"].to_dict(orient="records") == sample_json_data
+
+    with pytest.raises(ValueError, match="Unknown writer engine"):
+        json_to_excel(sample_json_data, file_path, engine="csv")
+
+
+# 🔄 ✅ Teste: Excel -> JSON compacto (columns/split, arrays tipados, gzip)
+def test_excel_to_json_orients(sample_excel_file, tmp_path):
+    columns = excel_to_json(sample_excel_file, orient="columns")
+    assert columns == {"Nome": ["Alice", "Bob"], "Idade": [30, 25]}
+
+    typed = excel_to_json(sample_excel_file, orient="columns", typed_arrays=True)
+    assert typed["Nome"] == ["Alice", "Bob"]
+    idade = typed["Idade"]
+    values = np.frombuffer(base64.b64decode(idade["data"]), dtype=idade["dtype"])
+    assert values.tolist() == [30, 25]
+
+    # 🧩 "split" no formato do pandas: dados linha a linha
+    split = excel_to_json(sample_excel_file, orient="split")
+    df = pd.read_excel(sample_excel_file)
+    assert split == json.loads(df.to_json(orient="split", index=False))
+    split_path = tmp_path / "split.json"
+    excel_to_json_file(sample_excel_file, split_path, sheet_name=0, orient="split")
+    assert json.loads(split_path.read_text(encoding="utf-8")) == split
+    with pytest.raises(ValueError, match="typed_arrays"):
+        excel_to_json(sample_excel_file, orient="split", typed_arrays=True)
+
+    output = tmp_path / "dados.json.gz"
+    excel_to_json_file(
+        sample_excel_file, output, sheet_name="Sheet1", compression="gzip"
+    )
+    with gzip.open(output, "rt", encoding="utf-8") as f:
+        assert json.load(f) == columns
+
+    with pytest.raises(ValueError, match="orient inválido"):
+        excel_to_json(sample_excel_file, orient="index")
+
+
+# 🔄 ✅ Teste: Excel -> JSON em streaming (registros e NDJSON)
+def test_iter_excel_to_json(sample_excel_file, sample_json_data):
+    records = iter_excel_to_json(sample_excel_file, chunksize=1)
+    assert list(records) == sample_json_data
+
+    lines = list(iter_excel_to_json(sample_excel_file, ndjson=True))
+    assert [json.loads(line) for line in lines] == sample_json_data
+
+
+# 🔄 ✅ Teste: NDJSON com separadores Unicode dentro das células
+def test_iter_excel_to_json_unicode_separators(tmp_path):
+    file_path = tmp_path / "separadores.xlsx"
+    values = ["x\u2028y", "a\x85b", "c\u2029d"]
+    pd.DataFrame({"a": values}).to_excel(file_path, index=False)
+    lines = list(iter_excel_to_json(file_path, ndjson=True))
+    assert [json.loads(line)["a"] for line in lines] == values
+
+
+# 🔄 ✅ Teste: registros / NDJSON -> Excel em lotes
+def test_json_stream_to_excel(sample_json_data, tmp_path):
+    file_path = tmp_path / "stream.xlsx"
+    records = ({"Nome": f"P{i}", "Idade": i} for i in range(25))
+    json_stream_to_excel(records, file_path, batch_size=10)
+    df = pd.read_excel(file_path)
+    assert len(df) == 25
+    assert df["Idade"].tolist() == list(range(25))
+
+    ndjson_path = tmp_path / "dados.ndjson"
+    ndjson_path.write_text("\n".join(json.dumps(r) for r in sample_json_data))
+    json_stream_to_excel(str(ndjson_path), file_path, batch_size=1)
+    assert pd.read_excel(file_path).to_dict(orient="records") == sample_json_data
+
+    with pytest.raises(ValueError, match="❌ Erro ao converter JSON para Excel"):
+        json_stream_to_excel([{"a": 1}, {"b": 2}], file_path, batch_size=1)
+    assert not os.path.exists(file_path)
+
+    # 📁 Diretório inexistente: o erro da abertura não é mascarado pela limpeza
+    with pytest.raises(FileNotFoundError) as info:
+        write_xlsx_stream([pd.DataFrame(sample_json_data)], tmp_path / "x" / "y.xlsx")
+    assert info.value.__context__ is None
+
+
 # 🚨 ❌ Teste: Erro ao converter JSON inválido
 def test_json_to_excel_invalid_data(tmp_path):
     file_path = tmp_path / "invalid.xlsx"
@@ -0,0 +1,80 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import shutil
+
+import pandas as pd
+import pytest
+from excel_toolkit_for_py import diff
+from excel_toolkit_for_py.diff import diff_excel, iter_diff
+from excel_toolkit_for_py.writer import write_excel_sheets
+
+
+@pytest.fixture
+def versions(tmp_path):
+    """📁 Duas versões de uma pasta de trabalho compartilhada."""
+    old = {
+        "Vendas": pd.DataFrame(
+            {"id": [1, 2, 3, 4], "valor": [10.5, 20.5, 30.5, 40.5], "obs": list("abcd")}
+        ),
+        "Antiga": pd.DataFrame({"x": [1]}),
+    }
+    new = {
+        "Vendas": pd.DataFrame(
+            {"id": [1, 3, 4, 5], "valor": [10.5, 35.5, 40.5, 50.5], "obs": list("acDe")}
+        ),
+        "Nova": pd.DataFrame({"x": [1]}),
+    }
+    old_path, new_path = tmp_path / "ontem.xlsx", tmp_path / "hoje.xlsx"
+    write_excel_sheets(old, str(old_path))
+    write_excel_sheets(new, str(new_path))
+    return str(old_path), str(new_path)
+
+
+# 🔑 ✅ Teste: alinhamento por chave
+def test_iter_diff_by_key(versions):
+    changes = [
+        (c.sheet, c.kind, c.key, c.column, c.old, c.new)
+        for c in iter_diff(*versions, key="id", chunksize=2)
+    ]
+    assert changes == [
+        ("Vendas", "added_row", 5, None, None, {"id": 5, "valor": 50.5, "obs": "e"}),
+        ("Vendas", "removed_row", 2, None, {"id": 2, "valor": 20.5, "obs": "b"}, None),
+        ("Vendas", "changed_cell", 3, "valor", 30.5, 35.5),
+        ("Vendas", "changed_cell", 4, "obs", "d", "D"),
+        ("Antiga", "removed_sheet", None, None, None, None),
+        ("Nova", "added_sheet", None, None, None, None),
+    ]
+
+
+# 📍 Teste: alinhamento por posição e saída NDJSON em streaming
+def test_diff_excel_by_position(versions, tmp_path):
+    output = tmp_path / "diff.ndjson"
+    summary = diff_excel(*versions, sheets=["Vendas"], output=str(output))
+    assert summary == {"Vendas": {"changed_cells": 9, "changed_rows": 3}}
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(lines) == 9
+    assert lines[0] == {
+        "sheet": "Vendas",
+        "kind": "changed_cell",
+        "row": 1,
+        "column": "id",
+        "old": 2,
+        "new": 3,
+        "key": None,
+    }
+
+
+# ⚡ Teste: planilhas idênticas (mesmo CRC) não são lidas
+def test_identical_sheets_are_skipped(versions, tmp_path, monkeypatch):
+    copy = tmp_path / "copia.xlsx"
+    shutil.copyfile(versions[0], copy)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("sheet parsed")
+
+    monkeypatch.setattr(diff, "_iter_sheet", fail)
+    assert list(iter_diff(versions[0], str(copy), key="id")) == []
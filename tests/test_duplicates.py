@@ -0,0 +1,65 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+import pytest
+from excel_toolkit_for_py.duplicates import find_duplicates, row_hashes
+from excel_toolkit_for_py.validations import validate_duplicates
+
+
+@pytest.fixture
+def vendor_files(tmp_path):
+    """📁 Um .xlsx e um .csv com registros repetidos entre si."""
+    excel_path = tmp_path / "fornecedor_a.xlsx"
+    csv_path = tmp_path / "fornecedor_b.csv"
+    pd.DataFrame(
+        {"Codigo": [1, 2, 3, 2, 5], "Nome": ["a", "b", "c", "b", "e"]}
+    ).to_excel(excel_path, index=False)
+    # Códigos com nulos viram float no CSV e ainda assim batem com os inteiros
+    pd.DataFrame({"Codigo": [1.0, 9.0, np.nan], "Nome": ["a", "z", None]}).to_csv(
+        csv_path, index=False
+    )
+    return str(excel_path), str(csv_path)
+
+
+# 🔁 ✅ Teste: duplicatas dentro do arquivo e entre arquivos
+@pytest.mark.parametrize("memory_limit", [None, 16])
+def test_find_duplicates(vendor_files, tmp_path, memory_limit):
+    report = find_duplicates(
+        list(vendor_files),
+        chunksize=2,
+        memory_limit=memory_limit,
+        partitions=4,
+        temp_dir=str(tmp_path),
+    )
+    assert report.rows == 8
+    assert report.duplicate_rows == 2
+    assert report.groups == 2
+    assert report.counts == [1, 1]
+    locations = report.locations.sort_values(["group", "first"], ascending=[1, 0])
+    assert list(zip(locations["source"].map(os.path.basename), locations["row"])) == [
+        ("fornecedor_a.xlsx", 0),
+        ("fornecedor_b.csv", 0),
+        ("fornecedor_a.xlsx", 1),
+        ("fornecedor_a.xlsx", 3),
+    ]
+    # 🧹 Partições temporárias são removidas
+    assert sorted(os.listdir(tmp_path)) == ["fornecedor_a.xlsx", "fornecedor_b.csv"]
+
+
+# 🔑 Teste: chaves repetidas e hashes independentes do dtype
+def test_key_duplicates(vendor_files):
+    result = validate_duplicates(vendor_files[0], subset=["Nome"])
+    assert result["valid"] is False
+    assert result["duplicates"]["duplicadas"] == 1
+    assert result["errors"] == [
+        f"⚠️ 1 chave(s) ['Nome'] duplicada(s) em '{vendor_files[0]}'"
+    ]
+    assert validate_duplicates(vendor_files[1])["valid"] is True
+
+    ints = pd.DataFrame({"k": pd.array([1, 2], dtype="Int64")})
+    floats = pd.DataFrame({"k": [1.0, 2.0]})
+    assert (row_hashes(ints) == row_hashes(floats)).all()
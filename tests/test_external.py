@@ -0,0 +1,115 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+import pytest
+from excel_toolkit_for_py.conversions import csv_to_excel
+from excel_toolkit_for_py.external import external_groupby, external_sort
+
+
+@pytest.fixture
+def vendas():
+    """🧾 Vendas com chaves repetidas, textos e valores ausentes."""
+    rng = np.random.default_rng(7)
+    n = 5_000
+    df = pd.DataFrame(
+        {
+            "loja": rng.integers(0, 300, n),
+            "regiao": rng.choice(["norte", "sul", "leste", None], n),
+            "total": rng.normal(100, 20, n).round(2),
+        }
+    )
+    df.loc[::37, "total"] = np.nan
+    return df
+
+
+def _blocos(df, tamanho=700):
+    return (df.iloc[i : i + tamanho] for i in range(0, len(df), tamanho))
+
+
+# 🔃 ✅ Teste: ordenação externa igual à do pandas (estável), com e sem spill
+@pytest.mark.parametrize("run_rows", [10**6, 1_200, 300])
+def test_external_sort(vendas, tmp_path, run_rows):
+    partes = external_sort(
+        _blocos(vendas),
+        ["regiao", "loja"],
+        ascending=[True, False],
+        run_rows=run_rows,
+        batch_size=250,
+        temp_dir=str(tmp_path),
+    )
+    resultado = pd.concat(list(partes), ignore_index=True)
+    esperado = vendas.sort_values(
+        ["regiao", "loja"], ascending=[True, False], kind="stable"
+    ).reset_index(drop=True)
+    pd.testing.assert_frame_equal(resultado, esperado)
+    # 🧹 Arquivos temporários removidos ao final
+    assert os.listdir(tmp_path) == []
+
+
+# 📊 ✅ Teste: agrupamento com agregações parciais e partições em disco
+@pytest.mark.parametrize("run_rows", [10**6, 200])
+def test_external_groupby(vendas, tmp_path, run_rows):
+    partes = external_groupby(
+        _blocos(vendas),
+        ["loja", "regiao"],
+        {"total": ["sum", "mean", "count", "min", "max", "first"]},
+        run_rows=run_rows,
+        batch_size=100,
+        partitions=8,
+        temp_dir=str(tmp_path),
+    )
+    resultado = pd.concat(list(partes), ignore_index=True)
+    esperado = (
+        vendas.groupby(["loja", "regiao"], dropna=False)["total"]
+        .agg(["sum", "mean", "count", "min", "max", "first"])
+        .add_prefix("total_")
+        .reset_index()
+    )
+    pd.testing.assert_frame_equal(resultado, esperado, check_dtype=False)
+    assert os.listdir(tmp_path) == []
+
+    contagem = pd.concat(list(external_groupby(_blocos(vendas), "regiao")))
+    assert contagem["size"].sum() == len(vendas)
+
+    with pytest.raises(ValueError):
+        external_groupby(_blocos(vendas), "loja", {"total": "median"})
+
+
+# 📄 ✅ Teste: csv_to_excel ordenado e agrupado em streaming
+def test_csv_to_excel_sorted_and_grouped(vendas, tmp_path):
+    csv_path = tmp_path / "vendas.csv"
+    vendas.to_csv(csv_path, index=False)
+
+    ordenado = tmp_path / "ordenado.xlsx"
+    csv_to_excel(csv_path, ordenado, sort_by="total", chunksize=500, run_rows=1_000)
+    df = pd.read_excel(ordenado)
+    assert len(df) == len(vendas)
+    assert df["total"].dropna().is_monotonic_increasing
+    assert df["total"].isna().sum() == vendas["total"].isna().sum()
+
+    resumo = tmp_path / "resumo.xlsx"
+    csv_to_excel(
+        csv_path,
+        resumo,
+        group_by="regiao",
+        agg={"total": "sum", "loja": "count"},
+        sort_by="total",
+        ascending=False,
+        chunksize=500,
+        run_rows=1_000,
+    )
+    df = pd.read_excel(resumo)
+    esperado = (
+        vendas.groupby("regiao", dropna=False)
+        .agg(total=("total", "sum"), loja=("loja", "count"))
+        .sort_values("total", ascending=False)
+    )
+    assert df["total"].round(2).tolist() == esperado["total"].round(2).tolist()
+    assert df["loja"].tolist() == esperado["loja"].tolist()
+
+    with pytest.raises(ValueError):
+        csv_to_excel(csv_path, resumo, group_by="regiao", writer_engine="openpyxl")
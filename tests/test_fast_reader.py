@@ -0,0 +1,131 @@
+"""
+Testes para o leitor rápido de arquivos .xlsx (engine="fast").
+"""
+
+import pandas as pd
+import pytest
+
+from excel_toolkit_for_py.conversions import excel_to_json
+from excel_toolkit_for_py.fast_reader import iter_excel_chunks, read_excel_fast
+from excel_toolkit_for_py.reader import read_excel
+from excel_toolkit_for_py.validations import validate_excel
+
+
+@pytest.fixture
+def sample_excel_file(tmp_path):
+    """Fixture com tipos mistos, valores nulos e datas."""
+    file_path = tmp_path / "sample.xlsx"
+    df = pd.DataFrame(
+        {
+            "Nome": ["Alice", "Bob", None, "Eva"],
+            "Idade": [25, 30, 35, 40],
+            "Salario": [5000.5, None, 3000.0, 4000.0],
+            "Ativo": [True, False, True, True],
+            "Admissao": pd.to_datetime(
+                ["2020-01-01 10:30:00", "2021-06-15 00:00:00", None, "1900-02-01"],
+                format="mixed",
+            ),
+            "Misto": [1, "a", 2.5, None],
+        }
+    )
+    with pd.ExcelWriter(file_path, engine="openpyxl") as writer:
+        df.to_excel(writer, sheet_name="Dados", index=False)
+        df.head(2).to_excel(writer, sheet_name="Resumo", index=False)
+    return file_path
+
+
+def test_fast_engine_matches_openpyxl(sample_excel_file):
+    """Testa se o engine rápido produz o mesmo DataFrame que o openpyxl."""
+    expected = read_excel(sample_excel_file, sheet_name="Dados")
+    result = read_excel(sample_excel_file, sheet_name="Dados", engine="fast")
+
+    pd.testing.assert_frame_equal(expected, result)
+
+
+def test_fast_engine_all_sheets(sample_excel_file):
+    """Testa a leitura de todas as planilhas e por posição."""
+    sheets = read_excel_fast(sample_excel_file, sheet_name=None)
+
+    assert list(sheets) == ["Dados", "Resumo"]
+    assert len(sheets["Resumo"]) == 2
+    pd.testing.assert_frame_equal(
+        read_excel_fast(sample_excel_file, sheet_name=1), sheets["Resumo"]
+    )
+
+
+def test_fast_engine_missing_sheet(sample_excel_file):
+    """Testa o erro ao pedir uma planilha inexistente."""
+    with pytest.raises(ValueError, match="Inexistente"):
+        read_excel(sample_excel_file, sheet_name="Inexistente", engine="fast")
+
+
+def test_fast_engine_in_conversions_and_validations(sample_excel_file):
+    """Testa o engine rápido em excel_to_json e validate_excel."""
+    records = excel_to_json(sample_excel_file, sheet_name="Resumo", engine="fast")
+    assert records[0]["Nome"] == "Alice"
+
+    result = validate_excel(sample_excel_file, sheet_name="Dados", engine="fast")
+    assert result["valid"] is True
+    assert result["info"]["linhas"] == 4
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"skiprows": [4]}, {"skiprows": 2}, {"nrows": 3}, {"skiprows": 2, "nrows": 4}],
+)
+def test_fast_engine_blank_rows(tmp_path, options):
+    """Testa se linhas em branco no meio da planilha são mantidas como no pandas."""
+    import openpyxl
+
+    file_path = tmp_path / "brancos.xlsx"
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["Nome", "Valor"])
+    ws.append(["a", 1])
+    ws.append([])
+    ws["A5"] = "b"
+    ws["B7"] = 3
+    ws["A9"].number_format = "0.00"  # célula só com estilo no final
+    wb.save(file_path)
+
+    expected = pd.read_excel(file_path, **options)
+    pd.testing.assert_frame_equal(
+        read_excel_fast(file_path, **options), expected, check_dtype=False
+    )
+    chunks = list(iter_excel_chunks(file_path, chunksize=2, **options))
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks, ignore_index=True), expected, check_dtype=False
+    )
+
+
+def test_fast_engine_parse_dates_bool(sample_excel_file):
+    """Testa parse_dates booleano: sem coluna de índice, nada é convertido."""
+    for value in (True, False):
+        pd.testing.assert_frame_equal(
+            read_excel_fast(sample_excel_file, parse_dates=value),
+            read_excel_fast(sample_excel_file),
+        )
+
+
+def test_fast_engine_large_whole_numbers(tmp_path):
+    """Testa se inteiros fora do intervalo do int64 continuam float."""
+    file_path = tmp_path / "large.xlsx"
+    pd.DataFrame({"a": [1e20, 2.0], "b": [1e20, "x"]}).to_excel(file_path, index=False)
+    result = read_excel_fast(file_path)
+    assert result["a"].dtype == "float64"
+    assert result["a"].tolist() == [1e20, 2.0]
+    assert result["b"].tolist() == [1e20, "x"]
+
+
+def test_fast_engine_na_values_and_dtype(tmp_path):
+    """Testa os na_values padrão e dtype com colunas fora de usecols."""
+    file_path = tmp_path / "na.xlsx"
+    pd.DataFrame(
+        {"a": ["x", "NA", "null", " NA"], "b": ["N/A", "y", "", "z"], "c": [1, 2, 3, 4]}
+    ).to_excel(file_path, index=False)
+    pd.testing.assert_frame_equal(read_excel_fast(file_path), pd.read_excel(file_path))
+
+    options = {"usecols": ["a", "c"], "dtype": {"b": str, "c": "float64"}}
+    pd.testing.assert_frame_equal(
+        read_excel_fast(file_path, **options), pd.read_excel(file_path, **options)
+    )
@@ -0,0 +1,88 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+import pytest
+from excel_toolkit_for_py import instrumentation
+from excel_toolkit_for_py.conversions import csv_to_excel
+from excel_toolkit_for_py.instrumentation import (
+    add_span_callback,
+    profile,
+    remove_span_callback,
+    span,
+)
+from excel_toolkit_for_py.reader import read_excel
+
+
+@pytest.fixture
+def sample_csv(tmp_path):
+    path = tmp_path / "dados.csv"
+    pd.DataFrame({"Nome": ["Alice", "Bob", "Carol"], "Idade": [30, 25, 41]}).to_csv(
+        path, index=False
+    )
+    return path
+
+
+# 🔬 ✅ Teste: profile coleta as fases aninhadas com linhas e bytes
+def test_profile_collects_nested_spans(sample_csv, tmp_path):
+    with profile() as report:
+        csv_to_excel(sample_csv, tmp_path / "dados.xlsx")
+
+    spans = {item.name: item for item in report.spans}
+    assert set(spans) == {
+        "csv_to_excel",
+        "csv_to_excel/parse",
+        "csv_to_excel/serialize",
+    }
+    assert spans["csv_to_excel/parse"].rows == 3
+    assert spans["csv_to_excel/parse"].bytes == os.path.getsize(sample_csv)
+    assert spans["csv_to_excel/serialize"].depth == 1
+    assert spans["csv_to_excel"].duration >= spans["csv_to_excel/serialize"].duration
+    assert "csv_to_excel/parse" in str(report)
+    assert set(report.totals()) == set(spans)
+
+
+# 🔬 ✅ Teste: callbacks recebem os spans, inclusive os que falharam
+def test_span_callback_receives_errors(tmp_path):
+    received = []
+    add_span_callback(received.append)
+    try:
+        with pytest.raises(ValueError):
+            read_excel(tmp_path / "inexistente.xlsx")
+    finally:
+        remove_span_callback(received.append)
+
+    assert [item.name for item in received] == ["read_excel/parse", "read_excel"]
+    assert received[-1].error == "ValueError"
+    assert received[0].error == "FileNotFoundError"
+
+
+# 🔬 ✅ Teste: falhas em callbacks viram avisos e não interrompem a função
+def test_span_callback_errors_are_isolated(sample_csv, tmp_path):
+    received = []
+
+    def falha(item):
+        raise RuntimeError("callback quebrado")
+
+    add_span_callback(falha)
+    add_span_callback(received.append)
+    try:
+        with pytest.warns(RuntimeWarning, match="callback quebrado"):
+            csv_to_excel(sample_csv, tmp_path / "dados.xlsx")
+    finally:
+        remove_span_callback(falha)
+        remove_span_callback(received.append)
+
+    assert os.path.exists(tmp_path / "dados.xlsx")
+    assert received[-1].name == "csv_to_excel"
+    assert received[-1].error is None
+
+
+# 🔬 ✅ Teste: sem ouvintes, os spans são um objeto nulo compartilhado
+def test_disabled_spans_are_noops():
+    assert not instrumentation.enabled()
+    with span("fase") as phase:
+        phase.record(rows=10)
+    assert phase is instrumentation._NULL_SPAN
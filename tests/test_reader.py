@@ -1,3 +1,5 @@
+import io
+import mmap
 import os
 import sys
 
@@ -8,7 +10,13 @@ sys.path.insert(
 import pandas as pd  # noqa
 import pytest  # noqa
 
-from excel_toolkit_for_py.reader import read_csv, read_excel  # noqa
+from excel_toolkit_for_py.parallel_csv import read_csv_parallel  # noqa
+from excel_toolkit_for_py.reader import (  # noqa
+    probe_excel,
+    read_csv,
+    read_excel,
+    read_many,
+)
 
 
 def test_read_excel(tmp_path):
@@ -30,3 +38,232 @@ def test_read_csv(tmp_path):
 
     df_read = read_csv(file_path)
     pd.testing.assert_frame_equal(df, df_read)
+
+
+@pytest.mark.parametrize("engine", ["openpyxl", "fast"])
+def test_read_excel_projection(tmp_path, engine):
+    """Testa usecols, nrows, skiprows e dtype na leitura de Excel."""
+    file_path = tmp_path / "wide.xlsx"
+    df = pd.DataFrame({f"col{i}": range(i, i + 5) for i in range(8)})
+    df.to_excel(file_path, index=False)
+
+    df_read = read_excel(
+        file_path,
+        sheet_name=0,
+        engine=engine,
+        usecols=["col1", "col6"],
+        nrows=3,
+        skiprows=[2],
+        dtype={"col1": "float64"},
+    )
+
+    assert list(df_read.columns) == ["col1", "col6"]
+    assert df_read["col1"].tolist() == [1.0, 3.0, 4.0]
+    assert df_read["col6"].dtype == "int64"
+
+
+def test_read_csv_projection_and_downcast(tmp_path):
+    """Testa a projeção de colunas e o downcast de tipos na leitura de CSV."""
+    file_path = tmp_path / "test.csv"
+    df = pd.DataFrame(
+        {
+            "A": [1, 2, 3, 4],
+            "B": ["sp", "rj", "sp", "sp"],
+            "C": [0.5, 1.5, 2.5, 3.5],
+            "D": ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"],
+        }
+    )
+    df.to_csv(file_path, index=False)
+
+    df_read = read_csv(
+        file_path, usecols=["A", "B", "C", "D"], parse_dates=["D"], downcast=True
+    )
+
+    assert df_read["A"].dtype == "int8"
+    assert df_read["B"].dtype == "category"
+    assert df_read["C"].dtype == "float32"
+    assert pd.api.types.is_datetime64_any_dtype(df_read["D"])
+    assert read_csv(file_path, usecols=["A"], nrows=2).shape == (2, 1)
+
+
+@pytest.mark.parametrize("engine", ["parallel", "pyarrow"])
+def test_read_csv_parallel_engines(tmp_path, engine):
+    """Testa a leitura de CSV dividido em blocos processados em paralelo."""
+    file_path = tmp_path / "big.csv"
+    df = pd.DataFrame({"A": range(5000), "B": [f"item{i % 7}" for i in range(5000)]})
+    df.to_csv(file_path, index=False)
+
+    df_read = read_csv(file_path, engine=engine, workers=2)
+
+    pd.testing.assert_frame_equal(df, df_read, check_dtype=False)
+
+
+def test_read_csv_auto_parallel(tmp_path, monkeypatch):
+    """Testa a escolha automática do engine paralelo para arquivos grandes."""
+    from excel_toolkit_for_py import parallel_csv
+
+    file_path = tmp_path / "big.csv"
+    df = pd.DataFrame({"A": range(1000), "B": [f"item{i}" for i in range(1000)]})
+    df.to_csv(file_path, index=False)
+    chamadas = []
+
+    def espiao(*args, **kwargs):
+        chamadas.append(kwargs)
+        return read_csv_parallel(*args, **kwargs)
+
+    monkeypatch.setattr(parallel_csv, "read_csv_parallel", espiao)
+    pd.testing.assert_frame_equal(read_csv(file_path, workers=2), df)
+    assert chamadas == []
+
+    monkeypatch.setattr(parallel_csv, "AUTO_PARALLEL_BYTES", 1)
+    pd.testing.assert_frame_equal(read_csv(file_path, workers=2), df)
+    assert len(chamadas) == 1
+
+    # 🐼 Opções não suportadas e campos com quebra de linha ficam com o pandas
+    assert len(read_csv(file_path, workers=2, nrows=5)) == 5
+    assert read_csv(file_path, workers=2, engine="c").equals(df)
+    multilinha = tmp_path / "multilinha.csv"
+    multilinha.write_text('A,B\n1,"linha 1\nlinha 2"\n2,x\n')
+    assert read_csv(multilinha, workers=2)["B"].tolist() == ["linha 1\nlinha 2", "x"]
+    assert len(chamadas) == 1
+
+
+def test_read_csv_parallel_iterator(tmp_path):
+    """Testa o retorno de blocos alinhados por linha como iterador."""
+    file_path = tmp_path / "big.csv"
+    df = pd.DataFrame({"A": range(1000), "B": [i * 0.5 for i in range(1000)]})
+    df.to_csv(file_path, index=False)
+
+    chunks = list(
+        read_csv_parallel(file_path, workers=2, chunk_bytes=2048, iterator=True)
+    )
+
+    assert len(chunks) > 1
+    assert all(list(chunk.columns) == ["A", "B"] for chunk in chunks)
+    pd.testing.assert_frame_equal(df, pd.concat(chunks, ignore_index=True))
+
+
+def test_read_csv_parallel_consistent_dtypes(tmp_path):
+    """Testa tipos iguais aos do pandas quando floats/NaN surgem só no fim."""
+    file_path = tmp_path / "tipos.csv"
+    n = 3000
+    df = pd.DataFrame(
+        {
+            "Inteiro": list(range(n - 1)) + [None],
+            "Valor": list(range(n // 2)) + [i + 0.5 for i in range(n // 2)],
+            "Codigo": [str(i) for i in range(n - 1)] + ["X-1"],
+            "Ativo": [True] * (n - 1) + [None],
+        }
+    )
+    df.to_csv(file_path, index=False)
+
+    expected = pd.read_csv(file_path)
+    result = read_csv_parallel(file_path, workers=2, chunk_bytes=4096)
+    pd.testing.assert_frame_equal(result, expected)
+
+    chunks = list(
+        read_csv_parallel(file_path, workers=2, chunk_bytes=4096, iterator=True)
+    )
+    assert len(chunks) > 2
+    assert {str(chunk["Valor"].dtype) for chunk in chunks} == {"float64"}
+
+
+@pytest.mark.parametrize("engine", ["openpyxl", "fast"])
+def test_read_excel_from_memory(tmp_path, engine):
+    """Testa a leitura de Excel a partir de bytes, memoryview e mmap."""
+    file_path = tmp_path / "test.xlsx"
+    df = pd.DataFrame({"A": [1, 2, 3], "B": ["x", "y", "z"]})
+    df.to_excel(file_path, index=False)
+    raw = file_path.read_bytes()
+
+    for source in (raw, memoryview(raw), io.BytesIO(raw)):
+        df_read = read_excel(source, sheet_name=0, engine=engine)
+        pd.testing.assert_frame_equal(df, df_read)
+
+    with open(file_path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            df_read = read_excel(mapped, sheet_name=0, engine=engine)
+    pd.testing.assert_frame_equal(df, df_read)
+
+
+def test_read_csv_from_bytes():
+    """Testa a leitura de CSV a partir de bytes em memória."""
+    df_read = read_csv(b"A,B\n1,4\n2,5\n")
+
+    assert df_read["B"].tolist() == [4, 5]
+
+
+def test_probe_excel(tmp_path):
+    """Testa a descrição rápida da planilha sem leitura completa."""
+    from excel_toolkit_for_py.validations import validate_excel
+
+    file_path = tmp_path / "grande.xlsx"
+    df = pd.DataFrame(
+        {"id": range(500), "nome": [f"item {i}" for i in range(500)], "valor": 1.5}
+    )
+    with pd.ExcelWriter(file_path) as writer:
+        df.to_excel(writer, sheet_name="Dados", index=False)
+        pd.DataFrame().to_excel(writer, sheet_name="Vazia", index=False)
+
+    probe = probe_excel(file_path, sample_rows=10)
+    assert probe["sheet_names"] == ["Dados", "Vazia"]
+    assert probe["rows_from"] == "dimension"
+    assert (probe["rows"], probe["columns"]) == (500, 3)
+    assert probe["column_names"] == ["id", "nome", "valor"]
+    assert probe["dtypes"]["id"] == "int64"
+    assert len(probe["sample"]) == 10
+    assert probe["memory_bytes"] > 500 * 16
+
+    vazia = probe_excel(file_path, sheet_name="Vazia")
+    assert (vazia["rows"], vazia["column_names"]) == (0, [])
+
+    for opcoes in ({}, {"usecols": ["id"], "sample_rows": 5}):
+        resultado = validate_excel(file_path, probe=True, **opcoes)
+        assert resultado["valid"], resultado["errors"]
+        info = resultado["info"]
+        assert (info["linhas"], info["colunas"]) == (500, 3)
+        assert info["nomes_colunas"] == ["id", "nome", "valor"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_read_many(tmp_path, workers):
+    """Testa a leitura de vários arquivos com colunas e tipos diferentes."""
+    pasta = tmp_path / "lotes"
+    pasta.mkdir()
+    pd.DataFrame({"id": [1, 2], "valor": [10, 20]}).to_excel(
+        pasta / "a.xlsx", index=False
+    )
+    pd.DataFrame({"id": [3], "valor": [1.5], "extra": ["x"]}).to_excel(
+        pasta / "b.xlsx", index=False
+    )
+    pd.DataFrame({"valor": [7], "id": [4]}).to_csv(pasta / "c.csv", index=False)
+
+    df = read_many(str(pasta / "*"), source_column=True, workers=workers)
+    # 🔗 Colunas unidas na ordem de aparição; int + float vira float
+    assert list(df.columns) == ["id", "valor", "extra", "source"]
+    assert df["id"].tolist() == [1, 2, 3, 4]
+    assert df["valor"].dtype == "float64"
+    assert df["valor"].tolist() == [10.0, 20.0, 1.5, 7.0]
+    assert df["extra"].isna().tolist() == [True, True, False, True]
+    assert [os.path.basename(s) for s in df["source"]] == [
+        "a.xlsx",
+        "a.xlsx",
+        "b.xlsx",
+        "c.csv",
+    ]
+
+    # 🎯 Projeção com coluna ausente em alguns arquivos
+    df = read_many(str(pasta / "*"), usecols=["id", "extra"], workers=workers)
+    assert list(df.columns) == ["id", "extra"]
+    assert len(df) == 4
+
+    # 🔁 Modo iterador: um DataFrame por arquivo
+    partes = list(
+        read_many(str(pasta / "*.xlsx"), iterator=True, source_column="arquivo")
+    )
+    assert [len(p) for p in partes] == [2, 1]
+    assert "extra" not in partes[0] and "extra" in partes[1]
+    assert partes[1]["arquivo"].iloc[0].endswith("b.xlsx")
+
+    with pytest.raises(ValueError):
+        read_many(str(pasta / "*.parquet"))
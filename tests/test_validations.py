@@ -6,6 +6,11 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 # 🧪 tests/test_validations.py
 import pytest
 import pandas as pd
+import pickle
+
+from excel_toolkit_for_py.constraints import Column, Rule, compile_schema
+from excel_toolkit_for_py.reader import read_csv
+from excel_toolkit_for_py.schema import infer_schema
 from excel_toolkit_for_py.validations import validate_excel_schema
 
 
@@ -56,6 +61,124 @@ def test_validate_excel_schema_invalid_sheet(sample_excel_file):
     assert "❌ Erro ao validar esquema" in result["errors"][0]
 
 
+# 🧬 Teste: Esquema inferido por amostragem
+def test_infer_schema(sample_excel_file, tmp_path):
+    schema = infer_schema(sample_excel_file, chunksize=2, sample_size=2)
+    # Salários inteiros (5000.0) são gravados como números inteiros no .xlsx
+    assert dict(schema) == {"Nome": str, "Idade": int, "Salario": int}
+    assert schema.rows == 3
+    assert schema.columns["Idade"].min == 22 and schema.columns["Idade"].max == 30
+    assert schema.columns["Nome"].nullable is False
+    assert validate_excel_schema(sample_excel_file, schema)["valid"] is True
+
+    # 📄 CSV com nulos e datas em texto
+    csv_path = tmp_path / "sample.csv"
+    pd.DataFrame(
+        {
+            "Codigo": pd.array([1, None, 3, 4], dtype="Int64"),
+            "Data": ["2024-01-01", "2024-02-01", None, "2024-03-01"],
+            "Setor": ["A", "B", "A", "A"],
+            "Periodo": ["2024", "2024-06", "2025", "2025-06"],
+        }
+    ).to_csv(csv_path, index=False)
+    schema = infer_schema(str(csv_path), chunksize=3)
+    # 📅 Anos e meses soltos continuam texto (só datas ISO completas viram datas)
+    assert schema.columns["Periodo"].type == "str"
+    assert schema.columns["Codigo"].type == "int"
+    assert schema.columns["Codigo"].null_count == 1
+    assert schema.columns["Data"].type == "datetime"
+    assert schema.columns["Setor"].cardinality == 2
+    # 🔢 Cardinalidade e unicidade exatas, mesmo com amostra menor que o arquivo
+    small = infer_schema(str(csv_path), chunksize=1, sample_size=1)
+    assert small.columns["Setor"].cardinality == 2
+    assert small.columns["Codigo"].cardinality == 3
+    assert small.columns["Codigo"].unique and not small.columns["Setor"].unique
+    assert schema.dtypes()["Codigo"] == "Int64"
+    df = read_csv(str(csv_path), dtype=schema)
+    assert str(df["Codigo"].dtype) == "Int64"
+    assert df["Data"].dtype.kind == "M"
+
+
+# 🚨 🧬 Teste: Coluna não anulável com valores nulos
+def test_validate_excel_schema_inferred_nulls(sample_excel_file, tmp_path):
+    schema = infer_schema(sample_excel_file)
+    file_path = tmp_path / "nulos.xlsx"
+    pd.DataFrame(
+        {"Nome": ["Alice", None], "Idade": [30, 25], "Salario": [5000.0, 4000.0]}
+    ).to_excel(file_path, index=False)
+    result = validate_excel_schema(file_path, schema)
+    assert result["valid"] is False
+    assert "⚠️ Coluna 'Nome' com valores nulos" in result["errors"]
+
+
+# 📏 Teste: Restrições declarativas compiladas
+def test_validate_excel_schema_constraints(tmp_path):
+    file_path = tmp_path / "pedidos.xlsx"
+    pd.DataFrame(
+        {
+            "Id": [1, 2, 2, 4],
+            "Email": ["a@x.com", "b@x.com", "invalido", None],
+            "Status": ["aberto", "fechado", "aberto", "perdido"],
+            "Total": [100.0, -5.0, 30.0, 80.0],
+            "Pago": [100.0, 0.0, 50.0, 10.0],
+        }
+    ).to_excel(file_path, index=False)
+    schema = {
+        "Id": Column(int, unique=True),
+        "Email": Column(str, nullable=False, pattern=r"[^@]+@[^@]+"),
+        "Status": Column(str, isin={"aberto", "fechado"}),
+        "Total": {"type": float, "min": 0, "max": 1000},
+    }
+    result = validate_excel_schema(file_path, schema, checks=["Pago <= Total"])
+    assert result["valid"] is False
+    violations = result["violations"]
+    assert violations["Id:unique"]["count"] == 2
+    assert violations["Id:unique"]["rows"] == [1, 2]
+    assert violations["Email:not_null"]["count"] == 1
+    assert violations["Email:pattern"]["rows"] == [2]
+    assert violations["Status:isin"]["rows"] == [3]
+    assert violations["Total:min"]["rows"] == [1]
+    assert violations["Total:max"]["count"] == 0
+    assert violations["Pago <= Total"]["rows"] == [1, 2]
+    assert "⚠️ Coluna 'Email' com valores nulos" in result["errors"]
+    assert "⚠️ Coluna 'Total': 1 valor(es) abaixo do mínimo 0 (linhas: 1)" in (
+        result["errors"]
+    )
+
+    # ♻️ Validador compilado é reutilizável e serializável
+    validator = pickle.loads(pickle.dumps(compile_schema(schema)))
+    df = pd.DataFrame(
+        {
+            "Id": [1, 2],
+            "Email": ["a@x.com", "b@x.com"],
+            "Status": ["aberto", "aberto"],
+            "Total": [1.0, 2.0],
+        }
+    )
+    assert validator.validate(df)["valid"] is True
+    assert validate_excel_schema(file_path, validator)["valid"] is False
+
+    # 🕳️ Checks ignoram linhas com operandos nulos e falham sem a coluna
+    validator = compile_schema({}, checks=["Pago <= Total", "`Valor Pago` >= 0"])
+    df = pd.DataFrame(
+        {"Pago": [1.0, None, 5.0], "Total": [2.0, 3.0, None], "Valor Pago": [1, 2, 3]}
+    )
+    violations = validator.validate(df)["violations"]
+    assert violations["Pago <= Total"]["count"] == 0
+    assert violations["`Valor Pago` >= 0"]["count"] == 0
+    violations = validator.validate(df[["Pago"]])["violations"]
+    assert violations["Pago <= Total"]["count"] == 3
+
+
+# 🧱 Teste: regras incompletas falham ao serem criadas
+def test_rule_requires_check():
+    class SemCheck(Rule):
+        kind = "incompleta"
+
+    with pytest.raises(TypeError):
+        SemCheck("Id")
+
+
 # 🏃 **Execução dos testes**
 if __name__ == "__main__":
     pytest.main(["-v", "tests/test_validations.py"])
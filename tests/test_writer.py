@@ -1,16 +1,23 @@
 import os
 import sys
+import zipfile
 
 sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 )  # noqa
 
+import openpyxl  # noqa
 import pandas as pd  # noqa
 import pytest  # noqa
 
+from excel_toolkit_for_py.optimizer import optimize_xlsx  # noqa
+from excel_toolkit_for_py.reader import read_excel  # noqa
 from excel_toolkit_for_py.writer import (
+    append_rows,
     write_csv,
     write_excel,  # noqa
+    write_excel_sheets,
+    write_excel_with_charts,
     write_list_to_excel,
 )
 
@@ -58,3 +65,274 @@ def test_write_list_to_excel(tmp_path):
         len(data) - 1,
         len(data[0]),
     ), "O formato da planilha não corresponde aos dados de entrada."  # noqa501
+
+
+def test_write_excel_with_charts(tmp_path):
+    """Testa a exportação de dados e vários gráficos em uma única escrita."""
+    file_path = tmp_path / "dashboard.xlsx"
+    df = pd.DataFrame(
+        {"Mes": ["Jan", "Fev", "Mar"], "Vendas": [10, 20, None], "Custos": [5, 8, 9]}
+    )
+    charts = [
+        {"type": "bar", "y": ["Vendas", "Custos"], "title": "Vendas x Custos"},
+        {"type": "line", "y": "Vendas", "anchor": "H20"},
+        {"type": "pie", "y": "Custos"},
+        {"type": "scatter", "x": "Custos", "y": "Vendas"},
+    ]
+
+    write_excel_with_charts(df, file_path, charts)
+
+    wb = openpyxl.load_workbook(file_path)
+    ws = wb["Sheet1"]
+    assert len(ws._charts) == 4
+    pd.testing.assert_frame_equal(pd.read_excel(file_path), df)
+
+    with pytest.raises(ValueError, match="Unsupported chart type"):
+        write_excel_with_charts(
+            df, tmp_path / "x.xlsx", [{"type": "area", "y": "Vendas"}]
+        )
+
+
+def test_write_excel_sheets(tmp_path):
+    """Testa a exportação de várias planilhas geradas em paralelo."""
+    file_path = tmp_path / "multi.xlsx"
+    vendas = pd.DataFrame(
+        {
+            "Produto": ["A & B", None, "C"],
+            "Qtd": [1, 2, 3],
+            "Preco": [1.5, None, 3.25],
+            "Ativo": [True, False, True],
+            "Data": pd.to_datetime(
+                ["2024-01-31 08:30:00", None, "2024-03-01 00:00:00"]
+            ),
+        }
+    )
+    custos = pd.DataFrame({"Centro": ["RH", "TI"], "Valor": [100, 200]})
+
+    write_excel_sheets({"Vendas": vendas, "Custos": custos}, file_path, workers=2)
+
+    sheets = pd.read_excel(file_path, sheet_name=None)
+    assert list(sheets) == ["Vendas", "Custos"]
+    pd.testing.assert_frame_equal(sheets["Vendas"], vendas, check_dtype=False)
+    pd.testing.assert_frame_equal(sheets["Custos"], custos)
+
+    with pytest.raises(ValueError, match="Invalid sheet name"):
+        write_excel_sheets({"a/b": custos}, tmp_path / "invalido.xlsx")
+
+
+def test_append_rows(tmp_path):
+    """Testa o acréscimo de linhas sem reescrever os demais membros do zip."""
+    import zipfile
+
+    file_path = tmp_path / "log.xlsx"
+    dia1 = pd.DataFrame(
+        {
+            "Evento": ["login", "logout"],
+            "Usuario": [1, 2],
+            "Quando": pd.to_datetime(["2024-01-01 08:00:00", "2024-01-01 18:00:00"]),
+        }
+    )
+    dia2 = dia1.assign(Usuario=[3, 4])
+    outra = pd.DataFrame({"Centro": ["RH"], "Valor": [100]})
+    with pd.ExcelWriter(file_path, engine="openpyxl") as writer:
+        dia1.to_excel(writer, sheet_name="Log", index=False)
+        outra.to_excel(writer, sheet_name="Outra", index=False)
+    with zipfile.ZipFile(file_path) as zf:
+        antes = {i.filename: i.CRC for i in zf.infolist()}
+
+    assert append_rows(file_path, "Log", dia2) == 5
+
+    esperado = pd.concat([dia1, dia2], ignore_index=True)
+    resultado = pd.read_excel(file_path, sheet_name=None)
+    pd.testing.assert_frame_equal(resultado["Log"], esperado, check_dtype=False)
+    pd.testing.assert_frame_equal(resultado["Outra"], outra)
+    assert openpyxl.load_workbook(file_path)["Log"].dimensions == "A1:C5"
+
+    with zipfile.ZipFile(file_path) as zf:
+        depois = {i.filename: i.CRC for i in zf.infolist()}
+    alterados = {name for name in antes if antes[name] != depois[name]}
+    assert alterados == {"xl/worksheets/sheet1.xml"}
+
+    with pytest.raises(ValueError, match="not found"):
+        append_rows(file_path, "Inexistente", dia2)
+
+
+def test_append_rows_matches_header(tmp_path):
+    """Testa se as colunas são alinhadas pelo nome do cabeçalho da planilha."""
+    file_path = tmp_path / "cabecalho.xlsx"
+    base = pd.DataFrame({"Evento": ["login"], "Usuario": [1], "Valor": [1.5]})
+    base.to_excel(file_path, index=False)
+
+    # 🔀 Ordem diferente e subconjunto das colunas
+    append_rows(file_path, 0, pd.DataFrame({"Valor": [2.5], "Evento": ["logout"]}))
+    esperado = pd.DataFrame(
+        {"Evento": ["login", "logout"], "Usuario": [1, None], "Valor": [1.5, 2.5]}
+    )
+    pd.testing.assert_frame_equal(pd.read_excel(file_path), esperado, check_dtype=False)
+
+    with pytest.raises(ValueError, match="not found in the sheet header"):
+        append_rows(file_path, 0, pd.DataFrame({"Outra": [1]}))
+
+
+def test_write_excel_optimize(tmp_path):
+    """Testa a otimização: strings compartilhadas e compressão."""
+    df = pd.DataFrame(
+        {
+            "id": range(2_000),
+            "status": ["aberto & pendente", "<fechado>", " cancelado "] * 666
+            + ["x"] * 2,
+        }
+    )
+    simples = tmp_path / "simples.xlsx"
+    otimizado = tmp_path / "otimizado.xlsx"
+    write_excel(df, str(simples), engine="native")
+    write_excel(df, str(otimizado), engine="native", optimize=True, compresslevel=9)
+
+    assert os.path.getsize(otimizado) < os.path.getsize(simples)
+    with zipfile.ZipFile(otimizado) as zf:
+        # 🏷️ Só o cabeçalho continua com strings inline
+        assert zf.read("xl/worksheets/sheet1.xml").count(b"inlineStr") == 2
+        assert b'uniqueCount="4"' in zf.read("xl/sharedStrings.xml")
+
+    # 🔁 Arquivo já gravado com strings inline (inclusive o cabeçalho)
+    resultado = optimize_xlsx(str(simples), compresslevel=9)
+    assert resultado["strings_shared"] == 2 + 2_000
+    assert resultado["size_after"] < resultado["size_before"]
+    write_excel(df, str(tmp_path / "openpyxl.xlsx"), engine="openpyxl", optimize=True)
+
+    for path in (simples, otimizado, tmp_path / "openpyxl.xlsx"):
+        for engine in ("fast", "openpyxl"):
+            pd.testing.assert_frame_equal(
+                read_excel(str(path), sheet_name="Sheet1", engine=engine), df
+            )
+
+
+def test_optimize_xlsx_merges_styles(tmp_path):
+    """Testa a unificação de estilos duplicados e o remapeamento das células."""
+    file_path = tmp_path / "estilos.xlsx"
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    for row in range(1, 4):
+        ws.cell(row=row, column=1, value=row).font = openpyxl.styles.Font(bold=True)
+    wb.save(file_path)
+
+    # 🧬 Duplica a fonte e o formato em negrito, como fazem alguns geradores
+    with zipfile.ZipFile(file_path) as zf:
+        parts = {name: zf.read(name) for name in zf.namelist()}
+    styles = parts["xl/styles.xml"].decode()
+    fonte = styles[styles.index("<font>", styles.index("<font>") + 1) :]
+    fonte = fonte[: fonte.index("</font>") + len("</font>")]
+    styles = styles.replace("</fonts>", fonte + "</fonts>")
+    xf = styles[styles.index("<xf", styles.index("<cellXfs")) :]
+    xf = xf[xf.index("<xf", 1) :]
+    xf = xf[: xf.index("/>") + 2]
+    styles = styles.replace(
+        "</cellXfs>", xf.replace('fontId="1"', 'fontId="2"') + "</cellXfs>"
+    )
+    parts["xl/styles.xml"] = styles.encode()
+    sheet = parts["xl/worksheets/sheet1.xml"].decode()
+    parts["xl/worksheets/sheet1.xml"] = sheet.replace(
+        'r="A3" s="1"', 'r="A3" s="2"'
+    ).encode()
+    with zipfile.ZipFile(file_path, "w") as zf:
+        for name, data in parts.items():
+            zf.writestr(name, data)
+
+    resultado = optimize_xlsx(str(file_path))
+    assert resultado["styles_removed"] == 2
+    assert resultado["strings_shared"] == 0
+    with zipfile.ZipFile(file_path) as zf:
+        assert b's="2"' not in zf.read("xl/worksheets/sheet1.xml")
+    ws = openpyxl.load_workbook(file_path).active
+    assert [ws.cell(row=row, column=1).font.bold for row in range(1, 4)] == [True] * 3
+
+
+def test_optimize_xlsx_rejects_malformed_shared_strings(tmp_path):
+    """Testa o erro claro para uma tabela de strings sem a tag de fechamento."""
+    file_path = tmp_path / "sst.xlsx"
+    write_excel(
+        pd.DataFrame({"status": ["a", "b"]}),
+        str(file_path),
+        engine="native",
+        optimize=True,
+    )
+    with zipfile.ZipFile(file_path) as zf:
+        parts = {name: zf.read(name) for name in zf.namelist()}
+    parts["xl/sharedStrings.xml"] = parts["xl/sharedStrings.xml"].replace(
+        b"</sst>", b""
+    )
+    with zipfile.ZipFile(file_path, "w") as zf:
+        for name, data in parts.items():
+            zf.writestr(name, data)
+
+    with pytest.raises(ValueError, match="no closing </sst> tag"):
+        optimize_xlsx(str(file_path))
+
+
+# 🗓️ ✅ Teste: writer nativo grava datas, decimais e escalares NumPy como números
+def test_write_excel_native_object_types(tmp_path):
+    import datetime
+    import decimal
+
+    import numpy as np
+
+    file_path = tmp_path / "tipos.xlsx"
+    valores = [
+        datetime.date(2024, 1, 31),
+        datetime.datetime(2024, 1, 31, 8, 30),
+        pd.Timestamp("2024-01-31 08:30", tz="America/Sao_Paulo"),
+        decimal.Decimal("1.25"),
+        datetime.timedelta(hours=26, minutes=30),
+        np.int64(7),
+        np.float32(0.5),
+        float("inf"),
+        np.timedelta64(90, "m"),
+        "texto",
+    ]
+    df = pd.DataFrame({"Valor": pd.Series(valores, dtype=object)})
+    write_excel(df, file_path, engine="native")
+
+    ws = openpyxl.load_workbook(file_path).active
+    celulas = [ws.cell(row=row, column=1) for row in range(2, len(valores) + 2)]
+    lidos = [celula.value for celula in celulas]
+    assert lidos[0] == datetime.datetime(2024, 1, 31)
+    assert celulas[0].number_format == "mm-dd-yy"
+    assert lidos[1] == datetime.datetime(2024, 1, 31, 8, 30)
+    assert lidos[2] == datetime.datetime(2024, 1, 31, 8, 30)
+    assert celulas[1].is_date and celulas[2].is_date
+    assert lidos[3] == 1.25
+    assert lidos[4] == datetime.timedelta(hours=26, minutes=30)
+    assert celulas[4].number_format == "[h]:mm:ss"
+    assert lidos[5] == 7 and isinstance(lidos[5], int)
+    assert lidos[6] == 0.5
+    # ♾️ Infinito é gravado como célula vazia
+    assert lidos[7] is None
+    assert lidos[8] == datetime.timedelta(minutes=90)
+    assert lidos[9] == "texto"
+
+
+# 🚫 ✅ Teste: caracteres de controle inválidos em XML geram erro claro
+def test_write_excel_native_rejects_control_characters(tmp_path):
+    df = pd.DataFrame({"Nome": ["ok", "ru\x01im"]})
+    with pytest.raises(ValueError, match="A3"):
+        write_excel(df, tmp_path / "invalido.xlsx", engine="native")
+    # 🧹 Nenhum arquivo truncado fica para trás
+    assert not (tmp_path / "invalido.xlsx").exists()
+    # ↩️ Tabulação e quebras de linha continuam permitidas
+    df = pd.DataFrame({"Nome": ["a\tb", "c\nd"]})
+    write_excel(df, tmp_path / "valido.xlsx", engine="native")
+    assert pd.read_excel(tmp_path / "valido.xlsx")["Nome"].tolist() == [
+        "a\tb",
+        "c\nd",
+    ]
+
+
+def test_write_excel_xlsxwriter_batches(tmp_path, monkeypatch):
+    """Testa a escrita em lotes do engine xlsxwriter."""
+    from excel_toolkit_for_py import native_writer
+
+    monkeypatch.setattr(native_writer, "_XLSXWRITER_BATCH", 2)
+    df = pd.DataFrame({"id": range(5), "nome": ["a", None, "c", "d", "e"]})
+    file_path = tmp_path / "lotes.xlsx"
+    write_excel(df, str(file_path), engine="xlsxwriter")
+    pd.testing.assert_frame_equal(pd.read_excel(file_path), df, check_dtype=False)